@@ -0,0 +1,84 @@
+"""
+Peak memory per ID card for the OCR pipeline.
+
+Measures with tracemalloc how much memory one card needs on top of the
+decoded photo (numpy and OpenCV outputs are both tracked). The first card on
+a thread allocates the scratch buffers, so the steady state is what matters:
+
+    python bench_ocr_memory.py --image test.png --cards 5 --max-copies 1.5
+
+Without --image a synthetic 12 MP photo is used. --ocr also runs tesseract;
+by default only decoding and preprocessing are measured.
+"""
+import argparse
+import base64
+import json
+import tracemalloc
+from typing import List, Optional
+
+import cv2
+import numpy as np
+
+from ocr_identitycard import IDCardProcessor
+
+
+def synthetic_card(width: int = 4032, height: int = 3024) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    img = rng.integers(120, 255, size=(height, width, 3), dtype=np.uint8)
+    cv2.putText(img, "IDROU<<POPESCU<<ION", (200, height // 2),
+                cv2.FONT_HERSHEY_SIMPLEX, 6, (0, 0, 0), 12, cv2.LINE_AA)
+    return img
+
+
+def measure(processor: IDCardProcessor, payload: str, run_ocr: bool) -> int:
+    """Return the peak traced memory (bytes) for one card."""
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    if run_ocr:
+        processor.process_id_card_from_base64(payload)
+    else:
+        img = processor.decode_base64_image(payload)
+        processor._preprocess(img)
+        del img
+    return tracemalloc.get_traced_memory()[1] - base
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Peak memory per ID card")
+    parser.add_argument("--image", help="card photo (default: synthetic 12 MP image)")
+    parser.add_argument("--cards", type=int, default=5)
+    parser.add_argument("--ocr", action="store_true", help="also run tesseract")
+    parser.add_argument("--max-copies", type=float,
+                        help="fail when the steady-state peak exceeds this many decoded images")
+    args = parser.parse_args(argv)
+
+    img = cv2.imread(args.image) if args.image else synthetic_card()
+    if img is None:
+        parser.error(f"Image not found: {args.image}")
+    ok, encoded = cv2.imencode(".jpg", img)
+    payload = base64.b64encode(encoded.tobytes()).decode("ascii")
+    decoded_bytes = img.nbytes
+    del img, encoded
+
+    processor = IDCardProcessor()
+    tracemalloc.start()
+    peaks = [measure(processor, payload, args.ocr) for _ in range(args.cards)]
+    tracemalloc.stop()
+
+    steady = max(peaks[1:]) if len(peaks) > 1 else peaks[0]
+    summary = {
+        "decoded_image_bytes": decoded_bytes,
+        "first_card_peak_bytes": peaks[0],
+        "steady_peak_bytes": steady,
+        "steady_peak_copies": round(steady / decoded_bytes, 3),
+    }
+    print(json.dumps(summary, indent=2))
+
+    if args.max_copies is not None and summary["steady_peak_copies"] > args.max_copies:
+        print(f"Peak memory above {args.max_copies} decoded images per card")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
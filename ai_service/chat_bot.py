@@ -1,45 +1,83 @@
-import asyncio
 from dotenv import load_dotenv
 import os
-import google.generativeai as genai
-from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Optional
+
+from conversation import ConversationManager
+from llm_backends import LLMBackend, create_backend
 
 class ChatBot:
-    def __init__(self, max_workers=2, max_prompt_len=500):
+    GENERATION_CONFIG = {
+        "candidate_count": 1,
+        "temperature": 1.6,
+        "top_p": 0.3,
+    }
+
+    def __init__(self, max_workers=2, max_prompt_len=500,
+                 backend: Optional[LLMBackend] = None,
+                 conversations: Optional[ConversationManager] = None):
+        """
+        Args:
+            max_workers: Worker threads for blocking backends
+            max_prompt_len: Maximum characters kept from a user message
+            backend: Model backend; when None it is chosen by the
+                LLM_BACKEND env variable ("gemini" by default, or "fake")
+            conversations: Per-user history; a default manager is created
+                when None
+        """
         load_dotenv()
-        self.api_ai = os.getenv("API_AI")
-        genai.configure(api_key=self.api_ai)
-        self.model = genai.GenerativeModel("gemini-2.5-flash")
-        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        if backend is None:
+            name = os.getenv("LLM_BACKEND", "gemini").lower()
+            if name == "gemini":
+                backend = create_backend(name, max_workers=max_workers)
+            else:
+                backend = create_backend(name)
+        self.backend = backend
         self.max_prompt_len = max_prompt_len
+        self.conversations = conversations or ConversationManager()
         self.cache = {}  # simplu cache, pe prompt
 
-    async def get_response(self, text):
+    def _prepare(self, text, user_id):
+        """Truncate the message and wrap it in the user's conversation context."""
         if len(text) > self.max_prompt_len:
             text = text[:self.max_prompt_len]
+        prompt = self.conversations.build_prompt(user_id, text) if user_id else text
+        return text, prompt
 
-        if text in self.cache:
+    async def get_response(self, text, user_id: Optional[str] = None):
+        text, prompt = self._prepare(text, user_id)
+
+        # Only context-free prompts are worth caching; with history they never repeat.
+        if prompt == text and text in self.cache:
             print("Returnez din cache!")
-            return self.cache[text]
-
-        generation_config = {
-            "candidate_count": 1,
-            "temperature": 1.6,
-            "top_p": 0.3,
-        }
-
-        try:
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                self.executor,
-                lambda: self.model.generate_content(
-                    text,
-                    generation_config=generation_config
-                )
-            )
-            self.cache[text] = response.text
-            print(response.text)
-            return response.text
-        except Exception as e:
-            print(f"Error in get_response: {e}")
-            raise e
+            response = self.cache[text]
+        else:
+            try:
+                response = await self.backend.agenerate(prompt, self.GENERATION_CONFIG)
+            except Exception as e:
+                print(f"Error in get_response: {e}")
+                raise e
+            if prompt == text:
+                self.cache[text] = response
+            print(response)
+
+        if user_id:
+            self.conversations.record_exchange(user_id, text, response)
+        return response
+
+    async def stream_response(self, text, user_id: Optional[str] = None) -> AsyncIterator[str]:
+        text, prompt = self._prepare(text, user_id)
+
+        if prompt == text and text in self.cache:
+            response = self.cache[text]
+            yield response
+        else:
+            parts = []
+            async for chunk in self.backend.astream(prompt, self.GENERATION_CONFIG):
+                parts.append(chunk)
+                yield chunk
+            response = "".join(parts)
+            if prompt == text:
+                self.cache[text] = response
+
+        if user_id:
+            self.conversations.record_exchange(user_id, text, response)
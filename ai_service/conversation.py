@@ -0,0 +1,191 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token estimate (about 4 characters per token).
+
+    Good enough for budgeting; the exact count depends on the model tokenizer.
+    """
+    if not text:
+        return 0
+    return len(text) // 4 + 1
+
+
+def extractive_summary(previous: str, turns: List["Turn"], max_tokens: int) -> str:
+    """
+    Fold old turns into the running summary without calling the model.
+
+    Keeps the first sentence of every folded turn and drops the oldest
+    summary lines once the summary grows past max_tokens.
+    """
+    lines = [line for line in previous.split("\n") if line] if previous else []
+    for turn in turns:
+        sentence = re.split(r"(?<=[.!?])\s+", turn.text.strip(), maxsplit=1)[0]
+        if len(sentence) > 160:
+            sentence = sentence[:157] + "..."
+        speaker = "Utilizator" if turn.role == "user" else "Asistent"
+        lines.append(f"{speaker}: {sentence}")
+
+    while lines and estimate_tokens("\n".join(lines)) > max_tokens:
+        lines.pop(0)
+    return "\n".join(lines)
+
+
+@dataclass
+class Turn:
+    role: str
+    text: str
+    tokens: int
+
+
+@dataclass
+class ConversationSession:
+    user_id: str
+    turns: List[Turn] = field(default_factory=list)
+    summary: str = ""
+    last_used: float = 0.0
+
+    @property
+    def history_tokens(self) -> int:
+        return sum(turn.tokens for turn in self.turns)
+
+    @property
+    def size_bytes(self) -> int:
+        text_bytes = sum(len(turn.text.encode("utf-8")) for turn in self.turns)
+        return text_bytes + len(self.summary.encode("utf-8")) + len(self.user_id)
+
+
+class ConversationManager:
+    """
+    Per-user chat history with a token budget.
+
+    Each user gets a session holding recent turns verbatim plus a short
+    summary of older turns. Prompts are built to stay under the token budget,
+    so follow-up questions keep their context without sending the whole
+    conversation to the model. The number of live sessions is bounded (least
+    recently used sessions are evicted) and idle sessions expire.
+    """
+
+    def __init__(self,
+                 max_sessions: int = 500,
+                 idle_ttl: float = 30 * 60,
+                 history_budget: int = 600,
+                 summary_budget: int = 150,
+                 summarizer: Optional[Callable[[str, List[Turn], int], str]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            max_sessions: Maximum number of live sessions (LRU bound)
+            idle_ttl: Seconds after which an unused session is dropped
+            history_budget: Token budget for verbatim turns in the prompt
+            summary_budget: Token budget for the summary of older turns
+            summarizer: Function (previous_summary, turns, max_tokens) -> summary;
+                defaults to a local extractive summary
+            clock: Time source, injectable for tests
+        """
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.history_budget = history_budget
+        self.summary_budget = summary_budget
+        self.summarizer = summarizer or extractive_summary
+        self._clock = clock
+        self._sessions: "OrderedDict[str, ConversationSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _get_session(self, user_id: str) -> ConversationSession:
+        now = self._clock()
+        self._expire_idle(now)
+        session = self._sessions.get(user_id)
+        if session is None:
+            session = ConversationSession(user_id=user_id)
+            self._sessions[user_id] = session
+            self._bytes += session.size_bytes
+            while len(self._sessions) > self.max_sessions:
+                _, evicted = self._sessions.popitem(last=False)
+                self._bytes -= evicted.size_bytes
+                self.evictions += 1
+        else:
+            self._sessions.move_to_end(user_id)
+        session.last_used = now
+        return session
+
+    def _expire_idle(self, now: float) -> None:
+        # Sessions are kept in LRU order, so the idle ones are at the front.
+        while self._sessions:
+            user_id, session = next(iter(self._sessions.items()))
+            if now - session.last_used <= self.idle_ttl:
+                break
+            del self._sessions[user_id]
+            self._bytes -= session.size_bytes
+            self.expirations += 1
+
+    def _compact(self, session: ConversationSession) -> None:
+        """Move the oldest turns into the summary until history fits the budget."""
+        folded = []
+        while session.turns and session.history_tokens > self.history_budget:
+            folded.append(session.turns.pop(0))
+        if folded:
+            session.summary = self.summarizer(session.summary, folded, self.summary_budget)
+
+    def build_prompt(self, user_id: str, message: str) -> str:
+        """
+        Build the smallest prompt that keeps the conversation context.
+
+        Args:
+            user_id: Conversation owner
+            message: New user message
+
+        Returns:
+            Prompt with the summary, the recent turns and the new message
+        """
+        with self._lock:
+            session = self._get_session(user_id)
+            if not session.turns and not session.summary:
+                return message
+
+            parts = []
+            if session.summary:
+                parts.append(f"Rezumatul conversației anterioare:\n{session.summary}")
+            for turn in session.turns:
+                speaker = "Utilizator" if turn.role == "user" else "Asistent"
+                parts.append(f"{speaker}: {turn.text}")
+            parts.append(f"Utilizator: {message}")
+            parts.append("Asistent:")
+            return "\n".join(parts)
+
+    def record_exchange(self, user_id: str, message: str, reply: str) -> None:
+        """Store a completed question/answer pair and compact the session."""
+        with self._lock:
+            session = self._get_session(user_id)
+            before = session.size_bytes
+            session.turns.append(Turn("user", message, estimate_tokens(message)))
+            session.turns.append(Turn("assistant", reply, estimate_tokens(reply)))
+            self._compact(session)
+            self._bytes += session.size_bytes - before
+
+    def reset(self, user_id: str) -> None:
+        with self._lock:
+            session = self._sessions.pop(user_id, None)
+            if session is not None:
+                self._bytes -= session.size_bytes
+
+    def stats(self) -> Dict[str, int]:
+        """Memory accounting for the live sessions."""
+        with self._lock:
+            self._expire_idle(self._clock())
+            return {
+                "sessions": len(self._sessions),
+                "bytes": self._bytes,
+                "history_tokens": sum(s.history_tokens for s in self._sessions.values()),
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
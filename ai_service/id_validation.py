@@ -0,0 +1,181 @@
+import re
+from datetime import date
+from typing import Dict, Optional, Tuple
+
+# Weights of the official CNP check digit
+CNP_WEIGHTS = "279146358279"
+
+# Century of the birth year by the first CNP digit (7/8/9 are residents and
+# foreigners, whose century is not encoded)
+CNP_CENTURY = {
+    "1": 1900, "2": 1900,
+    "3": 1800, "4": 1800,
+    "5": 2000, "6": 2000,
+}
+
+# 01-46 counties and Bucharest sectors, 47/48 former Bucharest sectors 7 and 8,
+# 51 Călărași, 52 Giurgiu, 70 documents issued regardless of county
+CNP_COUNTY_CODES = frozenset([f"{i:02d}" for i in range(1, 49)] + ["51", "52", "70"])
+
+MAX_AGE_YEARS = 120
+
+SERIE_PATTERN = re.compile(r"^[A-Z]{2}$")
+NR_PATTERN = re.compile(r"^\d{6}$")
+NAME_PATTERN = re.compile(r"^[A-ZĂÂÎȘȚ]+(?:[- ][A-ZĂÂÎȘȚ]+)*$", re.IGNORECASE)
+
+# (valid, reason); reason is None when the value is valid
+ValidationResult = Tuple[bool, Optional[str]]
+
+
+def cnp_check_digit(first_twelve: str) -> str:
+    """Compute the CNP check digit for the first 12 digits."""
+    total = sum(int(d) * int(w) for d, w in zip(first_twelve, CNP_WEIGHTS))
+    rest = total % 11
+    return "1" if rest == 10 else str(rest)
+
+
+def cnp_birth_date(cnp: str, today: Optional[date] = None) -> Optional[date]:
+    """
+    Birth date encoded in a CNP, or None when it is not a calendar date.
+
+    For residents and foreigners (first digit 7-9) the century is guessed:
+    the most recent year that is not in the future.
+    """
+    today = today or date.today()
+    yy, mm, dd = int(cnp[1:3]), int(cnp[3:5]), int(cnp[5:7])
+    century = CNP_CENTURY.get(cnp[0])
+    if century is None:
+        century = 2000 if 2000 + yy <= today.year else 1900
+    try:
+        return date(century + yy, mm, dd)
+    except ValueError:
+        return None
+
+
+def validate_cnp(cnp: str, today: Optional[date] = None) -> ValidationResult:
+    """
+    Validate a CNP: format, check digit, date of birth and county code.
+
+    Args:
+        cnp: 13-digit personal numeric code
+        today: Reference date for the plausibility checks
+
+    Returns:
+        (valid, reason)
+    """
+    if not cnp or len(cnp) != 13 or not cnp.isdigit():
+        return False, "CNP must have 13 digits"
+    if cnp[0] == "0":
+        return False, "Invalid sex/century digit"
+    if cnp_check_digit(cnp[:12]) != cnp[12]:
+        return False, "Check digit mismatch"
+
+    today = today or date.today()
+    born = cnp_birth_date(cnp, today)
+    if born is None:
+        return False, "Invalid date of birth"
+    if born > today:
+        return False, "Date of birth is in the future"
+    if today.year - born.year > MAX_AGE_YEARS:
+        return False, "Date of birth is implausibly old"
+
+    if cnp[7:9] not in CNP_COUNTY_CODES:
+        return False, f"Unknown county code {cnp[7:9]}"
+    return True, None
+
+
+def validate_serie(serie: str) -> ValidationResult:
+    if not SERIE_PATTERN.match(serie or ""):
+        return False, "Serie must be two letters"
+    return True, None
+
+
+def validate_nr(nr: str) -> ValidationResult:
+    if not NR_PATTERN.match(nr or ""):
+        return False, "Number must have 6 digits"
+    return True, None
+
+
+def validate_name(name: str) -> ValidationResult:
+    if not name:
+        return False, "Empty name"
+    if not NAME_PATTERN.match(name):
+        return False, "Name contains invalid characters"
+    return True, None
+
+
+def validate_text(text: str, min_length: int = 3) -> ValidationResult:
+    if not text or len(text.strip()) < min_length:
+        return False, "Text too short"
+    return True, None
+
+
+def parse_expiry(value: str) -> Optional[date]:
+    """
+    Parse an expiry date as printed in the machine readable zone (YYMMDD).
+
+    Returns:
+        The date, or None when the value is not a valid YYMMDD date
+    """
+    if not value or len(value) != 6 or not value.isdigit():
+        return None
+    try:
+        return date(2000 + int(value[:2]), int(value[2:4]), int(value[4:6]))
+    except ValueError:
+        return None
+
+
+def validate_expiry(value: str, issued_after: Optional[date] = None) -> ValidationResult:
+    """
+    Validate an expiry date (YYMMDD or ISO YYYY-MM-DD).
+
+    Args:
+        value: Expiry date
+        issued_after: Expiry dates before this date are rejected
+            (e.g. the holder's date of birth)
+    """
+    expiry = parse_expiry(value)
+    if expiry is None:
+        try:
+            expiry = date.fromisoformat(value)
+        except (TypeError, ValueError):
+            return False, "Expiry date must be YYMMDD"
+    if issued_after and expiry <= issued_after:
+        return False, "Expiry date before date of birth"
+    return True, None
+
+
+def validate_id_card(fields: Dict[str, str], today: Optional[date] = None) -> Dict[str, Dict]:
+    """
+    Validate the fields extracted from an ID card.
+
+    Args:
+        fields: Output of IDCardProcessor.convert_to_json (without validation)
+        today: Reference date for the plausibility checks
+
+    Returns:
+        Dictionary field -> {"valid": bool, "reason": str or None}
+    """
+    checks = {
+        "first_name": validate_name,
+        "last_name": validate_name,
+        "serie": validate_serie,
+        "nr": validate_nr,
+        "place_of_birth": validate_text,
+        "address": validate_text,
+        "cnp": lambda v: validate_cnp(v, today),
+    }
+    report = {}
+    for field, check in checks.items():
+        if field in fields:
+            valid, reason = check(fields[field])
+            report[field] = {"valid": valid, "reason": reason}
+
+    if "expiration_date" in fields:
+        cnp = fields.get("cnp", "")
+        born = None
+        if report.get("cnp", {}).get("valid"):
+            born = cnp_birth_date(cnp, today)
+        valid, reason = validate_expiry(fields["expiration_date"], born)
+        report["expiration_date"] = {"valid": valid, "reason": reason}
+    return report
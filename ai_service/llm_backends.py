@@ -0,0 +1,253 @@
+import asyncio
+import hashlib
+import math
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, Iterator, Optional, Protocol
+
+
+class LLMBackendError(RuntimeError):
+    """Raised by a backend when the model call fails."""
+
+
+class LLMBackend(Protocol):
+    """
+    Interface every chat model backend implements.
+
+    Backends expose the same call in three flavours so the service can pick
+    whichever fits the caller: a blocking call, an awaitable call and a
+    token stream.
+    """
+
+    name: str
+
+    def generate(self, prompt: str, generation_config: Optional[Dict] = None) -> str:
+        ...
+
+    async def agenerate(self, prompt: str, generation_config: Optional[Dict] = None) -> str:
+        ...
+
+    def stream(self, prompt: str, generation_config: Optional[Dict] = None) -> Iterator[str]:
+        ...
+
+    async def astream(self, prompt: str, generation_config: Optional[Dict] = None) -> AsyncIterator[str]:
+        ...
+
+
+class GeminiBackend:
+    """Google Gemini backend (the model the service has always used)."""
+
+    name = "gemini"
+
+    def __init__(self, model_name: str = "gemini-2.5-flash",
+                 api_key: Optional[str] = None,
+                 max_workers: int = 2):
+        # Imported here so the fake backend works without the Google SDK installed.
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(model_name)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def generate(self, prompt: str, generation_config: Optional[Dict] = None) -> str:
+        try:
+            response = self.model.generate_content(prompt, generation_config=generation_config)
+            return response.text
+        except Exception as e:
+            raise LLMBackendError(str(e)) from e
+
+    async def agenerate(self, prompt: str, generation_config: Optional[Dict] = None) -> str:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor,
+            lambda: self.generate(prompt, generation_config)
+        )
+
+    def stream(self, prompt: str, generation_config: Optional[Dict] = None) -> Iterator[str]:
+        try:
+            response = self.model.generate_content(
+                prompt,
+                generation_config=generation_config,
+                stream=True
+            )
+            for chunk in response:
+                if chunk.text:
+                    yield chunk.text
+        except Exception as e:
+            raise LLMBackendError(str(e)) from e
+
+    async def astream(self, prompt: str, generation_config: Optional[Dict] = None) -> AsyncIterator[str]:
+        loop = asyncio.get_running_loop()
+        iterator = self.stream(prompt, generation_config)
+        sentinel = object()
+        while True:
+            chunk = await loop.run_in_executor(self.executor, next, iterator, sentinel)
+            if chunk is sentinel:
+                break
+            yield chunk
+
+
+class FakeBackend:
+    """
+    Offline backend for load tests and benchmarks.
+
+    Replies are derived from a hash of the prompt, so the same prompt always
+    gets the same answer. Latency, error rate and streaming speed are
+    configurable; with a fixed seed the latency/error sequence is repeatable.
+    """
+
+    name = "fake"
+
+    LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "lognormal")
+
+    _WORDS = (
+        "document", "carte", "identitate", "permis", "valabil", "expira",
+        "portofel", "digital", "date", "verificare", "cerere", "program",
+        "ghiseu", "online", "actualizare", "semnatura", "serie", "numar",
+    )
+
+    def __init__(self,
+                 latency_ms: float = 300.0,
+                 latency_jitter_ms: float = 100.0,
+                 distribution: str = "lognormal",
+                 error_rate: float = 0.0,
+                 reply_tokens: int = 40,
+                 tokens_per_second: float = 80.0,
+                 seed: Optional[int] = None):
+        """
+        Args:
+            latency_ms: Mean time to full response (ms)
+            latency_jitter_ms: Spread around the mean (ms); half-width for
+                "uniform", standard deviation for "lognormal"
+            distribution: One of "fixed", "uniform" or "lognormal"
+            error_rate: Probability in [0, 1] that a call raises LLMBackendError
+            reply_tokens: Number of words in each reply
+            tokens_per_second: Emission speed when streaming
+            seed: Seed for the latency/error random generator
+        """
+        if distribution not in self.LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError("error_rate must be between 0 and 1")
+
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.distribution = distribution
+        self.error_rate = error_rate
+        self.reply_tokens = reply_tokens
+        self.tokens_per_second = tokens_per_second
+        self._rng = random.Random(seed)
+
+    @classmethod
+    def from_env(cls) -> "FakeBackend":
+        """Build a fake backend from FAKE_LLM_* environment variables."""
+        seed = os.getenv("FAKE_LLM_SEED")
+        return cls(
+            latency_ms=float(os.getenv("FAKE_LLM_LATENCY_MS", 300)),
+            latency_jitter_ms=float(os.getenv("FAKE_LLM_JITTER_MS", 100)),
+            distribution=os.getenv("FAKE_LLM_DISTRIBUTION", "lognormal"),
+            error_rate=float(os.getenv("FAKE_LLM_ERROR_RATE", 0)),
+            reply_tokens=int(os.getenv("FAKE_LLM_REPLY_TOKENS", 40)),
+            tokens_per_second=float(os.getenv("FAKE_LLM_TOKENS_PER_SECOND", 80)),
+            seed=int(seed) if seed is not None else None,
+        )
+
+    def _sample_latency(self) -> float:
+        """Return one latency sample in seconds."""
+        mean = self.latency_ms
+        if self.distribution == "fixed" or self.latency_jitter_ms <= 0:
+            value = mean
+        elif self.distribution == "uniform":
+            value = self._rng.uniform(mean - self.latency_jitter_ms, mean + self.latency_jitter_ms)
+        else:
+            # Parametrise the lognormal so it keeps the configured mean and spread.
+            variance = self.latency_jitter_ms ** 2
+            sigma2 = math.log(1 + variance / max(mean, 1e-6) ** 2)
+            mu = math.log(max(mean, 1e-6)) - sigma2 / 2
+            value = self._rng.lognormvariate(mu, sigma2 ** 0.5)
+        return max(value, 0.0) / 1000.0
+
+    def _should_fail(self) -> bool:
+        return bool(self.error_rate) and self._rng.random() < self.error_rate
+
+    def _reply_tokens(self, prompt: str) -> list:
+        digest = hashlib.sha256(prompt.encode("utf-8")).digest()
+        words = []
+        for i in range(self.reply_tokens):
+            words.append(self._WORDS[digest[i % len(digest)] % len(self._WORDS)])
+        return words
+
+    def reply_for(self, prompt: str) -> str:
+        """Deterministic reply text for a prompt (no latency, no errors)."""
+        return " ".join(self._reply_tokens(prompt))
+
+    def generate(self, prompt: str, generation_config: Optional[Dict] = None) -> str:
+        latency = self._sample_latency()
+        failed = self._should_fail()
+        time.sleep(latency)
+        if failed:
+            raise LLMBackendError("Simulated backend failure")
+        return self.reply_for(prompt)
+
+    async def agenerate(self, prompt: str, generation_config: Optional[Dict] = None) -> str:
+        latency = self._sample_latency()
+        failed = self._should_fail()
+        await asyncio.sleep(latency)
+        if failed:
+            raise LLMBackendError("Simulated backend failure")
+        return self.reply_for(prompt)
+
+    def _stream_plan(self, prompt: str):
+        """Return (time to first token, delay between tokens, tokens)."""
+        tokens = self._reply_tokens(prompt)
+        total = self._sample_latency()
+        per_token = 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+        first_token = max(total - per_token * len(tokens), 0.0)
+        return first_token, per_token, tokens
+
+    def stream(self, prompt: str, generation_config: Optional[Dict] = None) -> Iterator[str]:
+        first_token, per_token, tokens = self._stream_plan(prompt)
+        failed = self._should_fail()
+        time.sleep(first_token)
+        if failed:
+            raise LLMBackendError("Simulated backend failure")
+        for i, token in enumerate(tokens):
+            if i:
+                time.sleep(per_token)
+            yield token if i == 0 else " " + token
+
+    async def astream(self, prompt: str, generation_config: Optional[Dict] = None) -> AsyncIterator[str]:
+        first_token, per_token, tokens = self._stream_plan(prompt)
+        failed = self._should_fail()
+        await asyncio.sleep(first_token)
+        if failed:
+            raise LLMBackendError("Simulated backend failure")
+        for i, token in enumerate(tokens):
+            if i:
+                await asyncio.sleep(per_token)
+            yield token if i == 0 else " " + token
+
+
+def create_backend(name: Optional[str] = None, **kwargs) -> LLMBackend:
+    """
+    Build the backend selected by name or by the LLM_BACKEND env variable.
+
+    Args:
+        name: "gemini" or "fake"; defaults to LLM_BACKEND, then "gemini"
+        **kwargs: Extra arguments for the backend constructor
+
+    Returns:
+        A backend instance
+    """
+    name = (name or os.getenv("LLM_BACKEND") or "gemini").lower()
+    if name == "gemini":
+        kwargs.setdefault("api_key", os.getenv("API_AI"))
+        kwargs.setdefault("model_name", os.getenv("LLM_MODEL", "gemini-2.5-flash"))
+        return GeminiBackend(**kwargs)
+    if name == "fake":
+        if kwargs:
+            return FakeBackend(**kwargs)
+        return FakeBackend.from_env()
+    raise ValueError(f"Unknown LLM backend: {name}")
@@ -0,0 +1,175 @@
+"""
+Load test for the /chat endpoint.
+
+Drives the AI service with a number of concurrent virtual users. Each user
+sends a sequence of messages with a short think time between them, which is
+close to how the mobile chat screen is used. Run it against the fake backend
+so no network access or API key is needed:
+
+    python load_test_chat.py --spawn --users 32 --messages 20
+
+--spawn starts the service in-process with LLM_BACKEND=fake. Without it the
+script targets an already running service (see --url).
+"""
+import argparse
+import json
+import os
+import random
+import socket
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+PROMPTS = [
+    "Cand expira cartea mea de identitate?",
+    "Cum adaug un permis de conducere?",
+    "Ce documente am in portofel?",
+    "Cum fac o programare la ghiseu?",
+    "Este valabil pasaportul meu?",
+    "Cum schimb adresa de domiciliu?",
+    "Ce acte imi trebuie pentru inmatriculare?",
+    "Cum verific ITP-ul masinii?",
+]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def spawn_service(port: int):
+    """Start the AI service in a background thread using the fake backend."""
+    os.environ["LLM_BACKEND"] = "fake"
+    import uvicorn
+    from main import app
+
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+
+    deadline = time.time() + 15
+    while not server.started:
+        if time.time() > deadline:
+            raise RuntimeError("AI service did not start in time")
+        time.sleep(0.05)
+    return server, thread
+
+
+def send_chat(url: str, user_id: str, content: str, timeout: float) -> Dict:
+    payload = json.dumps({
+        "message_type": "ChatBot",
+        "user_id": user_id,
+        "content": content,
+    }).encode("utf-8")
+    request = urllib.request.Request(
+        f"{url}/chat",
+        data=payload,
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except Exception:
+        status = 0
+    return {"latency": time.perf_counter() - start, "status": status}
+
+
+def run_user(url: str, user_index: int, messages: int, think_time: float,
+             timeout: float, seed: int) -> List[Dict]:
+    rng = random.Random(seed + user_index)
+    user_id = f"load-user-{user_index}"
+    results = []
+    for i in range(messages):
+        prompt = rng.choice(PROMPTS)
+        if rng.random() < 0.5:
+            # Half of the messages are unique so the response cache is not hit.
+            prompt = f"{prompt} ({user_id} #{i})"
+        results.append(send_chat(url, user_id, prompt, timeout))
+        if think_time:
+            time.sleep(rng.uniform(0, think_time * 2))
+    return results
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def summarize(results: List[Dict], elapsed: float) -> Dict:
+    latencies = [r["latency"] * 1000 for r in results if r["status"] == 200]
+    errors = [r for r in results if r["status"] != 200]
+    return {
+        "requests": len(results),
+        "errors": len(errors),
+        "error_rate": round(len(errors) / len(results), 4) if results else 0.0,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(results) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(statistics.mean(latencies), 2) if latencies else 0.0,
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+            "max": round(max(latencies), 2) if latencies else 0.0,
+        },
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test the /chat endpoint")
+    parser.add_argument("--url", default="http://127.0.0.1:8001")
+    parser.add_argument("--spawn", action="store_true",
+                        help="start the service in-process with the fake backend")
+    parser.add_argument("--users", type=int, default=32, help="concurrent virtual users")
+    parser.add_argument("--messages", type=int, default=20, help="messages per user")
+    parser.add_argument("--think-time", type=float, default=0.5,
+                        help="mean pause between messages of one user (s)")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON summary to this file")
+    args = parser.parse_args(argv)
+
+    url = args.url.rstrip("/")
+    server = None
+    if args.spawn:
+        port = _free_port()
+        server, _ = spawn_service(port)
+        url = f"http://127.0.0.1:{port}"
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.users) as pool:
+        futures = [
+            pool.submit(run_user, url, i, args.messages, args.think_time, args.timeout, args.seed)
+            for i in range(args.users)
+        ]
+        results = [r for f in futures for r in f.result()]
+    elapsed = time.perf_counter() - start
+
+    summary = summarize(results, elapsed)
+    summary["users"] = args.users
+    summary["backend"] = os.getenv("LLM_BACKEND", "gemini")
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+
+    if server is not None:
+        server.should_exit = True
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,8 +1,9 @@
-from fastapi import FastAPI, UploadFile, File
+from fastapi import FastAPI, UploadFile, File, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Any
+from typing import Any, Optional
 
 app = FastAPI(
     title="AI microservice",
@@ -24,8 +25,10 @@ class MessageRequest(BaseModel):
 
 from chat_bot import ChatBot
 from ocr_identitycard import IDCardProcessor
+from request_profiler import RequestProfiler
 chatbot = ChatBot()
 ocr = IDCardProcessor()
+profiler = RequestProfiler.from_env()
 @app.get("/health")
 async def health():
     return "salut"
@@ -33,11 +36,50 @@ async def health():
 @app.post("/chat")
 async def chat(request: MessageRequest):
     print(request.content)
-    response = await chatbot.get_response(request.content) 
+    response = await chatbot.get_response(request.content, request.user_id)
     return response
 
+@app.post("/chat/stream")
+async def chat_stream(request: MessageRequest):
+    return StreamingResponse(
+        chatbot.stream_response(request.content, request.user_id),
+        media_type="text/plain; charset=utf-8"
+    )
+
 @app.post("/ocr")
-async def ocr_endpoint(request: MessageRequest):
+async def ocr_endpoint(request: MessageRequest, x_profile: Optional[str] = Header(default=None)):
     print("ceva")
-    result = ocr.process_id_card_from_base64(request.content)
-    return {"result": str(result)}
\ No newline at end of file
+    reason = profiler.should_profile(x_profile)
+    if reason is None:
+        result = ocr.process_id_card_from_base64(request.content)
+        return {"result": str(result)}
+
+    with ocr.collect_stage_timings() as stages:
+        with profiler.capture("/ocr", reason, stages=stages) as record:
+            result = ocr.process_id_card_from_base64(request.content)
+    return {"result": str(result), "profile_id": record.id}
+
+def _require_profile_token(token: Optional[str]):
+    if not profiler.check_token(token):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+# Profiles contain stack traces and the stats are per user; both are only
+# served when AI_PROFILE_DEBUG_TOKEN is set
+if profiler.debug_token:
+    @app.get("/chat/stats")
+    async def chat_stats(x_profile_token: Optional[str] = Header(default=None)):
+        _require_profile_token(x_profile_token)
+        return chatbot.conversations.stats()
+
+    @app.get("/debug/profiles")
+    async def list_profiles(x_profile_token: Optional[str] = Header(default=None)):
+        _require_profile_token(x_profile_token)
+        return profiler.list_profiles()
+
+    @app.get("/debug/profiles/{profile_id}")
+    async def get_profile(profile_id: int, x_profile_token: Optional[str] = Header(default=None)):
+        _require_profile_token(x_profile_token)
+        record = profiler.get_profile(profile_id)
+        if record is None:
+            raise HTTPException(status_code=404, detail="Profile not found")
+        return {**record.summary(), "stats": record.stats}
@@ -2,12 +2,18 @@ import cv2
 import numpy as np
 import pytesseract
 pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
-from typing import Dict, List, Tuple, Optional
+from typing import Any, Dict, List, Tuple, Optional
+from contextlib import contextmanager
 import json
 import base64
+import re
 import tempfile
+import threading
+import time
 import os
 
+from id_validation import cnp_check_digit, parse_expiry, validate_id_card
+
 
 class IDCardProcessor:
     """
@@ -34,6 +40,24 @@ class IDCardProcessor:
         "cnp": r'--psm 7 -c tessedit_char_whitelist=0123456789MF --oem 3'
     }
     
+    # Page segmentation modes tried when a field fails validation
+    FALLBACK_PSM = {"7": "6", "13": "7"}
+    
+    # Pixels added around a crop box when a field is read again
+    REREAD_PADDING = 6
+    
+    # Crop box each output field is read from
+    FIELD_SOURCES = {
+        "first_name": "nume_full",
+        "last_name": "nume_full",
+        "serie": "serie_nr",
+        "nr": "serie_nr",
+        "place_of_birth": "place_of_birth",
+        "address": "address",
+        "cnp": "cnp",
+        "expiration_date": "cnp",
+    }
+    
     # Default crop boxes for each field (x1, y1, x2, y2)
     DEFAULT_CROP_BOXES = {
         "nume_full": (50, 190, 990, 245),
@@ -46,7 +70,8 @@ class IDCardProcessor:
     def __init__(self, 
                  crop_boxes: Optional[Dict] = None,
                  tess_config: Optional[Dict] = None,
-                 crop_region: Optional[Dict] = None):
+                 crop_region: Optional[Dict] = None,
+                 reread_invalid: bool = True):
         """
         Initialize the ID Card Processor.
         
@@ -54,10 +79,44 @@ class IDCardProcessor:
             crop_boxes: Dictionary of field crop boxes (x1, y1, x2, y2)
             tess_config: Dictionary of Tesseract configurations for each field
             crop_region: Dictionary defining the crop region (x1, y1, x2, y2)
+            reread_invalid: Read fields that fail validation once more with a
+                fallback Tesseract configuration
         """
         self.crop_boxes = crop_boxes or self.DEFAULT_CROP_BOXES.copy()
         self.tess_config = tess_config or self.DEFAULT_TESS_CONFIG.copy()
         self.crop_region = crop_region or self.DEFAULT_CROP_REGION.copy()
+        self.reread_invalid = reread_invalid
+        self._local = threading.local()
+    
+    @contextmanager
+    def collect_stage_timings(self):
+        """
+        Record how long each pipeline stage takes on the current thread.
+        
+        Yields:
+            Dictionary filled with stage name -> milliseconds
+        """
+        timings: Dict[str, float] = {}
+        previous = getattr(self._local, "timings", None)
+        self._local.timings = timings
+        try:
+            yield timings
+        finally:
+            self._local.timings = previous
+    
+    @contextmanager
+    def _stage(self, name: str):
+        """Time one pipeline stage when stage timings are being collected."""
+        timings = getattr(self._local, "timings", None)
+        if timings is None:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            timings[name] = timings.get(name, 0.0) + elapsed
     
     def load_image(self, image_path: str) -> np.ndarray:
         """
@@ -77,16 +136,15 @@ class IDCardProcessor:
             raise FileNotFoundError(f"Image not found: {image_path}")
         return img
     
-    def base64_to_image(self, base64_string: str, output_path: Optional[str] = None) -> str:
+    def decode_base64_image(self, base64_string: str) -> np.ndarray:
         """
-        Convert a base64 string to a JPG image file.
+        Decode a base64 string straight into a BGR image, without a temp file.
         
         Args:
             base64_string: Base64 encoded image string
-            output_path: Optional output path. If None, creates a temporary file
             
         Returns:
-            Path to the created image file
+            Decoded image as numpy array
             
         Raises:
             ValueError: If base64 string is invalid
@@ -94,32 +152,49 @@ class IDCardProcessor:
         try:
             # Remove data URL prefix if present (e.g., "data:image/jpeg;base64,")
             if ',' in base64_string:
-                base64_string = base64_string.split(',')[1]
-            
-            # Decode base64 string
-            image_data = base64.b64decode(base64_string)
+                base64_string = base64_string.split(',', 1)[1]
             
-            # Convert to numpy array
-            nparr = np.frombuffer(image_data, np.uint8)
-            
-            # Decode image
-            img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-            
-            if img is None:
-                raise ValueError("Invalid image data in base64 string")
+            with self._stage("decode"):
+                # Decode base64 string
+                image_data = base64.b64decode(base64_string)
+                
+                # Wrap the bytes without copying them and decode the image
+                img = cv2.imdecode(np.frombuffer(image_data, np.uint8), cv2.IMREAD_COLOR)
+                # The compressed bytes are no longer needed once decoded
+                del image_data
+        except Exception as e:
+            raise ValueError(f"Error converting base64 to image: {e}")
+        
+        if img is None:
+            raise ValueError("Error converting base64 to image: Invalid image data in base64 string")
+        return img
+    
+    def base64_to_image(self, base64_string: str, output_path: Optional[str] = None) -> str:
+        """
+        Convert a base64 string to a JPG image file.
+        
+        Args:
+            base64_string: Base64 encoded image string
+            output_path: Optional output path. If None, creates a temporary file
             
-            # Generate output path if not provided
-            if output_path is None:
-                temp_fd, output_path = tempfile.mkstemp(suffix='.jpg')
-                os.close(temp_fd)  # Close the file descriptor
+        Returns:
+            Path to the created image file
             
-            # Save as JPG
+        Raises:
+            ValueError: If base64 string is invalid
+        """
+        img = self.decode_base64_image(base64_string)
+        
+        # Generate output path if not provided
+        if output_path is None:
+            temp_fd, output_path = tempfile.mkstemp(suffix='.jpg')
+            os.close(temp_fd)  # Close the file descriptor
+        
+        # Save as JPG
+        with self._stage("write_temp"):
             cv2.imwrite(output_path, img)
-            
-            return output_path
-            
-        except Exception as e:
-            raise ValueError(f"Error converting base64 to image: {e}")
+        
+        return output_path
     
     def image_to_base64(self, image_path: str) -> str:
         """
@@ -149,13 +224,14 @@ class IDCardProcessor:
         except Exception as e:
             raise ValueError(f"Error converting image to base64: {e}")
     
-    def process_id_card_from_base64(self, base64_string: str, cleanup_temp: bool = True) -> Dict[str, str]:
+    def process_id_card_from_base64(self, base64_string: str) -> Dict[str, Any]:
         """
         Process an ID card from a base64 string.
         
+        The image is decoded in memory; no temporary file is written.
+        
         Args:
             base64_string: Base64 encoded image string
-            cleanup_temp: Whether to delete the temporary image file after processing
             
         Returns:
             Dictionary with all processed field values
@@ -163,23 +239,56 @@ class IDCardProcessor:
         Raises:
             ValueError: If base64 string is invalid
         """
-        temp_image_path = None
-        try:
-            # Convert base64 to temporary image file
-            temp_image_path = self.base64_to_image(base64_string)
-            
-            # Process the temporary image
-            result = self.process_id_card(temp_image_path)
-            
-            return result
+        img = self.decode_base64_image(base64_string)
+        return self.process_id_card_image(img)
+    
+    def _scratch(self, name: str, shape: Tuple[int, ...]) -> np.ndarray:
+        """
+        Return a per-thread scratch buffer, reallocated only when the shape changes.
+        
+        Every worker thread keeps its own buffers, so concurrent requests never
+        share memory while steady-state requests allocate nothing new.
+        """
+        buffers = getattr(self._local, "buffers", None)
+        if buffers is None:
+            buffers = self._local.buffers = {}
+        buf = buffers.get(name)
+        if buf is None or buf.shape != shape:
+            buf = np.empty(shape, dtype=np.uint8)
+            buffers[name] = buf
+        return buf
+    
+    def _clahe(self):
+        """Per-thread CLAHE object (creating one per request is wasted work)."""
+        clahe = getattr(self._local, "clahe", None)
+        if clahe is None:
+            clahe = self._local.clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+        return clahe
+    
+    def crop_view(self, img: np.ndarray) -> np.ndarray:
+        """
+        Return the crop region as a view of the unrotated image.
+        
+        The crop region is defined on the image rotated 90 degrees
+        counterclockwise. A pixel (row r, col c) of the rotated image is pixel
+        (row c, col W - 1 - r) of the original, so the region maps to rows
+        [x1, x2) and columns [W - y2, W - y1) of the original. Slicing those
+        gives the same pixels without rotating (copying) the whole photo.
+        
+        Args:
+            img: Input image, as captured
             
-        finally:
-            # Clean up temporary file if requested
-            if cleanup_temp and temp_image_path and os.path.exists(temp_image_path):
-                try:
-                    os.remove(temp_image_path)
-                except Exception as e:
-                    print(f"Warning: Could not delete temporary file {temp_image_path}: {e}")
+        Returns:
+            View of the crop region, still in the unrotated orientation
+        """
+        h, w = img.shape[:2]
+        # Width and height of the rotated image are the original height and width
+        x1 = int(self.crop_region['x1'] * h)
+        y1 = int(self.crop_region['y1'] * w)
+        x2 = int(self.crop_region['x2'] * h)
+        y2 = int(self.crop_region['y2'] * w)
+        
+        return img[x1:x2, w - y2:w - y1]
     
     def crop_image(self, img: np.ndarray) -> np.ndarray:
         """
@@ -189,17 +298,10 @@ class IDCardProcessor:
             img: Input image
             
         Returns:
-            Cropped and rotated image
+            Cropped and rotated image (a view, no pixels are copied)
         """
-        img_rotated = cv2.rotate(img, cv2.ROTATE_90_COUNTERCLOCKWISE)
-        h, w = img_rotated.shape[:2]
-        
-        x1 = int(self.crop_region['x1'] * w)
-        y1 = int(self.crop_region['y1'] * h)
-        x2 = int(self.crop_region['x2'] * w)
-        y2 = int(self.crop_region['y2'] * h)
-        
-        return img_rotated[y1:y2, x1:x2]
+        with self._stage("crop"):
+            return np.rot90(self.crop_view(img))
     
     def remove_shadows_and_binarize(self, img_bgr: np.ndarray, 
                                    ksize: int = 61, 
@@ -207,30 +309,66 @@ class IDCardProcessor:
         """
         Remove shadows and binarize the image for better OCR results.
         
+        Works in two per-thread scratch buffers: every step writes into one of
+        them with dst= instead of allocating a new image.
+        
         Args:
             img_bgr: Input BGR image
             ksize: Kernel size for median blur (should be odd)
             threshold: Binary threshold value
             
         Returns:
-            Binarized grayscale image
+            Binarized grayscale image. This is a scratch buffer that is
+            overwritten by the next call on the same thread; copy it to keep it.
         """
-        gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
+        shape = img_bgr.shape[:2]
+        gray = self._scratch("gray", shape)
+        bg = self._scratch("background", shape)
+        
+        with self._stage("grayscale"):
+            cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY, dst=gray)
         
         # Estimate illumination (background)
-        bg = cv2.medianBlur(gray, ksize)
+        with self._stage("median_blur"):
+            cv2.medianBlur(gray, ksize, dst=bg)
         
         # Flatten illumination (division keeps text contrast)
-        norm = cv2.divide(gray, bg, scale=255)
+        with self._stage("divide"):
+            cv2.divide(gray, bg, dst=bg, scale=255)
         
         # Optional: local contrast to enhance text
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-        enhanced = clahe.apply(norm)
+        with self._stage("clahe"):
+            self._clahe().apply(bg, dst=gray)
         
         # Binarize
-        _, binary = cv2.threshold(enhanced, threshold, 255, cv2.THRESH_BINARY)
+        with self._stage("threshold"):
+            cv2.threshold(gray, threshold, 255, cv2.THRESH_BINARY, dst=gray)
+        
+        return gray
+    
+    def _preprocess(self, img: np.ndarray) -> np.ndarray:
+        """
+        Preprocess a decoded image into the OCR-ready card.
+        
+        Grayscale, background removal, CLAHE, threshold and resize all run on
+        the unrotated crop view; only the final small image is rotated.
+        Median blur and thresholding do not depend on orientation, but the
+        CLAHE tiles and the resize interpolation do, so the result is close
+        to rotating first rather than identical.
         
-        return binary
+        Returns:
+            TARGET_HEIGHT x TARGET_WIDTH image in a per-thread scratch buffer
+        """
+        with self._stage("crop"):
+            view = self.crop_view(img)
+        processed = self.remove_shadows_and_binarize(view)
+        with self._stage("resize"):
+            # Resize in the unrotated frame: width and height are swapped
+            resized = self._scratch("resized", (self.TARGET_WIDTH, self.TARGET_HEIGHT))
+            cv2.resize(processed, (self.TARGET_HEIGHT, self.TARGET_WIDTH), dst=resized)
+            card = self._scratch("card", (self.TARGET_HEIGHT, self.TARGET_WIDTH))
+            cv2.rotate(resized, cv2.ROTATE_90_COUNTERCLOCKWISE, dst=card)
+        return card
     
     def preprocess_image(self, image_path: str) -> np.ndarray:
         """
@@ -242,19 +380,20 @@ class IDCardProcessor:
         Returns:
             Preprocessed image ready for OCR
         """
-        img = self.load_image(image_path)
-        cropped = self.crop_image(img)
-        processed = self.remove_shadows_and_binarize(cropped)
-        resized = cv2.resize(processed, (self.TARGET_WIDTH, self.TARGET_HEIGHT))
-        return resized
+        with self._stage("load"):
+            img = self.load_image(image_path)
+        return self._preprocess(img).copy()
     
-    def extract_field_text(self, image: np.ndarray, field_name: str) -> str:
+    def extract_field_text(self, image: np.ndarray, field_name: str,
+                           config: Optional[str] = None, padding: int = 0) -> str:
         """
         Extract text from a specific field using OCR.
         
         Args:
             image: Preprocessed image
             field_name: Name of the field to extract
+            config: Tesseract configuration; defaults to the field's configuration
+            padding: Pixels added around the crop box
             
         Returns:
             Extracted and cleaned text
@@ -263,13 +402,27 @@ class IDCardProcessor:
             raise ValueError(f"Unknown field: {field_name}")
         
         x1, y1, x2, y2 = self.crop_boxes[field_name]
+        if padding:
+            h, w = image.shape[:2]
+            x1, y1 = max(x1 - padding, 0), max(y1 - padding, 0)
+            x2, y2 = min(x2 + padding, w), min(y2 + padding, h)
         roi = image[y1:y2, x1:x2]
         
-        config = self.tess_config.get(field_name, "--psm 7")
-        text = pytesseract.image_to_string(roi, config=config, lang='ron')
+        if config is None:
+            config = self.tess_config.get(field_name, "--psm 7")
+        with self._stage(f"tesseract:{field_name}"):
+            text = pytesseract.image_to_string(roi, config=config, lang='ron')
         
         return text.strip().replace("\n", " ")
     
+    def _extract_fields(self, processed_image: np.ndarray) -> List[Tuple[str, str]]:
+        results = []
+        for field_name in self.crop_boxes.keys():
+            text = self.extract_field_text(processed_image, field_name)
+            results.append((field_name, text))
+        
+        return results
+    
     def extract_all_fields(self, image_path: str) -> List[Tuple[str, str]]:
         """
         Extract all configured fields from the ID card image.
@@ -280,14 +433,9 @@ class IDCardProcessor:
         Returns:
             List of tuples (field_name, extracted_text)
         """
-        processed_image = self.preprocess_image(image_path)
-        
-        results = []
-        for field_name in self.crop_boxes.keys():
-            text = self.extract_field_text(processed_image, field_name)
-            results.append((field_name, text))
-        
-        return results
+        with self._stage("load"):
+            img = self.load_image(image_path)
+        return self._extract_fields(self._preprocess(img))
     
     def _process_full_name(self, text: str) -> Dict[str, str]:
         """Process the full name field to extract first and last names."""
@@ -334,22 +482,34 @@ class IDCardProcessor:
         
         # Determine first digit of CNP based on gender and year
         if gender_char == 'M':
-            first_digit = '1' if first_two_number > 20 else '5'
+            candidates = ['1', '5'] if first_two_number > 20 else ['5', '1']
         else:  # gender_char == 'F'
-            first_digit = '2' if first_two_number > 20 else '6'
+            candidates = ['2', '6'] if first_two_number > 20 else ['6', '2']
         
         # Construct CNP and expiration date
         first_six = text[:6]
         last_six = text[-6:]
-        cnp = first_digit + first_six + last_six
         remaining_part = text[6:-6]
         
+        # The century digit is not printed; keep the one the check digit agrees with
+        cnp = candidates[0] + first_six + last_six
+        for first_digit in candidates:
+            candidate = first_digit + first_six + last_six
+            if len(candidate) == 13 and candidate.isdigit() and cnp_check_digit(candidate[:12]) == candidate[12]:
+                cnp = candidate
+                break
+        
+        expiration_date = remaining_part[-6:] if remaining_part else ""
+        expiry = parse_expiry(expiration_date)
+        if expiry is not None:
+            expiration_date = expiry.isoformat()
+        
         return {
             "cnp": cnp,
-            "expiration_date": remaining_part[-6:] if remaining_part else ""
+            "expiration_date": expiration_date
         }
     
-    def convert_to_json(self, extracted_fields: List[Tuple[str, str]]) -> Dict[str, str]:
+    def convert_to_json(self, extracted_fields: List[Tuple[str, str]]) -> Dict[str, Any]:
         """
         Convert extracted OCR fields to a structured JSON format.
         
@@ -357,9 +517,11 @@ class IDCardProcessor:
             extracted_fields: List of tuples (field_name, extracted_text)
             
         Returns:
-            Dictionary with processed field values
+            Dictionary with processed field values, plus a "validation" entry
+            mapping each field to {"valid": bool, "reason": str or None}
         """
         json_result = {}
+        errors = {}
         
         for field_name, text in extracted_fields:
             if field_name == "nume_full":
@@ -371,14 +533,77 @@ class IDCardProcessor:
             elif field_name == "address":
                 json_result["address"] = text
             elif field_name == "cnp":
-                json_result.update(self._process_cnp(text))
+                try:
+                    json_result.update(self._process_cnp(text))
+                except ValueError as e:
+                    json_result.update({"cnp": "", "expiration_date": ""})
+                    errors["cnp"] = errors["expiration_date"] = f"Unreadable CNP line: {e}"
             else:
                 # Default processing for unknown fields
                 json_result[field_name] = " ".join(text.split())
         
+        validation = validate_id_card(json_result)
+        for field, reason in errors.items():
+            validation[field] = {"valid": False, "reason": reason}
+        json_result["validation"] = validation
         return json_result
     
-    def process_id_card(self, image_path: str) -> Dict[str, str]:
+    def invalid_fields(self, result: Dict[str, Any]) -> List[str]:
+        """Names of the output fields that failed validation."""
+        return [field for field, check in result.get("validation", {}).items()
+                if not check["valid"]]
+    
+    def _fallback_config(self, field_name: str) -> str:
+        config = self.tess_config.get(field_name, "--psm 7")
+        match = re.search(r"--psm (\d+)", config)
+        if match and match.group(1) in self.FALLBACK_PSM:
+            return config.replace(match.group(0), f"--psm {self.FALLBACK_PSM[match.group(1)]}")
+        return config
+    
+    def _reread_invalid(self, image: np.ndarray,
+                        extracted_fields: List[Tuple[str, str]],
+                        result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Read again only the crop boxes behind invalid fields.
+        
+        Each box is read once more with a padded ROI and a fallback page
+        segmentation mode. A new reading is kept only when it makes more of
+        that box's fields valid; valid fields are never read twice.
+        """
+        invalid = self.invalid_fields(result)
+        sources = []
+        for field in invalid:
+            source = self.FIELD_SOURCES.get(field)
+            if source in self.crop_boxes and source not in sources:
+                sources.append(source)
+        if not sources:
+            return result
+        
+        def valid_count(res, source):
+            return sum(1 for field, src in self.FIELD_SOURCES.items()
+                       if src == source and res["validation"].get(field, {}).get("valid"))
+        
+        fields = dict(extracted_fields)
+        for source in sources:
+            text = self.extract_field_text(image, source,
+                                           config=self._fallback_config(source),
+                                           padding=self.REREAD_PADDING)
+            candidate_fields = dict(fields, **{source: text})
+            with self._stage("convert"):
+                candidate = self.convert_to_json(list(candidate_fields.items()))
+            if valid_count(candidate, source) > valid_count(result, source):
+                fields, result = candidate_fields, candidate
+        return result
+    
+    def _process_card(self, card: np.ndarray) -> Dict[str, Any]:
+        extracted_fields = self._extract_fields(card)
+        with self._stage("convert"):
+            result = self.convert_to_json(extracted_fields)
+        if self.reread_invalid:
+            result = self._reread_invalid(card, extracted_fields, result)
+        return result
+    
+    def process_id_card(self, image_path: str) -> Dict[str, Any]:
         """
         Complete processing pipeline: extract fields and convert to JSON.
         
@@ -388,8 +613,21 @@ class IDCardProcessor:
         Returns:
             Dictionary with all processed field values
         """
-        extracted_fields = self.extract_all_fields(image_path)
-        return self.convert_to_json(extracted_fields)
+        with self._stage("load"):
+            img = self.load_image(image_path)
+        return self._process_card(self._preprocess(img))
+    
+    def process_id_card_image(self, img: np.ndarray) -> Dict[str, Any]:
+        """
+        Process an already decoded ID card image.
+        
+        Args:
+            img: BGR image as captured (not rotated)
+            
+        Returns:
+            Dictionary with all processed field values
+        """
+        return self._process_card(self._preprocess(img))
     
     def draw_crop_grid(self, image_path: str, output_path: str = "id_card_grid.jpg",
                       color: Tuple[int, int, int] = (0, 255, 0), thickness: int = 2):
@@ -0,0 +1,159 @@
+import cProfile
+import hmac
+import io
+import itertools
+import os
+import pstats
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+TRUE_VALUES = ("1", "true", "yes", "on")
+
+
+@dataclass
+class ProfileRecord:
+    id: int
+    endpoint: str
+    reason: str
+    started_at: str
+    duration_ms: float = 0.0
+    stages: Dict[str, float] = field(default_factory=dict)
+    stats: str = ""
+    error: Optional[str] = None
+
+    def summary(self) -> Dict:
+        data = asdict(self)
+        data.pop("stats")
+        return data
+
+
+class RequestProfiler:
+    """
+    Opt-in cProfile capture for individual requests.
+
+    A request is profiled when it carries the profiling header or when it is
+    picked by random sampling. Finished profiles are kept in a bounded ring
+    buffer so the newest ones can be fetched from a debug endpoint. Both the
+    header and the debug endpoints are off unless configured: the header with
+    allow_header, the endpoints by setting debug_token, which callers then
+    have to send.
+    """
+
+    def __init__(self,
+                 sample_rate: float = 0.0,
+                 capacity: int = 50,
+                 allow_header: bool = False,
+                 top_n: int = 30,
+                 debug_token: Optional[str] = None):
+        """
+        Args:
+            sample_rate: Fraction of requests profiled without the header (0..1)
+            capacity: Number of profiles kept in the ring buffer
+            allow_header: Whether the X-Profile header can force profiling
+            top_n: Number of functions kept in each pstats report
+            debug_token: Secret required by the /debug/profiles endpoints;
+                when None the endpoints are not registered
+        """
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        self.sample_rate = sample_rate
+        self.allow_header = allow_header
+        self.top_n = top_n
+        self.debug_token = debug_token or None
+        self._records = deque(maxlen=capacity)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        # cProfile can only run one profiler per thread at a time.
+        self._active = threading.local()
+
+    @classmethod
+    def from_env(cls) -> "RequestProfiler":
+        """Build a profiler from AI_PROFILE_* environment variables."""
+        return cls(
+            sample_rate=float(os.getenv("AI_PROFILE_SAMPLE_RATE", 0)),
+            capacity=int(os.getenv("AI_PROFILE_CAPACITY", 50)),
+            allow_header=os.getenv("AI_PROFILE_ALLOW_HEADER", "0").lower() in TRUE_VALUES,
+            debug_token=os.getenv("AI_PROFILE_DEBUG_TOKEN"),
+        )
+
+    def check_token(self, token: Optional[str]) -> bool:
+        """Whether token grants access to the stored profiles."""
+        if not self.debug_token or not token:
+            return False
+        return hmac.compare_digest(token.encode("utf-8"), self.debug_token.encode("utf-8"))
+
+    def should_profile(self, header_value: Optional[str] = None) -> Optional[str]:
+        """
+        Decide whether the current request is profiled.
+
+        Returns:
+            "header" or "sample" when the request should be profiled, else None
+        """
+        if self.allow_header and header_value and header_value.lower() in TRUE_VALUES:
+            return "header"
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sample"
+        return None
+
+    @contextmanager
+    def capture(self, endpoint: str, reason: str, stages: Optional[Dict[str, float]] = None):
+        """
+        Profile the enclosed block and store the result.
+
+        Args:
+            endpoint: Name stored with the profile
+            reason: Why the request was profiled ("header" or "sample")
+            stages: Dict filled with per-stage timings while the block runs
+        """
+        record = ProfileRecord(
+            id=next(self._ids),
+            endpoint=endpoint,
+            reason=reason,
+            started_at=datetime.now(timezone.utc).isoformat(),
+        )
+        if getattr(self._active, "busy", False):
+            # Nested capture on the same thread: time it but skip cProfile.
+            yield record
+            return
+
+        profile = cProfile.Profile()
+        self._active.busy = True
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            yield record
+        except Exception as e:
+            record.error = str(e)
+            raise
+        finally:
+            profile.disable()
+            self._active.busy = False
+            record.duration_ms = round((time.perf_counter() - start) * 1000, 3)
+            if stages:
+                record.stages = {name: round(ms, 3) for name, ms in stages.items()}
+            record.stats = self._format_stats(profile)
+            with self._lock:
+                self._records.append(record)
+
+    def _format_stats(self, profile: cProfile.Profile) -> str:
+        stream = io.StringIO()
+        stats = pstats.Stats(profile, stream=stream)
+        stats.sort_stats("cumulative").print_stats(self.top_n)
+        return stream.getvalue()
+
+    def list_profiles(self) -> List[Dict]:
+        with self._lock:
+            return [record.summary() for record in reversed(self._records)]
+
+    def get_profile(self, profile_id: int) -> Optional[ProfileRecord]:
+        with self._lock:
+            for record in self._records:
+                if record.id == profile_id:
+                    return record
+        return None
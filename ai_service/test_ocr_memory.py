@@ -0,0 +1,54 @@
+"""
+tracemalloc check for the OCR preprocessing pipeline (see bench_ocr_memory.py).
+
+    python -m pytest test_ocr_memory.py
+"""
+import base64
+import tracemalloc
+
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+pytest.importorskip("pytesseract")
+
+from bench_ocr_memory import measure, synthetic_card  # noqa: E402
+from ocr_identitycard import IDCardProcessor  # noqa: E402
+
+# Steady-state peak per card, in decoded-image sizes: the decoded photo plus
+# the compressed bytes held while decoding it (the synthetic card is noise,
+# so its JPEG is large). Rotating or converting the full photo again would
+# add a whole copy and fail this.
+MAX_COPIES = 2.0
+CARDS = 3
+
+
+@pytest.fixture(scope="module")
+def card_payload():
+    img = synthetic_card()
+    ok, encoded = cv2.imencode(".jpg", img)
+    assert ok
+    return base64.b64encode(encoded.tobytes()).decode("ascii"), img.nbytes
+
+
+def test_preprocess_peak_memory(card_payload):
+    payload, decoded_bytes = card_payload
+    processor = IDCardProcessor()
+    tracemalloc.start()
+    try:
+        peaks = [measure(processor, payload, run_ocr=False) for _ in range(CARDS)]
+    finally:
+        tracemalloc.stop()
+
+    # The first card allocates the per-thread scratch buffers
+    steady = max(peaks[1:])
+    assert steady / decoded_bytes <= MAX_COPIES, (
+        f"peak {steady} bytes is {steady / decoded_bytes:.2f} decoded images per card"
+    )
+
+
+def test_scratch_buffers_are_reused(card_payload):
+    payload, _ = card_payload
+    processor = IDCardProcessor()
+    first = processor._preprocess(processor.decode_base64_image(payload))
+    second = processor._preprocess(processor.decode_base64_image(payload))
+    assert first is second
@@ -1,27 +1,45 @@
+import time
+from importlib import import_module
+
+# Start of the cold start measurement (before Kivy and the screens are imported)
+_LOAD_STARTED = time.perf_counter()
+
 from kivy.uix.screenmanager import ScreenManager, SlideTransition
 from kivy.core.window import Window
+from kivy.clock import Clock
+from kivy.logger import Logger
 from kivy.vector import Vector
 from kivy.utils import platform
 
 from kivymd.app import MDApp
 
 from server_requests.server_connect import ServerConnection
-from frontend.screens.home_screen.home_screen import HomeScreen
-from frontend.screens.login_screen import LoginScreen
-from frontend.screens.home_screen.personal_docs_screen import PersonalDocsScreen
-from frontend.screens.home_screen.vehicul_docs_screen import VehiculDocsScreen
-from frontend.screens.home_screen.transport_docs_screen import TransportDocsScreen
-from frontend.screens.home_screen.diverse_docs_screen import DiverseDocsScreen
-from frontend.screens.home_screen.scan_camera_screen import CameraScanScreen
-from frontend.screens.register_screen import RegisterScreen
-from frontend.screens.splash_screen import SplashScreen
-from frontend.screens.server_setup_screen import ServerSetupScreen
-from frontend.screens.chat_screens.chat_screen import ChatScreen
-from frontend.screens.cards_screen.idenity_card import IDScreen
-from frontend.screens.settings.settings import SettingsScreen
-from frontend.screens.settings.account_info_screen import AccountInfoScreen
-from frontend.screens.settings.security_screen import SecurityScreen
-from frontend.screens.save_screens.save_data import SaveScreen
+
+# Screen classes by name as (module, class). A screen module, and what it
+# imports (camera, QR, dialogs, ...), is loaded when the screen is first built.
+SCREENS = {
+    'server_setup': ('frontend.screens.server_setup_screen', 'ServerSetupScreen'),
+    'first': ('frontend.screens.splash_screen', 'SplashScreen'),
+    'login': ('frontend.screens.login_screen', 'LoginScreen'),
+    'register': ('frontend.screens.register_screen', 'RegisterScreen'),
+    'home': ('frontend.screens.home_screen.home_screen', 'HomeScreen'),
+    'personal_docs': ('frontend.screens.home_screen.personal_docs_screen', 'PersonalDocsScreen'),
+    'vehicul_docs': ('frontend.screens.home_screen.vehicul_docs_screen', 'VehiculDocsScreen'),
+    'transport_docs': ('frontend.screens.home_screen.transport_docs_screen', 'TransportDocsScreen'),
+    'diverse_docs': ('frontend.screens.home_screen.diverse_docs_screen', 'DiverseDocsScreen'),
+    'camera_scan': ('frontend.screens.home_screen.scan_camera_screen', 'CameraScanScreen'),
+    'chat': ('frontend.screens.chat_screens.chat_screen', 'ChatScreen'),
+    'identity_card': ('frontend.screens.cards_screen.idenity_card', 'IDScreen'),
+    'settings': ('frontend.screens.settings.settings', 'SettingsScreen'),
+    'account_info': ('frontend.screens.settings.account_info_screen', 'AccountInfoScreen'),
+    'security': ('frontend.screens.settings.security_screen', 'SecurityScreen'),
+    'save_data': ('frontend.screens.save_screens.save_data', 'SaveScreen'),
+}
+
+
+def screen_class(name):
+    module_name, class_name = SCREENS[name]
+    return getattr(import_module(module_name), class_name)
 
 if platform == "android":
     from android.permissions import request_permissions, Permission
@@ -35,6 +53,44 @@ class SwipeScreenManager(ScreenManager):
         self.transition = SlideTransition(direction='up', duration=0.2)
         self.touch_start_pos = None
         self.min_swipe_distance = 100
+        # Screens registered but not built yet: name -> factory
+        self._factories = {}
+
+    def register_screen(self, name, factory):
+        """Build the screen with factory() the first time it is needed."""
+        self._factories[name] = factory
+
+    def _build_screen(self, name):
+        factory = self._factories.pop(name, None)
+        if factory is None:
+            return
+        start = time.perf_counter()
+        screen = factory()
+        self.add_widget(screen)
+        Logger.info(f"SwipeScreenManager: built '{name}' in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    def has_screen(self, name):
+        return name in self._factories or super().has_screen(name)
+
+    def get_screen(self, name):
+        # current = name goes through here too, so navigation builds on demand
+        if name in self._factories:
+            self._build_screen(name)
+        return super().get_screen(name)
+
+    def prebuild_when_idle(self, names, delay=0.5):
+        """Build the given screens in the background, one per frame, after delay."""
+        pending = list(names)
+
+        def build_next(dt):
+            while pending and pending[0] not in self._factories:
+                pending.pop(0)
+            if not pending:
+                return
+            self._build_screen(pending.pop(0))
+            Clock.schedule_once(build_next, 0)
+
+        Clock.schedule_once(build_next, delay)
         
     def on_touch_down(self, touch):
         self.touch_start_pos = touch.pos
@@ -103,22 +159,14 @@ class SmartIdApp(MDApp):
         self.theme_cls.primary_palette = "Blue"
                 
         sm = SwipeScreenManager()
-        sm.add_widget(ServerSetupScreen(self.server))
-        sm.add_widget(SplashScreen(self.server))
-        sm.add_widget(LoginScreen(self.server))
-        sm.add_widget(RegisterScreen(self.server))
-        sm.add_widget(HomeScreen(sm=sm, server=self.server))
-        sm.add_widget(PersonalDocsScreen(self.server))
-        sm.add_widget(VehiculDocsScreen(self.server))
-        sm.add_widget(TransportDocsScreen(self.server))
-        sm.add_widget(DiverseDocsScreen(self.server))
-        sm.add_widget(CameraScanScreen(self.server))
-        sm.add_widget(ChatScreen(self.server))
-        sm.add_widget(IDScreen(self.server))
-        sm.add_widget(SettingsScreen(self.server))
-        sm.add_widget(AccountInfoScreen(self.server))
-        sm.add_widget(SecurityScreen(self.server))
-        sm.add_widget(SaveScreen(self.server))
+        # Only the first screen is built before the first frame; the others
+        # on first navigation or while the app is idle (prebuild_when_idle)
+        server = self.server
+        for name in SCREENS:
+            if name == 'home':
+                sm.register_screen(name, lambda: screen_class('home')(sm=sm, server=server))
+            else:
+                sm.register_screen(name, lambda name=name: screen_class(name)(server))
         sm.current = 'server_setup'
         
         Window.bind(on_key_down=self._on_key_down)
@@ -127,6 +175,9 @@ class SmartIdApp(MDApp):
     
     def on_start(self):
         super().on_start()
+        Clock.schedule_once(self._on_first_frame, 0)
+        # The screens of the login flow, so the first transitions stay smooth
+        self.root.prebuild_when_idle(['first', 'login', 'home'])
         if platform == "android":
             permissions_to_request = [Permission.CAMERA]
             
@@ -142,6 +193,20 @@ class SmartIdApp(MDApp):
             
             request_permissions(permissions_to_request)
     
+    def _on_first_frame(self, dt):
+        Logger.info(f"SmartIdApp: first frame {(time.perf_counter() - _LOAD_STARTED) * 1000:.0f} ms after app import")
+
+    def on_pause(self):
+        # No health checks while the app is in the background
+        self.server.monitor.pause()
+        return True
+
+    def on_resume(self):
+        self.server.monitor.resume()
+
+    def on_stop(self):
+        self.server.close()
+    
     def _on_key_down(self, window, key, scancode, codepoint, modifier):
         if key == 274: 
             if self.root.current == 'login':
@@ -8,9 +8,10 @@ from kivymd.uix.boxlayout import MDBoxLayout
 from kivy.uix.scrollview import ScrollView
 from kivy.graphics import Color, RoundedRectangle
 from kivy.metrics import dp, sp
+from frontend.screens.widgets.async_loading import AsyncLoadMixin, loading_label
 
 
-class IDScreen(Screen):
+class IDScreen(AsyncLoadMixin, Screen):
     def __init__(self, server=None, **kwargs):
         super().__init__(name='identity_card', **kwargs)
         self.server = server
@@ -82,12 +83,19 @@ class IDScreen(Screen):
 
     def on_pre_enter(self, *args):
         self.doc_container.clear_widgets()
-        data = self.server.get_specific_data("GetIdenityCard")
-        for key, value in data['data'].items():
-            self.doc_container.add_widget(Label(text=str(key), font_size=sp(18)))
-            self.doc_container.add_widget(Label(text=str(value), font_size=sp(10)))
+        self.doc_container.add_widget(loading_label())
+        self.load_async("GetIdenityCard", self._on_card_loaded)
         
-        # Open the popup when entering the screen
+        # Open the popup when entering the screen; the fields fill in when loaded
         self.dialog.open()
         
-        return super().on_pre_enter(*args)
\ No newline at end of file
+        return super().on_pre_enter(*args)
+
+    def _on_card_loaded(self, data):
+        self.doc_container.clear_widgets()
+        if not data or 'data' not in data:
+            self.doc_container.add_widget(Label(text="No data available", font_size=sp(16)))
+            return
+        for key, value in data['data'].items():
+            self.doc_container.add_widget(Label(text=str(key), font_size=sp(18)))
+            self.doc_container.add_widget(Label(text=str(value), font_size=sp(10)))
\ No newline at end of file
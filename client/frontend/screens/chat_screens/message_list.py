@@ -0,0 +1,319 @@
+from kivy.animation import Animation
+from kivy.clock import Clock
+from kivy.core.text.markup import MarkupLabel
+from kivy.factory import Factory
+from kivy.metrics import dp, sp
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.widget import Widget
+from kivymd.app import MDApp
+from kivymd.uix.boxlayout import MDBoxLayout
+from kivymd.uix.card import MDCard
+from kivymd.uix.label import MDLabel
+from kivymd.uix.spinner import MDSpinner
+
+
+# Geometry shared by the row views and the height measurement
+LIST_PADDING_X = dp(15)
+ROW_SPACING = dp(10)
+BUBBLE_WIDTH = 0.7
+BUBBLE_PADDING = dp(12)
+BUBBLE_SPACING = dp(4)
+SENDER_HEIGHT = dp(16)
+LOADING_HEIGHT = dp(70)
+
+USER_COLOR = (0.2, 0.4, 1, 1)
+ASSISTANT_COLOR = (0.2, 0.2, 0.2, 1)
+
+
+class LoadingBubble(MDCard):
+    """Loading indicator bubble"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+        # Card properties
+        self.orientation = 'horizontal'
+        self.size_hint_y = None
+        self.height = dp(60)
+        self.padding = dp(12)
+        self.spacing = dp(8)
+        self.radius = [dp(20), dp(20), dp(20), dp(20)]
+        self.elevation = 2
+        self.md_bg_color = ASSISTANT_COLOR
+
+        self.build_bubble()
+
+    def build_bubble(self):
+        """Build the loading bubble content"""
+        # Loading spinner
+        spinner = MDSpinner(
+            size_hint=(None, None),
+            size=(dp(24), dp(24)),
+            pos_hint={'center_y': 0.5},
+            active=True,
+            palette=[(0.2, 0.8, 0.2, 1)]  # Green color
+        )
+        self.add_widget(spinner)
+
+        # "Typing..." label
+        typing_label = MDLabel(
+            text="Assistant scrie...",
+            size_hint_y=None,
+            height=dp(20),
+            theme_text_color="Custom",
+            text_color=(0.2, 0.8, 0.2, 1),
+            font_style="Body2",
+            pos_hint={'center_y': 0.5}
+        )
+        self.add_widget(typing_label)
+
+
+class MessageBubble(MDCard):
+    """Message bubble whose text and colors are set again each time its row is reused"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.orientation = 'vertical'
+        self.padding = BUBBLE_PADDING
+        self.spacing = BUBBLE_SPACING
+        self.radius = [dp(20), dp(20), dp(20), dp(20)]
+        self.elevation = 2
+
+        self.sender_label = MDLabel(
+            font_style="Caption",
+            size_hint_y=None,
+            height=SENDER_HEIGHT,
+            theme_text_color="Custom",
+        )
+        self.message_label = MDLabel(
+            theme_text_color="Custom",
+            text_color=(1, 1, 1, 1),
+            valign='top',
+            markup=True
+        )
+        self.add_widget(self.sender_label)
+        self.add_widget(self.message_label)
+
+    def show(self, sender, text, is_user):
+        self.sender_label.text = sender
+        self.sender_label.text_color = (1, 1, 1, 0.7) if is_user else (0.2, 0.8, 0.2, 1)
+        self.message_label.text = text
+        self.md_bg_color = USER_COLOR if is_user else ASSISTANT_COLOR
+
+
+class ChatMessageRow(RecycleDataViewBehavior, MDBoxLayout):
+    """One message, aligned right for the user and left for the assistant"""
+
+    def __init__(self, **kwargs):
+        super().__init__(orientation='horizontal', spacing=ROW_SPACING, **kwargs)
+        self.index = None
+        self.bubble = MessageBubble(size_hint_x=BUBBLE_WIDTH)
+        self.spacer = Widget(size_hint_x=1 - BUBBLE_WIDTH)
+
+    def refresh_view_attrs(self, rv, index, data):
+        self.index = index
+        self.bubble.show(data['sender'], data['text'], data['is_user'])
+        self.clear_widgets()
+        for widget in ((self.spacer, self.bubble) if data['is_user'] else (self.bubble, self.spacer)):
+            self.add_widget(widget)
+
+
+class ChatLoadingRow(RecycleDataViewBehavior, MDBoxLayout):
+    """The assistant's typing indicator, shown as the last row"""
+
+    def __init__(self, **kwargs):
+        super().__init__(orientation='horizontal', spacing=ROW_SPACING, **kwargs)
+        self.add_widget(LoadingBubble(size_hint_x=0.4))
+        self.add_widget(Widget(size_hint_x=0.6))
+
+    def refresh_view_attrs(self, rv, index, data):
+        self.index = index
+
+
+Factory.register('ChatMessageRow', cls=ChatMessageRow)
+Factory.register('ChatLoadingRow', cls=ChatLoadingRow)
+
+
+class MessageList(RecycleView):
+    """
+    Chat history where only the visible messages exist as widgets.
+
+    Messages are kept as plain dicts; the RecycleView reuses a handful of
+    row widgets for whichever of them are on screen. Row heights are
+    measured once per message and list width (so rotating back does not
+    measure again) and handed to the layout up front, so nothing jumps
+    while scrolling. At most HISTORY_LIMIT messages are retained; only the
+    newest WINDOW are in the list, older ones are loaded PAGE_SIZE at a time
+    when the user scrolls to the top.
+    """
+
+    HISTORY_LIMIT = 500
+    WINDOW = 100
+    PAGE_SIZE = 30
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.do_scroll_x = False
+        self.layout = RecycleBoxLayout(
+            orientation='vertical',
+            size_hint_y=None,
+            default_size=(None, dp(56)),
+            default_size_hint=(1, None),
+            key_size='view_size',
+            padding=[LIST_PADDING_X, dp(5)],
+            spacing=ROW_SPACING
+        )
+        self.layout.bind(minimum_height=self.layout.setter('height'))
+        self.add_widget(self.layout)
+        self.key_viewclass = 'viewclass'
+
+        self.messages = []
+        self._next_id = 0
+        # Index in self.messages of the first message in self.data
+        self._first_shown = 0
+        self._loading = False
+        self._paging = False
+        self._heights = {}
+        self._scroll_anim = None
+        self._keep_event = None
+        self.bind(width=self._on_width, scroll_y=self._on_scroll)
+
+    def clear(self):
+        self.messages = []
+        self._first_shown = 0
+        self._loading = False
+        # Ids keep counting up, so cached heights would never be hit again
+        self._heights.clear()
+        if self._scroll_anim is not None:
+            self._scroll_anim.cancel(self)
+            self._scroll_anim = None
+        if self._keep_event is not None:
+            self._keep_event.cancel()
+            self._keep_event = None
+        self._paging = False
+        self.data = []
+
+    def append(self, sender, text, is_user):
+        """Add a message at the bottom and keep it in view."""
+        was_at_bottom = self.is_at_bottom()
+        message = {'id': self._next_id, 'sender': sender, 'text': text, 'is_user': is_user}
+        self._next_id += 1
+        self.messages.append(message)
+        self._drop_old_history()
+
+        data = [item for item in self.data if item['viewclass'] == 'ChatMessageRow']
+        data.append(self._item(message))
+        if was_at_bottom and len(data) > self.WINDOW:
+            # Off screen above; scrolling back up loads them again
+            self._first_shown += len(data) - self.WINDOW
+            data = data[-self.WINDOW:]
+        self.data = data + self._loading_rows()
+        if is_user or was_at_bottom:
+            self.scroll_to_bottom()
+
+    def show_loading(self, loading):
+        if loading == self._loading:
+            return
+        was_at_bottom = self.is_at_bottom()
+        self._loading = loading
+        self.data = [item for item in self.data if item['viewclass'] == 'ChatMessageRow'] + self._loading_rows()
+        if loading and was_at_bottom:
+            self.scroll_to_bottom()
+
+    def is_at_bottom(self):
+        return self.scroll_y <= 0.01 or self.layout.height <= self.height
+
+    def scroll_to_bottom(self, animate=True):
+        # The layout takes the new data into account before the next frame
+        Clock.schedule_once(lambda dt: self._scroll_to(0, animate), 0)
+
+    def _scroll_to(self, scroll_y, animate):
+        if self._scroll_anim is not None:
+            self._scroll_anim.cancel(self)
+            self._scroll_anim = None
+        if animate and self.layout.height > self.height:
+            self._scroll_anim = Animation(scroll_y=scroll_y, d=0.2, t='out_quad')
+            self._scroll_anim.start(self)
+        else:
+            self.scroll_y = scroll_y
+
+    def _loading_rows(self):
+        if not self._loading:
+            return []
+        return [{'viewclass': 'ChatLoadingRow', 'view_size': (None, LOADING_HEIGHT)}]
+
+    def _drop_old_history(self):
+        overflow = len(self.messages) - self.HISTORY_LIMIT
+        if overflow <= 0:
+            return
+        dropped = {message['id'] for message in self.messages[:overflow]}
+        del self.messages[:overflow]
+        self._first_shown = max(0, self._first_shown - overflow)
+        for heights in self._heights.values():
+            for message_id in dropped:
+                heights.pop(message_id, None)
+        if any(item.get('message_id') in dropped for item in self.data):
+            self.data = [item for item in self.data if item.get('message_id') not in dropped]
+
+    def _on_scroll(self, instance, scroll_y):
+        if scroll_y >= 0.999 and self._first_shown > 0 and not self._paging:
+            self._load_older()
+
+    def _load_older(self):
+        start = max(0, self._first_shown - self.PAGE_SIZE)
+        older = [self._item(message) for message in self.messages[start:self._first_shown]]
+        added = sum(item['view_size'][1] + ROW_SPACING for item in older)
+        self._first_shown = start
+        self._paging = True
+        self.data = older + self.data
+        self._keep_event = Clock.schedule_once(lambda dt: self._keep_position(added), 0)
+
+    def _keep_position(self, added):
+        self._keep_event = None
+        # Keep the message that was at the top where it was
+        scrollable = self.layout.height - self.height
+        if scrollable > 0:
+            self.scroll_y = max(0.0, 1 - added / scrollable)
+        self._paging = False
+
+    def _on_width(self, instance, width):
+        if self.messages:
+            rows = [self._item(message) for message in self.messages[self._first_shown:]]
+            self.data = rows + self._loading_rows()
+
+    def _item(self, message):
+        return {
+            'viewclass': 'ChatMessageRow',
+            'message_id': message['id'],
+            'sender': message['sender'],
+            'text': message['text'],
+            'is_user': message['is_user'],
+            'view_size': (None, self._height(message)),
+        }
+
+    def _height(self, message):
+        width = int(self.width)
+        heights = self._heights.get(width)
+        if heights is None:
+            # Current and previous width (portrait and landscape)
+            if len(self._heights) >= 2:
+                self._heights.pop(next(iter(self._heights)))
+            heights = self._heights[width] = {}
+        if message['id'] not in heights:
+            heights[message['id']] = self._measure(message['text'], width)
+        return heights[message['id']]
+
+    @staticmethod
+    def _measure(text, width):
+        bubble_width = (width - 2 * LIST_PADDING_X - ROW_SPACING) * BUBBLE_WIDTH
+        text_width = max(bubble_width - 2 * BUBBLE_PADDING, dp(20))
+        font_name, font_size = "Roboto", 16
+        app = MDApp.get_running_app()
+        if app is not None:
+            font_name, font_size = app.theme_cls.font_styles["Body1"][:2]
+        label = MarkupLabel(text=text, font_name=font_name, font_size=sp(font_size), text_size=(text_width, None))
+        label.refresh()
+        text_height = label.texture.height if label.texture else sp(font_size)
+        return 2 * BUBBLE_PADDING + SENDER_HEIGHT + BUBBLE_SPACING + text_height
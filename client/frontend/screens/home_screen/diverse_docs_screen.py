@@ -6,7 +6,7 @@ from kivy.uix.button import Button
 from kivy.uix.scrollview import ScrollView
 from kivy.graphics import Color, RoundedRectangle
 from kivy.metrics import dp, sp
-from frontend.screens.popup_screens.pop_card import CardPopup
+from frontend.screens.widgets.async_loading import AsyncLoadMixin, loading_label
 
 class Card(BoxLayout):
     def __init__(self, height=dp(80), radius=dp(22), bg_color=(0.18, 0.20, 0.25, 1), **kwargs):
@@ -34,7 +34,7 @@ def match_name(name)->str:
         return name
 
 
-class DiverseDocsScreen(Screen):
+class DiverseDocsScreen(AsyncLoadMixin, Screen):
     def __init__(self, server=None, **kwargs):
         super().__init__(name='diverse_docs', **kwargs)
         self.server = server
@@ -77,12 +77,16 @@ class DiverseDocsScreen(Screen):
         self.add_widget(self.main_box)
 
     def on_pre_enter(self, *args):
-        data = self.server.get_specific_data("GetWalletCards")
+        # Keep the last list on screen while it is refreshed; show a placeholder the first time
+        if not self.doc_container.children:
+            self.doc_container.add_widget(loading_label())
+        self.load_wallet_list("GetWalletCards", self._on_docs_loaded)
+        return super().on_pre_enter(*args)
+
+    def _on_docs_loaded(self, data):
         if data is not None:
-            self.clear_docs()
             print(data['data']['cards'])
             self.add_docs(data['data']['cards'])
-            return super().on_pre_enter(*args)
         else:
             self.add_docs({})
 
@@ -108,6 +112,7 @@ class DiverseDocsScreen(Screen):
             btn.bind(size=lambda instance, value: setattr(instance, "text_size", value))
             # Print the name when button is pressed
             def go_card(name):
+                from frontend.screens.popup_screens.pop_card import CardPopup
                 popup = CardPopup(self.server, name, match_name(name))
                 popup.show_popup()
             btn.bind(on_press=lambda instance, name=title: go_card(name))
@@ -29,6 +29,7 @@ except ImportError:
 # Your existing imports
 from frontend.screens.widgets.custom_alignment import Alignment
 from frontend.screens.widgets.custom_cards import CategoryCard, NewsCard
+from frontend.screens.widgets.responsive import responsive_layout
 
 # Keep all your existing constants
 ASSETS_DIR = Path(__file__).parent.parent / "assets"
@@ -323,6 +324,7 @@ class HomeScreen(MDScreen, Alignment):
         self.server = server
         self.sm = sm if hasattr(sm, "has_screen") else None
         self._back_binding = False
+        self._news_request = None
         self.news_carousel = None
         self.dot_container = None
         self._news_cards = []
@@ -335,7 +337,6 @@ class HomeScreen(MDScreen, Alignment):
             Color(0.13, 0.14, 0.16, 1)
             self.bg_rect = Rectangle(size=Window.size, pos=(0, 0))
         self.bind(size=self._update_bg, pos=self._update_bg)
-        Window.bind(size=self._update_window_bg)
 
         # Create main layout with drawer
         self._build_screen_with_drawer()
@@ -344,10 +345,18 @@ class HomeScreen(MDScreen, Alignment):
         if self.news_carousel:
             self.news_carousel.bind(index=self._refresh_dots)
 
-        Window.bind(size=self._update_news_card_widths)
+        responsive_layout().register(self, self._on_window_resize)
         self._populate_news([])
         self._update_news_card_widths()
 
+        self._failed_writes_dialog = None
+        if self.server:
+            self.server.monitor.bind(state=self._on_connection_state)
+            queue = self.server.write_queue()
+            if queue is not None:
+                queue.bind(failed=self._on_failed_writes)
+                self._on_failed_writes(queue, queue.failed)
+
     def _build_screen_with_drawer(self):
         """Build screen with drawer functionality"""
         # Main relative layout
@@ -466,6 +475,33 @@ class HomeScreen(MDScreen, Alignment):
         
         title_container.add_widget(title_box)
         header.add_widget(title_container)
+
+        # Shown while the server cannot be reached (saved data stays on screen)
+        self.offline_icon = MDIconButton(
+            icon="cloud-off-outline",
+            theme_icon_color="Custom",
+            icon_color=TEXT_PRIMARY,
+            opacity=0,
+            disabled=True,
+            size_hint=(None, None),
+            size=(dp(40), dp(40)),
+            pos_hint={"center_y": 0.5},
+        )
+        header.add_widget(self.offline_icon)
+
+        # Shown while the server has rejected saved documents
+        self.failed_writes_icon = MDIconButton(
+            icon="cloud-alert",
+            theme_icon_color="Custom",
+            icon_color=ACCENT_YELLOW,
+            opacity=0,
+            disabled=True,
+            size_hint=(None, None),
+            size=(dp(40), dp(40)),
+            pos_hint={"center_y": 0.5},
+            on_release=lambda *_: self._show_failed_writes(),
+        )
+        header.add_widget(self.failed_writes_icon)
         
         return header
 
@@ -591,6 +627,10 @@ class HomeScreen(MDScreen, Alignment):
             self.bg_rect.size = size
             self.bg_rect.pos = (0, 0)
 
+    def _on_window_resize(self):
+        self._update_window_bg(Window, Window.size)
+        self._update_news_card_widths()
+
     @staticmethod
     def _sync_text_width(label, value):
         label.text_size = (value, None)
@@ -669,6 +709,9 @@ class HomeScreen(MDScreen, Alignment):
         if self._back_binding:
             Window.unbind(on_keyboard=self._handle_back_gesture)
             self._back_binding = False
+        if self._news_request is not None:
+            self._news_request.cancel()
+            self._news_request = None
 
     def _handle_back_gesture(self, window, key, scancode, codepoint, modifiers):
         # If drawer is open, close it first
@@ -714,18 +757,57 @@ class HomeScreen(MDScreen, Alignment):
     def _fetch_news(self):
         if not self.server:
             return
-        try:
-            data = self.server.get_specific_data("News")
-        except Exception as exc:
-            Logger.warning(f"HomeScreen: failed to fetch news ({exc})")
+        if self._news_request is not None and not self._news_request.done:
             return
+        # Runs on the I/O pool; the carousel keeps its current cards meanwhile
+        self._news_request = self.server.get_specific_data_async("News", self._on_news_loaded)
 
+    def _on_news_loaded(self, data):
+        self._news_request = None
         if not data or not data.get("success"):
             return
 
         news_items = data.get("data", {}).get("news") or []
         self._populate_news(news_items)
 
+    def _on_connection_state(self, monitor, state):
+        offline = state == "offline"
+        self.offline_icon.opacity = 1 if offline else 0
+        # Back online: refresh what was fetched (or failed) while offline
+        if state == "online" and self.manager and self.manager.current == self.name:
+            self._fetch_news()
+
+    def _on_failed_writes(self, queue, failed):
+        self.failed_writes_icon.opacity = 1 if failed else 0
+        self.failed_writes_icon.disabled = not failed
+
+    def _show_failed_writes(self):
+        # Loaded on first use, not when the home screen is imported
+        from kivymd.uix.dialog import MDDialog
+
+        queue = self.server.write_queue() if self.server else None
+        failed = queue.failed_writes() if queue else []
+        if not failed:
+            return
+        lines = [f"• {entry['message_type']}: {entry['failed']}" for entry in failed]
+
+        def close_then(action):
+            def run(*_):
+                self._failed_writes_dialog.dismiss()
+                self._failed_writes_dialog = None
+                action()
+            return run
+
+        self._failed_writes_dialog = MDDialog(
+            title="Documente respinse de server",
+            text="\n".join(lines),
+            buttons=[
+                MDFlatButton(text="Renunță", on_release=close_then(queue.discard_failed)),
+                MDFlatButton(text="Reîncearcă", on_release=close_then(queue.retry_failed)),
+            ],
+        )
+        self._failed_writes_dialog.open()
+
     def set_server(self, server):
         self.server = server
 
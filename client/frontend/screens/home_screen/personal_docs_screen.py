@@ -6,8 +6,7 @@ from kivy.uix.button import Button
 from kivy.uix.scrollview import ScrollView
 from kivy.graphics import Color, RoundedRectangle
 from kivy.metrics import dp, sp
-from frontend.screens.popup_screens.pop_card import CardPopup
-from frontend.screens.popup_screens.qr_popup import QrPopup 
+from frontend.screens.widgets.async_loading import AsyncLoadMixin, loading_label
 from kivymd.uix.button import MDIconButton
 from kivymd.uix.card import MDCard
 class Card(BoxLayout):
@@ -41,7 +40,7 @@ def match_entrypoint(name)->str:
         return name
 
 
-class PersonalDocsScreen(Screen):
+class PersonalDocsScreen(AsyncLoadMixin, Screen):
     def __init__(self, server=None, **kwargs):
         super().__init__(name='personal_docs', **kwargs)
         self.server = server
@@ -84,12 +83,16 @@ class PersonalDocsScreen(Screen):
         self.add_widget(self.main_box)
 
     def on_pre_enter(self, *args):
-        data = self.server.get_specific_data("GetWalletCards")
+        # Keep the last list on screen while it is refreshed; show a placeholder the first time
+        if not self.doc_container.children:
+            self.doc_container.add_widget(loading_label())
+        self.load_wallet_list("GetWalletCards", self._on_docs_loaded)
+        return super().on_pre_enter(*args)
+
+    def _on_docs_loaded(self, data):
         if data is not None:
-            self.clear_docs()
             print(data['data']['cards'])
             self.add_docs(data['data']['cards'])
-            return super().on_pre_enter(*args)
         else:
             self.add_docs({})
 
@@ -119,6 +122,7 @@ class PersonalDocsScreen(Screen):
             main_btn.bind(size=lambda instance, value: setattr(instance, "text_size", value))
             
             def go_card(name):
+                from frontend.screens.popup_screens.pop_card import CardPopup
                 popup = CardPopup(match_entrypoint(doc_name),self.server, name)
                 popup.show_popup()
             main_btn.bind(on_press=lambda instance, name=title: go_card(name))
@@ -134,6 +138,7 @@ class PersonalDocsScreen(Screen):
             )
                         
             def show_qr(name):
+                from frontend.screens.popup_screens.qr_popup import QrPopup
                 popup = QrPopup(match_entrypoint(doc_name),self.server, name) 
                 popup.show_popup()
             qr_btn.bind(on_press=lambda instance, name=title: show_qr(name))
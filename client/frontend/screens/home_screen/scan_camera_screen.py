@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from pathlib import Path
 from typing import Optional
+import threading
 import time
 import os
 
@@ -22,6 +23,7 @@ from kivymd.uix.screen import MDScreen
 from kivy_garden.xcamera.xcamera import XCamera
 
 from frontend.screens.widgets.custom_alignment import Alignment
+from frontend.screens.save_screens.image_prep import can_prepare_frames, prepare_frame
 
 try:
     if platform == "android":
@@ -48,6 +50,14 @@ except ImportError:
 class CameraScanScreen(MDScreen, Alignment):
     """Camera screen that saves photos in an accessible folder using Kivy Camera."""
 
+    # Grab the preview frame and hand it to the upload as JPEG bytes instead
+    # of having XCamera write a full size photo and reading it back
+    CAPTURE_TO_MEMORY = True
+    # Also keep a copy in Pictures/SmartID (written in the background)
+    PERSIST_CAPTURES = False
+    # Smaller preview frames are not enough for OCR; shoot a photo instead
+    MIN_FRAME_LONG_EDGE = 1000
+
     def __init__(self, server=None, **kwargs):
         super().__init__(name="camera_scan", **kwargs)
         self.server = server
@@ -269,15 +279,7 @@ class CameraScanScreen(MDScreen, Alignment):
             "directory": str(self._capture_dir),
         }
         camera = XCamera(**camera_kwargs)
-       
-        def _on_capture(instance, filename):
-            import os, shutil
-            new_name = os.path.join(self._capture_dir, "document.jpg")
-            shutil.move(filename, new_name)
-            print(f"Saved capture as: {new_name}")
-            
-        camera.bind(on_capture=_on_capture)
-        
+
         if platform == "android":
             index = self._select_primary_camera_index()
             Logger.info(f"CameraScanScreen: Selected camera index: {index}")
@@ -345,7 +347,7 @@ class CameraScanScreen(MDScreen, Alignment):
             if platform == "android" and MediaScannerConnection:
                 try:
                     ctx = PythonActivity.mActivity
-                    MediaScannerConnection.scanFile(ctx, [filepath], None, None)
+                    MediaScannerConnection.scanFile(ctx, [str(final_path)], None, None)
                 except Exception as e:
                     Logger.warning(f"CameraScanScreen: Failed to notify media scanner: {e}")
             
@@ -489,23 +491,23 @@ class CameraScanScreen(MDScreen, Alignment):
         # Navigate to save_data screen with the captured image for OCR processing
         self._navigate_to_save_screen(str(filepath))
 
-    def _navigate_to_save_screen(self, image_path: str) -> None:
-        """Navigate to save_data screen with the captured image for OCR processing."""
-        print(f"🔄 [NEW CODE] _navigate_to_save_screen called with: {image_path}", flush=True)
-        Logger.info(f"CameraScanScreen: Navigating to save_data screen with image: {image_path}")
+    def _navigate_to_save_screen(self, image_path: Optional[str] = None, prepared=None) -> None:
+        """Navigate to save_data screen with the captured image (file or in-memory) for OCR processing."""
+        Logger.info(f"CameraScanScreen: Navigating to save_data screen with image: {image_path or 'in-memory frame'}")
         
         manager = getattr(self, "manager", None)
         if not manager:
             Logger.error("CameraScanScreen: No screen manager available")
-            print("❌ [NEW CODE] No screen manager available!", flush=True)
             return
             
         # Navigate to save_data screen and set image path for OCR processing
-        print(f"🔍 [NEW CODE] Navigating to save_data screen...", flush=True)
         if manager.has_screen("save_data"):
             try:
                 save_screen = manager.get_screen("save_data")
-                save_screen.set_image_path(image_path)
+                if prepared is not None:
+                    save_screen.set_prepared_image(prepared)
+                else:
+                    save_screen.set_image_path(image_path)
                 
                 # Set transition direction
                 if hasattr(manager, "transition"):
@@ -513,23 +515,20 @@ class CameraScanScreen(MDScreen, Alignment):
                 
                 manager.current = "save_data"
                 Logger.info(f"CameraScanScreen: Navigated to save_data screen with image: {image_path}")
-                print(f"✅ [NEW CODE] Successfully navigated to save_data screen", flush=True)
                 
             except Exception as e:
                 Logger.error(f"CameraScanScreen: Failed to navigate to save_data screen: {e}")
-                print(f"❌ [NEW CODE] Navigation failed: {e}", flush=True)
                 # Fallback: go back and cleanup
                 self._cleanup_and_go_back(image_path)
         else:
             Logger.error("CameraScanScreen: save_data screen not found")
-            print("❌ [NEW CODE] save_data screen not found!", flush=True)
             self._cleanup_and_go_back(image_path)
 
-    def _cleanup_and_go_back(self, image_path: str) -> None:
+    def _cleanup_and_go_back(self, image_path: Optional[str]) -> None:
         """Cleanup image and navigate back as fallback."""
         try:
-            filepath = Path(image_path)
-            if filepath.exists():
+            filepath = Path(image_path) if image_path else None
+            if filepath and filepath.exists():
                 filepath.unlink()
                 Logger.info(f"CameraScanScreen: Cleaned up image: {image_path}")
         except Exception as e:
@@ -655,6 +654,9 @@ class CameraScanScreen(MDScreen, Alignment):
         if self.capture_button:
             self.capture_button.disabled = True # Dezactivăm imediat butonul
 
+        if self.CAPTURE_TO_MEMORY and self._capture_frame():
+            return
+
         try:
             # XCamera will call on_picture_taken callback when done
             self.camera_view.shoot() 
@@ -667,7 +669,68 @@ class CameraScanScreen(MDScreen, Alignment):
             self._show_camera_error(f"Eroare la capturarea fotografiei: {str(exc)}")
             return
     
-    # _on_photo_saved removed - using XCamera's on_picture_taken callback instead
+    def _capture_frame(self) -> bool:
+        """
+        Grab the current preview frame and encode it on a worker thread.
+
+        Returns False (so the caller shoots a photo to disk instead) when the
+        frame cannot be read or is too small for OCR.
+        """
+        texture = getattr(self.camera_view, "texture", None)
+        if texture is None or not can_prepare_frames():
+            return False
+        size = tuple(texture.size)
+        if max(size) < self.MIN_FRAME_LONG_EDGE:
+            Logger.info(f"CameraScanScreen: preview frame {size} too small, shooting a photo")
+            return False
+        try:
+            # Reading the texture needs the GL context, so it stays on the main thread
+            pixels = texture.pixels
+        except Exception as exc:
+            Logger.warning(f"CameraScanScreen: could not read preview frame: {exc}")
+            return False
+
+        # The preview is shown rotated 90 degrees clockwise on Android
+        rotate = 90 if platform == "android" else 0
+        threading.Thread(target=self._encode_frame, args=(pixels, size, rotate), daemon=True).start()
+        return True
+
+    def _encode_frame(self, pixels, size, rotate) -> None:
+        try:
+            prepared = prepare_frame(pixels, size, rotate)
+        except Exception as exc:
+            Logger.error(f"CameraScanScreen: Failed to encode frame: {exc}")
+            err_msg = f"Eroare la capturarea fotografiei: {exc}"
+            Clock.schedule_once(lambda dt: self._on_frame_failed(err_msg), 0)
+            return
+        Logger.info(f"CameraScanScreen: Frame captured in memory, {prepared.summary()}")
+        if self.PERSIST_CAPTURES:
+            self._persist_capture(prepared.data)
+        Clock.schedule_once(lambda dt: self._on_frame_encoded(prepared), 0)
+
+    def _on_frame_encoded(self, prepared) -> None:
+        self._capture_in_progress = False
+        if self.capture_button:
+            self.capture_button.disabled = False
+        self._navigate_to_save_screen(prepared=prepared)
+
+    def _on_frame_failed(self, message: str) -> None:
+        self._capture_in_progress = False
+        if self.capture_button:
+            self.capture_button.disabled = False
+        self._show_camera_error(message)
+
+    def _persist_capture(self, data: bytes) -> None:
+        """Write the capture to the public folder; runs off the main thread."""
+        try:
+            target = (self._capture_dir or self._build_capture_dir()) / "document.jpg"
+            tmp = target.with_suffix(".tmp")
+            tmp.write_bytes(data)
+            tmp.replace(target)
+            if platform == "android" and MediaScannerConnection:
+                MediaScannerConnection.scanFile(PythonActivity.mActivity, [str(target)], None, None)
+        except Exception as e:
+            Logger.warning(f"CameraScanScreen: Failed to persist capture: {e}")
 
     def _go_back(self) -> None:
         manager = getattr(self, "manager", None)
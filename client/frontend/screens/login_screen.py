@@ -14,6 +14,7 @@ from frontend.screens.widgets.custom_buttons import CustomButton
 from frontend.screens.widgets.custom_input import CustomInput
 from frontend.screens.widgets.custom_label import CustomLabels,LinkLabel 
 from frontend.screens.widgets.custom_alignment import Alignment
+from frontend.screens.widgets.responsive import responsive_layout
 
 
 BG_TOP      = (0.06, 0.07, 0.10, 1)
@@ -152,7 +153,7 @@ class LoginScreen(Screen,CustomLabels,CustomButton,CustomInput,Alignment):
             outer.padding = [0, 0, 0, int(Window.height * 0.01)]
 
         update_layout()
-        Window.bind(size=lambda *_: update_layout())
+        responsive_layout().register(self, update_layout)
         self._set_error = set_error
 
 
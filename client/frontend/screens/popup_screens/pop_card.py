@@ -7,6 +7,7 @@ from kivymd.uix.dialog import MDDialog
 from kivy.uix.scrollview import ScrollView
 from kivy.graphics import Color, RoundedRectangle
 from kivy.metrics import dp, sp
+from frontend.screens.widgets.async_loading import loading_label
 
 def match_name(name)->str:
     if name=='identity_card':
@@ -22,6 +23,8 @@ class CardPopup:
         self.card_name = card_name
         self.dialog = None
         self.ep=entry_point
+        self.doc_container = None
+        self._request = None
         
     def show_popup(self):
         content = BoxLayout(orientation="vertical", spacing=dp(12), size_hint_y=None, height=dp(500))
@@ -30,9 +33,38 @@ class CardPopup:
         scroll = ScrollView(size_hint=(1, 0.9))
         doc_container = BoxLayout(orientation='vertical', size_hint_y=None, spacing=dp(8))
         doc_container.bind(minimum_height=doc_container.setter('height'))
-        # Get data and populate
-        data = self.server.get_specific_data(self.ep)
-       
+        # The dialog opens right away; the data fills in when it arrives
+        doc_container.add_widget(loading_label())
+        self.doc_container = doc_container
+        
+        scroll.add_widget(doc_container)
+        content.add_widget(scroll)
+        
+        # Add close button
+        close_btn = Button(
+            text="Închide",
+            size_hint_y=None,
+            height=dp(40),
+            background_color=(0.25, 0.60, 1.00, 1),
+            color=(1, 1, 1, 1)
+        )
+        close_btn.bind(on_press=lambda x: self.close_popup())
+        content.add_widget(close_btn)
+        
+        self.dialog = MDDialog(
+            title=f"[color=#2696FF][b]{match_name(self.card_name)}[/b][/color]",
+            type="custom",
+            content_cls=content,
+            size_hint=(0.95, 0.9),
+        )
+        self.dialog.bind(on_dismiss=self._cancel_request)
+        self.dialog.open()
+        self._request = self.server.get_specific_data_async(self.ep, self._on_data_loaded)
+    
+    def _on_data_loaded(self, data):
+        self._request = None
+        doc_container = self.doc_container
+        doc_container.clear_widgets()
         #print(f"Popup data: {data}")  # Debug print
         if data and 'data' in data:
             import json
@@ -66,28 +98,11 @@ class CardPopup:
                 ))
         else:
             doc_container.add_widget(Label(text="No data available", font_size=sp(16)))
-        
-        scroll.add_widget(doc_container)
-        content.add_widget(scroll)
-        
-        # Add close button
-        close_btn = Button(
-            text="Închide",
-            size_hint_y=None,
-            height=dp(40),
-            background_color=(0.25, 0.60, 1.00, 1),
-            color=(1, 1, 1, 1)
-        )
-        close_btn.bind(on_press=lambda x: self.close_popup())
-        content.add_widget(close_btn)
-        
-        self.dialog = MDDialog(
-            title=f"[color=#2696FF][b]{match_name(self.card_name)}[/b][/color]",
-            type="custom",
-            content_cls=content,
-            size_hint=(0.95, 0.9),
-        )
-        self.dialog.open()
+    
+    def _cancel_request(self, *args):
+        if self._request is not None:
+            self._request.cancel()
+            self._request = None
     
     def close_popup(self, *args):
         if self.dialog:
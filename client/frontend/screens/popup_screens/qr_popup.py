@@ -1,3 +1,8 @@
+import hashlib
+import time
+from pathlib import Path
+
+from kivy.app import App
 from kivy.uix.screenmanager import Screen
 from kivy.uix.label import Label
 from kivy.uix.boxlayout import BoxLayout
@@ -10,6 +15,9 @@ from kivy.metrics import dp, sp
 
 
 from frontend.screens.widgets.qr_code import QRCodeWidget
+from frontend.screens.widgets.async_loading import loading_label
+from server_requests.qr_signing import device_qr_signer
+from wallet_codec.codec import encode_document, key_fingerprint, pack_fields
 
 def match_name(name)->str:
     if name=='identity_card':
@@ -19,24 +27,75 @@ def match_name(name)->str:
     else :
         return name
 
+
+# A payload is shown again, unchanged, for this long: the QR texture cache
+# (keyed by payload text) then hits instead of drawing a new code for
+# every new issued_at. Well inside the age verifiers accept.
+QR_REUSE_SECONDS = 300
+
+# (card name, document digest) -> (issued at, payload)
+_payloads = {}
+
+
+def qr_signer():
+    """
+    Ed25519 key of this install; verifiers check the codes with its public
+    half (shown under Account info). None without cryptography: the codes
+    are then unsigned and verifiers reject them unless told otherwise.
+    """
+    return device_qr_signer(Path(App.get_running_app().user_data_dir))
+
+
+def signature_note() -> str:
+    signer = qr_signer()
+    if signer is None:
+        return "Cod nesemnat: nu poate fi verificat de altcineva"
+    return f"Semnat cu cheia {key_fingerprint(signer.public_key_bytes())}"
+
+
+def qr_payload(card_name, data) -> str:
+    """Compact payload (wallet_codec) for the card, signed when possible, or "Error" without data."""
+    if data is None:
+        return "Error"
+    if not isinstance(data.get('data'), dict):
+        return str(data.get('data'))
+    fields = data['data']
+    now = time.time()
+    for key, (issued_at, _) in list(_payloads.items()):
+        if now - issued_at >= QR_REUSE_SECONDS:
+            del _payloads[key]
+    key = (card_name, hashlib.sha256(pack_fields(fields)).digest())
+    if key not in _payloads:
+        _payloads[key] = (now, encode_document(card_name, fields, qr_signer(), issued_at=int(now)))
+    return _payloads[key][1]
+
 class QrPopup:
     def __init__(self, entry_point,server, card_name):
         self.server = server
         self.ep=entry_point
         self.card_name = card_name
         self.dialog = None
+        self.content = None
+        self.placeholder = None
+        self._request = None
+        self._qr_widget = None
+        self._open = False
         
     def show_popup(self):
         content = BoxLayout(orientation="vertical", spacing=dp(12), size_hint_y=None, height=dp(500))
         
-        data = self.server.get_specific_data(self.ep)
-        if data != None:
-            qr_widget = QRCodeWidget(str(data['data']))
-            qr_widget.size_hint = (1, 0.4)
-        else :
-            qr_widget = QRCodeWidget("Error")
-            qr_widget.size_hint = (1, 0.4)
-        content.add_widget(qr_widget)
+        # Placeholder until the card data arrives and the QR code can be drawn
+        self.placeholder = loading_label()
+        self.placeholder.size_hint = (1, 0.4)
+        content.add_widget(self.placeholder)
+        content.add_widget(Label(
+            text=signature_note(),
+            font_size=sp(12),
+            color=(0.4, 0.4, 0.4, 1),
+            size_hint_y=None,
+            height=dp(20),
+        ))
+        self.content = content
         close_btn = Button(
             text="Închide",
             size_hint_y=None,
@@ -53,7 +112,41 @@ class QrPopup:
             content_cls=content,
             size_hint=(0.95, 0.9),
         )
+        self.dialog.bind(on_dismiss=self._cancel_request)
         self.dialog.open()
+        self._open = True
+        self._request = self.server.get_specific_data_async(self.ep, self._on_data_loaded)
+    
+    def _on_data_loaded(self, data):
+        # Called again when revalidation brings changed data; the handle is
+        # kept so dismissing the dialog still cancels that second call
+        if not self._open:
+            return
+        if self._qr_widget is not None:
+            self._qr_widget.cancel()
+        # Encoded in the background; the placeholder stays until it is drawn
+        payload = qr_payload(self.card_name, data)
+        qr_widget = QRCodeWidget(payload, ready_callback=self._on_qr_ready, size_hint=(1, 0.4))
+        # Cached codes are ready (and swapped in) before the constructor returns
+        self._qr_widget = qr_widget if qr_widget.request is not None else None
+    
+    def _on_qr_ready(self, qr_widget):
+        self._qr_widget = None
+        if self.placeholder not in self.content.children:
+            return
+        index = self.content.children.index(self.placeholder)
+        self.content.remove_widget(self.placeholder)
+        self.content.add_widget(qr_widget, index=index)
+        self.placeholder = qr_widget
+    
+    def _cancel_request(self, *args):
+        self._open = False
+        if self._request is not None:
+            self._request.cancel()
+            self._request = None
+        if self._qr_widget is not None:
+            self._qr_widget.cancel()
+            self._qr_widget = None
     
     def close_popup(self, *args):
         if self.dialog:
@@ -15,6 +15,7 @@ from frontend.screens.widgets.custom_buttons import CustomButton
 from frontend.screens.widgets.custom_input import CustomInput
 from frontend.screens.widgets.custom_label import CustomLabels,LinkLabel 
 from frontend.screens.widgets.custom_alignment import Alignment
+from frontend.screens.widgets.responsive import responsive_layout
 
 BG_TOP      = (0.06, 0.07, 0.10, 1)
 BG_BOTTOM   = (0.03, 0.05, 0.09, 1)
@@ -171,7 +172,7 @@ class RegisterScreen(Screen,CustomButton,CustomInput,CustomLabels,Alignment):
             card.width = target_w
             outer.padding = [0, 0, 0, int(Window.height * 0.01)]
         update_layout()
-        Window.bind(size=lambda *_: update_layout())
+        responsive_layout().register(self, update_layout)
         self._set_error = set_error
         
     def go_prev(self, *_):
@@ -0,0 +1,138 @@
+import io
+from pathlib import Path
+
+from kivy.logger import Logger
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # not packaged on every build target
+    Image = ImageOps = None
+
+
+# The AI service reads the card at 1000 px along the photo's long edge and
+# about 325 px across the 46% wide card strip; a little headroom keeps its
+# own resize a downscale.
+MAX_LONG_EDGE = 1280
+JPEG_QUALITY = 82
+WEBP_QUALITY = 75
+
+
+class PreparedImage:
+    """Encoded upload plus the numbers needed to report what was saved."""
+
+    def __init__(self, data, mime_type, size, original_bytes):
+        self.data = data
+        self.mime_type = mime_type
+        self.size = size
+        self.original_bytes = original_bytes
+
+    @property
+    def bytes_saved(self):
+        return max(self.original_bytes - len(self.data), 0)
+
+    def summary(self):
+        before = self.original_bytes / 1024
+        after = len(self.data) / 1024
+        percent = 100 * self.bytes_saved / self.original_bytes if self.original_bytes else 0
+        return f"{before:.0f} KB -> {after:.0f} KB ({percent:.0f}% saved, {self.size[0]}x{self.size[1]})"
+
+
+def _crop(img, box):
+    """Crop to box = (left, top, right, bottom) given as fractions of the image."""
+    width, height = img.size
+    left, top, right, bottom = box
+    return img.crop((int(left * width), int(top * height), int(right * width), int(bottom * height)))
+
+
+def _encode(img, max_long_edge, image_format, grayscale, crop_box):
+    if crop_box:
+        img = _crop(img, crop_box)
+    img = img.convert("L" if grayscale else "RGB")
+    img.thumbnail((max_long_edge, max_long_edge), Image.LANCZOS)
+
+    out = io.BytesIO()
+    if image_format.upper() == "WEBP":
+        img.save(out, "WEBP", quality=WEBP_QUALITY, method=4)
+        mime_type = "image/webp"
+    else:
+        img.save(out, "JPEG", quality=JPEG_QUALITY, optimize=True)
+        mime_type = "image/jpeg"
+    return out.getvalue(), mime_type, img.size
+
+
+def prepare_for_ocr(source, max_long_edge=MAX_LONG_EDGE, image_format="JPEG",
+                    grayscale=True, crop_box=None):
+    """
+    Shrink a camera photo to what the OCR service actually reads.
+
+    The photo is rotated upright from its EXIF orientation (the tag is lost
+    on re-encoding), optionally cropped, downscaled so its long edge is at
+    most max_long_edge and re-encoded. The service binarizes the image
+    first, so grayscale drops colour the server would throw away anyway.
+
+    crop_box is (left, top, right, bottom) in fractions of the upright
+    photo. Leave it unset for ID cards: the service locates the card with a
+    crop region relative to the full camera frame.
+
+    Args:
+        source: Path to the photo or its encoded bytes
+        max_long_edge: Longest side of the uploaded image, in pixels
+        image_format: "JPEG" or "WEBP"
+        grayscale: Upload a single channel image
+        crop_box: Optional region to keep
+
+    Returns:
+        PreparedImage. Without Pillow, or if the photo cannot be decoded,
+        the original bytes are returned unchanged.
+    """
+    raw = source if isinstance(source, (bytes, bytearray)) else Path(source).read_bytes()
+    if Image is None:
+        Logger.warning("ImagePrep: Pillow not available, uploading the original photo")
+        return PreparedImage(bytes(raw), "image/jpeg", (0, 0), len(raw))
+
+    try:
+        with Image.open(io.BytesIO(raw)) as img:
+            # Decode at a reduced scale straight away when the JPEG allows it
+            img.draft("L" if grayscale else "RGB", (max_long_edge, max_long_edge))
+            img = ImageOps.exif_transpose(img)
+            data, mime_type, size = _encode(img, max_long_edge, image_format, grayscale, crop_box)
+    except (OSError, ValueError) as e:
+        Logger.warning(f"ImagePrep: could not prepare photo, uploading the original: {e}")
+        return PreparedImage(bytes(raw), "image/jpeg", (0, 0), len(raw))
+
+    prepared = PreparedImage(data, mime_type, size, len(raw))
+    if len(prepared.data) >= len(raw):
+        # Already small enough; re-encoding would only cost quality
+        return PreparedImage(bytes(raw), "image/jpeg", size, len(raw))
+    return prepared
+
+
+def can_prepare_frames():
+    """True when raw camera frames can be encoded in memory (needs Pillow)."""
+    return Image is not None
+
+
+def prepare_frame(pixels, size, rotate=0, max_long_edge=MAX_LONG_EDGE,
+                  image_format="JPEG", grayscale=True, crop_box=None):
+    """
+    Encode a raw camera frame for OCR without writing it to disk.
+
+    Args:
+        pixels: RGBA bytes as returned by Texture.pixels (bottom row first)
+        size: (width, height) of the frame
+        rotate: Clockwise rotation, in degrees, that makes the frame upright
+        max_long_edge, image_format, grayscale, crop_box: as for prepare_for_ocr
+
+    Returns:
+        PreparedImage; original_bytes is the size of the raw frame.
+
+    Raises:
+        RuntimeError: If Pillow is not available
+    """
+    if Image is None:
+        raise RuntimeError("Pillow is required to encode camera frames")
+    img = Image.frombytes("RGBA", tuple(size), bytes(pixels)).transpose(Image.FLIP_TOP_BOTTOM)
+    if rotate % 360:
+        img = img.rotate(-rotate, expand=True)
+    data, mime_type, out_size = _encode(img, max_long_edge, image_format, grayscale, crop_box)
+    return PreparedImage(data, mime_type, out_size, len(pixels))
@@ -28,7 +28,7 @@ from kivymd.uix.gridlayout import MDGridLayout
 from kivymd.uix.spinner import MDSpinner
 from kivymd.uix.menu import MDDropdownMenu
 
-from frontend.screens.popup_screens.pop_card import CardPopup
+from frontend.screens.save_screens.image_prep import prepare_for_ocr
 import base64
 import json
 
@@ -71,7 +71,10 @@ class SaveScreen(Screen):
         
         # OCR processing variables
         self.image_path: Optional[str] = None
+        # Capture already encoded in memory by the camera screen
+        self.prepared_image = None
         self.ocr_data: Optional[Dict[str, Any]] = None
+        self.validation: Dict[str, Dict[str, Any]] = {}
         self.processing = False
         self.mode = "document_list"
         
@@ -216,9 +219,17 @@ class SaveScreen(Screen):
     def set_image_path(self, path: str) -> None:
         """Set the path of the image to process and switch to OCR mode."""
         self.image_path = path
+        self.prepared_image = None
         self.mode = "ocr_processing"
         Logger.info(f"SaveScreen: Set image path and switching to OCR mode: {path}")
         print(f"🔄 [SaveScreen] Image path set to: {path}", flush=True)
+
+    def set_prepared_image(self, prepared) -> None:
+        """Use an image the camera screen encoded in memory (no file to read back)."""
+        self.prepared_image = prepared
+        self.image_path = None
+        self.mode = "ocr_processing"
+        Logger.info(f"SaveScreen: Set in-memory image and switching to OCR mode ({len(prepared.data)} bytes)")
     
     def show_loading(self, show: bool):
         """Toggle between loading and content view"""
@@ -236,19 +247,24 @@ class SaveScreen(Screen):
     def process_ocr(self):
         """Process OCR in background thread"""
         try:
-            # ✅ MODIFICAT: Folosește image_path setată de camera sau fallback
-            image_path_to_use = self.image_path if self.image_path else LOGO_PATH
-            
-            # Check if the file exists
-            if not Path(image_path_to_use).exists():
-                raise FileNotFoundError(f"Image file not found: {image_path_to_use}")
-            
-            Logger.info(f"SaveScreen: Processing OCR for image: {image_path_to_use}")
-            print(f"🔄 [SaveScreen] Processing OCR for: {image_path_to_use}", flush=True)
+            prepared = self.prepared_image
+            if prepared is None:
+                # ✅ MODIFICAT: Folosește image_path setată de camera sau fallback
+                image_path_to_use = self.image_path if self.image_path else LOGO_PATH
+                
+                # Check if the file exists
+                if not Path(image_path_to_use).exists():
+                    raise FileNotFoundError(f"Image file not found: {image_path_to_use}")
+                
+                Logger.info(f"SaveScreen: Processing OCR for image: {image_path_to_use}")
+                print(f"🔄 [SaveScreen] Processing OCR for: {image_path_to_use}", flush=True)
+                
+                # Downscale and recompress before the upload
+                prepared = prepare_for_ocr(image_path_to_use)
             
-            # Convert image to base64 and send to server
-            img = image_to_base64(test_image_path)
-            data = self.server.sent_OCR_image(img)
+            Logger.info(f"SaveScreen: OCR upload {prepared.summary()}")
+            # Chunked and resumable, so a flaky connection does not restart the upload
+            data = self.server.upload_OCR_image(prepared.data)
             print(f"📥 [SaveScreen] OCR Response: {data}", flush=True)
             
             # Schedule UI update on main thread
@@ -268,6 +284,9 @@ class SaveScreen(Screen):
     def on_ocr_complete(self, result_dict):
         """Called when OCR processing is complete"""
         self.show_loading(False)
+        # Per-field checks done by the AI service (CNP check digit, formats, dates)
+        self.validation = result_dict.pop('validation', {}) or {}
+        self.ocr_data = result_dict
         self.add_elements(result_dict)
     
     def on_ocr_error(self, error_msg):
@@ -404,6 +423,13 @@ class SaveScreen(Screen):
                 size_hint_x=0.7,
                 mode='rectangle'
             )
+            check = self.validation.get(key)
+            if check and not check.get('valid', True):
+                # Point the user at the fields OCR most likely misread
+                text_input.helper_text = check.get('reason') or 'Please check this value'
+                text_input.helper_text_mode = 'on_error'
+                text_input.error = True
+                text_input.bind(text=self._clear_field_error)
             self.input_fields[key] = text_input
             item_layout.add_widget(text_input)
             
@@ -412,6 +438,15 @@ class SaveScreen(Screen):
         
         Logger.info(f"SaveScreen: Added {len(data)} elements")
     
+    def _clear_field_error(self, text_input, _text):
+        """Drop the OCR validation error once the user edits the field."""
+        text_input.error = False
+        text_input.unbind(text=self._clear_field_error)
+    
+    def invalid_fields(self):
+        """Fields still flagged by OCR validation and not corrected by the user."""
+        return [key for key, field in self.input_fields.items() if field.error]
+    
     def display_data(self, *args):
         """Display all data from input fields"""
         collected_data = {}
@@ -463,23 +498,23 @@ class SaveScreen(Screen):
             collected_data = self.clean_data(collected_data)
             
             print(f"🧹 [SaveScreen] Cleaned data: {collected_data}", flush=True)
+            
+            unchecked = self.invalid_fields()
+            if unchecked:
+                Logger.warning(f"SaveScreen: Saving fields that failed OCR validation: {unchecked}")
 
             # ✅ MODIFICAT: Asigură-te că datele sunt trimise ca dict, NU ca string
             # Serverul așteaptă un dict, nu un JSON string
             entrypoint = self.get_entrypoint(self.selected_data_type)
             print(f"📡 [SaveScreen] Sending to entrypoint: {entrypoint}", flush=True)
             
-            # Trimite datele ca dict
-            response = self.server.sent_specific_data(entrypoint, collected_data)
-            
-            print(f"✅ [SaveScreen] Server response: {response}", flush=True)
-            
-            if response and response.get('success'):
-                Logger.info("SaveScreen: Data saved successfully")
-                print("✅ [SaveScreen] Data saved successfully!", flush=True)
+            # Stored encrypted on the device and sent in the background, so
+            # nothing is lost offline and saving twice sends only the latest
+            if self.server.queue_write(entrypoint, collected_data):
+                Logger.info("SaveScreen: Data queued for upload")
+                print("✅ [SaveScreen] Data queued for upload", flush=True)
             else:
-                Logger.error(f"SaveScreen: Failed to save data: {response}")
-                print(f"❌ [SaveScreen] Failed to save data: {response}", flush=True)
+                self.server.sent_specific_data_async(entrypoint, collected_data, self._on_save_response)
             
             # Navighează înapoi la home
             self.manager.current = 'home'
@@ -490,6 +525,12 @@ class SaveScreen(Screen):
             import traceback
             traceback.print_exc()
     
+    def _on_save_response(self, response):
+        if response and response.get('success'):
+            Logger.info("SaveScreen: Data saved successfully")
+        else:
+            Logger.error(f"SaveScreen: Failed to save data: {response}")
+    
     def on_leave(self, *args):
         """Called when leaving the screen"""
         # ✅ NU MAI ȘTERGE POZA! Comentează sau șterge linia care șterge imaginea
@@ -12,6 +12,7 @@ from frontend.screens.widgets.custom_background import GradientBackground
 from frontend.screens.widgets.custom_buttons import CustomButton
 from frontend.screens.widgets.custom_input import CustomInput
 from frontend.screens.widgets.custom_label import CustomLabels
+from frontend.screens.widgets.responsive import responsive_layout
 
 BG_BOTTOM = (0.03, 0.05, 0.09, 1)
 CARD_BG = (0.13, 0.15, 0.20, 1)
@@ -138,7 +139,7 @@ class ServerSetupScreen(Screen, CustomButton, CustomInput, CustomLabels, Alignme
             outer.padding = [0, 0, 0, int(Window.height * 0.01)]
 
         update_layout()
-        Window.bind(size=lambda *_: update_layout())
+        responsive_layout().register(self, update_layout)
 
         self._set_error = self._bind_error_label(self.err_address, self.err_address_row)
 
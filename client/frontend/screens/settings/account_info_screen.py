@@ -1,3 +1,6 @@
+from pathlib import Path
+
+from kivy.app import App
 from kivy.uix.screenmanager import Screen
 from kivy.uix.label import Label
 from kivy.uix.boxlayout import BoxLayout
@@ -11,6 +14,8 @@ from kivy.logger import Logger
 from kivymd.uix.label import MDLabel
 
 from frontend.screens.widgets.qr_code import QRCodeWidget
+from server_requests.qr_signing import device_qr_signer
+from wallet_codec.codec import key_fingerprint
 
 
 class UserInfoField(BoxLayout):
@@ -105,6 +110,7 @@ class AccountInfoScreen(Screen):
         super().__init__(name='account_info', **kwargs)
         self.server = server
         self._touch_in_input = False  # Track if touch is in input field
+        self._user_info_request = None
 
         # Default user data (will be replaced with server data when available)
         self.user_data = {
@@ -209,6 +215,10 @@ class AccountInfoScreen(Screen):
         button_container.add_widget(self.update_button)
         self.form_container.add_widget(button_container)
 
+        # Public half of the QR signing key, filled in on first enter
+        self.qr_key_box = BoxLayout(orientation='vertical', size_hint_y=None, height=dp(300), spacing=dp(8))
+        self.form_container.add_widget(self.qr_key_box)
+
         # Add some bottom spacing
         self.form_container.add_widget(Label(size_hint_y=None, height=dp(20)))
 
@@ -219,31 +229,74 @@ class AccountInfoScreen(Screen):
     def on_enter(self, *args):
         """Called every time the screen is entered. Load fresh data from server."""
         Logger.info("AccountInfoScreen: Entering screen, loading user data...")
+        if not self.qr_key_box.children:
+            self._show_qr_key()
         
+        if self.server:
+            # The form keeps its current values until the response arrives
+            self._cancel_user_info_request()
+            self._user_info_request = self.server.get_specific_data_async("UserInfo", self._on_user_info_loaded)
+        else:
+            Logger.warning("AccountInfoScreen: No server connection available")
+            self.user_data = {"nume": "", "email": "", "telefon": ""}
+            self.refresh_form_data()
+        
+        return super().on_enter(*args)
+    
+    def _show_qr_key(self):
+        """Enrollment QR for verifiers of shared codes, or a note that they are unsigned."""
+        signer = device_qr_signer(Path(App.get_running_app().user_data_dir))
+        if signer is None:
+            text = "Codurile QR partajate nu sunt semnate pe acest dispozitiv."
+        else:
+            text = ("Cheia de verificare a codurilor QR: "
+                    f"{key_fingerprint(signer.public_key_bytes())}")
+        note = Label(
+            text=text,
+            font_size=sp(14),
+            color=(0.7, 0.76, 0.86, 1),
+            size_hint_y=None,
+            height=dp(40),
+            halign="left",
+            valign="middle"
+        )
+        note.bind(size=lambda instance, value: setattr(instance, "text_size", value))
+        self.qr_key_box.add_widget(note)
+        if signer is None:
+            self.qr_key_box.height = dp(40)
+            return
+        self.qr_key_box.add_widget(QRCodeWidget(signer.public_key_text()))
+
+    def on_leave(self, *args):
+        self._cancel_user_info_request()
+        return super().on_leave(*args)
+    
+    def _cancel_user_info_request(self):
+        if self._user_info_request is not None:
+            self._user_info_request.cancel()
+            self._user_info_request = None
+    
+    def _on_user_info_loaded(self, data):
+        """Apply the UserInfo response (runs on the main thread)."""
+        self._user_info_request = None
         try:
-            # Load data from server
-            if self.server:
-                data = self.server.get_specific_data("UserInfo")
-                if data is not None and data.get('success') == True:
-                    user_info = data.get('data', {}).get('user', [])
-                    
-                    # Update user_data with server response
-                    # Assuming user_info is [email, nume, telefon] based on your original code
-                    if len(user_info) >= 3:
-                        self.user_data = {
-                            "email": user_info[0] if user_info[0] else "",
-                            "nume": user_info[1] if user_info[1] else "",
-                            "telefon": user_info[2] if user_info[2] else ""
-                        }
-                        Logger.info(f"AccountInfoScreen: Loaded user data: {self.user_data}")
-                    else:
-                        Logger.warning("AccountInfoScreen: Server response format unexpected")
-                        self.user_data = {"nume": "", "email": "", "telefon": ""}
+            if data is not None and data.get('success') == True:
+                user_info = data.get('data', {}).get('user', [])
+                
+                # Update user_data with server response
+                # Assuming user_info is [email, nume, telefon] based on your original code
+                if len(user_info) >= 3:
+                    self.user_data = {
+                        "email": user_info[0] if user_info[0] else "",
+                        "nume": user_info[1] if user_info[1] else "",
+                        "telefon": user_info[2] if user_info[2] else ""
+                    }
+                    Logger.info(f"AccountInfoScreen: Loaded user data: {self.user_data}")
                 else:
-                    Logger.warning("AccountInfoScreen: Failed to load user data from server")
+                    Logger.warning("AccountInfoScreen: Server response format unexpected")
                     self.user_data = {"nume": "", "email": "", "telefon": ""}
             else:
-                Logger.warning("AccountInfoScreen: No server connection available")
+                Logger.warning("AccountInfoScreen: Failed to load user data from server")
                 self.user_data = {"nume": "", "email": "", "telefon": ""}
                 
         except Exception as e:
@@ -252,8 +305,6 @@ class AccountInfoScreen(Screen):
         
         # Update form fields with loaded data
         self.refresh_form_data()
-        
-        return super().on_enter(*args)
     
     def refresh_form_data(self):
         """Refresh all form fields with current user data."""
@@ -50,10 +50,15 @@ class SplashScreen(Screen):
 
     def on_enter(self):
         self.set_status_message('Connecting to server', animate=True)
-        Clock.schedule_once(lambda dt: self.go_login(), 2)
+        # The monitor retries with backoff and reports through its properties
+        monitor = self.server.monitor
+        monitor.bind(state=self._on_connection_state, failures=self._on_connection_failures)
+        monitor.start()
+        monitor.reset()
 
     def on_leave(self):
         self.stop_status_animation()
+        self.server.monitor.unbind(state=self._on_connection_state, failures=self._on_connection_failures)
 
     def set_server(self, server):
         self.server = server
@@ -61,27 +66,28 @@ class SplashScreen(Screen):
     def go_next(self, *args):
         self.manager.current = 'login'
 
-    def go_login(self):
-        if self.server.connect() is not None:
+    def _on_connection_state(self, monitor, state):
+        if state == 'online' and self.manager and self.manager.current == self.name:
             self.stop_status_animation()
             self.status_label.text = 'Connected! Redirecting...'
             self.retry_attempts = 0
             Clock.schedule_once(lambda dt: self.go_next(), 0.5)
-        else:
-            self.retry_attempts += 1
-            if self.retry_attempts >= 3:
-                self.stop_status_animation()
-                self.status_label.text = 'Unable to connect. Updating settings...'
-                Clock.schedule_once(lambda dt: self.go_server_setup(), 1.2)
-                return
-            self.set_status_message('Unable to connect. Retrying', animate=True)
-            Clock.schedule_once(lambda dt: self.retry_connect(), 2)
-
-    def retry_connect(self, *args):
+
+    def _on_connection_failures(self, monitor, failures):
+        if not failures or self.retry_attempts >= 3:
+            return
+        self.retry_attempts = failures
         if self.retry_attempts >= 3:
+            self.stop_status_animation()
+            self.status_label.text = 'Unable to connect. Updating settings...'
+            Clock.schedule_once(lambda dt: self.go_server_setup(), 1.2)
             return
+        self.set_status_message('Unable to connect. Retrying', animate=True)
+
+    def go_login(self):
+        """Check the server again right away (the monitor reports the result)."""
         self.set_status_message('Reconnecting to server', animate=True)
-        Clock.schedule_once(lambda dt: self.go_login(), 0)
+        self.server.monitor.check_now()
 
     def set_status_message(self, text, animate=True):
         if animate:
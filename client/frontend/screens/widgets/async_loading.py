@@ -0,0 +1,100 @@
+from kivy.metrics import dp, sp
+from kivy.uix.label import Label
+
+from server_requests.request_executor import same_payload
+
+
+def loading_label(text="Se încarcă...", height=dp(60)):
+    """Placeholder shown while data is on its way from the server."""
+    label = Label(
+        text=text,
+        font_size=sp(16),
+        color=(0.7, 0.76, 0.86, 1),
+        size_hint_y=None,
+        height=height,
+        halign="center",
+        valign="middle",
+    )
+    label.bind(size=lambda instance, value: setattr(instance, "text_size", value))
+    return label
+
+
+class AsyncLoadMixin:
+    """
+    Screen mixin that loads server data without blocking the UI.
+
+    Requests go through ServerConnection's I/O pool; callbacks run on the main
+    thread and are dropped when the user leaves the screen before the
+    response arrives.
+    """
+
+    def load_async(self, message_type, callback):
+        """Fetch message_type in the background and call callback(data)."""
+        pending = getattr(self, "_pending_requests", None)
+        if pending is None:
+            pending = self._pending_requests = []
+        handle = None
+
+        def deliver(data):
+            if handle in pending:
+                pending.remove(handle)
+            callback(data)
+
+        handle = self.server.get_specific_data_async(message_type, deliver)
+        pending.append(handle)
+        return handle
+
+    def load_wallet_list(self, list_type, callback):
+        """
+        Load a card list and the details of its cards in one round trip.
+
+        The batch asks for list_type plus the detail messages of the cards
+        the cached list contains, so opening a card afterwards needs no
+        request. Cards not known yet are prefetched right after the list
+        arrives. The cached list is shown first (stale-while-revalidate).
+        """
+        server = self.server
+        cached = server.cached_data(list_type)
+        if cached is not None:
+            callback(cached)
+
+        pending = getattr(self, "_pending_requests", None)
+        if pending is None:
+            pending = self._pending_requests = []
+        handle = None
+
+        def deliver(results):
+            if handle in pending:
+                pending.remove(handle)
+            data = results.get(list_type) if results else None
+            if data is None:
+                if cached is None:
+                    callback(None)
+                return
+            if cached is None or not same_payload(data, cached):
+                callback(data)
+            missing = [mt for mt in server.card_detail_messages(data) if mt not in results]
+            if missing:
+                prefetch = None
+
+                def prefetched(_results):
+                    if prefetch in pending:
+                        pending.remove(prefetch)
+
+                prefetch = server.get_batch_data_async(missing, prefetched)
+                pending.append(prefetch)
+
+        message_types = [list_type] + server.card_detail_messages(cached)
+        handle = server.get_batch_data_async(message_types, deliver)
+        pending.append(handle)
+        return handle
+
+    def cancel_pending_requests(self):
+        pending = getattr(self, "_pending_requests", None) or []
+        for handle in pending:
+            handle.cancel()
+        pending.clear()
+
+    def on_leave(self, *args):
+        self.cancel_pending_requests()
+        return super().on_leave(*args)
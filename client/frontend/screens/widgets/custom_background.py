@@ -4,6 +4,11 @@ from kivy.uix.boxlayout import BoxLayout
 from kivy.graphics import  Rectangle
 from kivy.graphics.texture import Texture
 
+try:
+    import numpy
+except ImportError:  # not packaged on every build target
+    numpy = None
+
 BG_TOP      = (0.06, 0.07, 0.10, 1)
 BG_BOTTOM   = (0.03, 0.05, 0.09, 1)
 CARD_BG     = (0.13, 0.15, 0.20, 1)
@@ -20,6 +25,68 @@ INPUT_BG     = (0.18, 0.20, 0.25, 1)
 INPUT_TEXT   = TEXT_PRIMARY
 INPUT_HINT   = (0.60, 0.66, 0.76, 1)
 
+# Procedural textures --------------------------------------------------------
+#
+# Textures built from code (gradients, shapes) are shared process wide: every
+# widget asking for the same key gets the same GPU texture. The pixels are
+# kept so the texture can be uploaded again when the GL context is lost
+# (Android pause/resume).
+
+_texture_cache = {}
+
+
+def procedural_texture(key, size, build_pixels, colorfmt='rgba', wrap=None):
+    """
+    Shared texture for key, created from build_pixels() on first use.
+
+    build_pixels returns the pixel bytes for a texture of size (w, h),
+    rows from the bottom up, in colorfmt.
+    """
+    texture = _texture_cache.get(key)
+    if texture is not None:
+        return texture
+    pixels = build_pixels()
+    texture = Texture.create(size=size, colorfmt=colorfmt)
+    texture.blit_buffer(pixels, colorfmt=colorfmt, bufferfmt='ubyte')
+    if wrap:
+        texture.wrap = wrap
+
+    def _reload(tex):
+        tex.blit_buffer(pixels, colorfmt=colorfmt, bufferfmt='ubyte')
+
+    texture.add_reload_observer(_reload)
+    _texture_cache[key] = texture
+    return texture
+
+
+def _channel(start, end, steps):
+    return bytes(int((start * (1 - i / (steps - 1)) + end * (i / (steps - 1))) * 255) for i in range(steps))
+
+
+def gradient_pixels(color_from, color_to, steps):
+    """RGBA bytes blending color_from (first row) into color_to (last row)."""
+    if numpy is not None:
+        t = numpy.linspace(0.0, 1.0, steps)[:, None]
+        start = numpy.asarray(color_from, dtype=numpy.float64)[None, :]
+        end = numpy.asarray(color_to, dtype=numpy.float64)[None, :]
+        return ((start * (1 - t) + end * t) * 255).astype(numpy.uint8).tobytes()
+    # One pass per channel, interleaved by slice assignment
+    buf = bytearray(steps * 4)
+    for offset in range(4):
+        buf[offset::4] = _channel(color_from[offset], color_to[offset], steps)
+    return bytes(buf)
+
+
+def gradient_texture(color_top=BG_TOP, color_bottom=BG_BOTTOM, height=128):
+    """Shared 1 x height vertical gradient texture."""
+    key = ('gradient', tuple(color_top), tuple(color_bottom), height)
+    return procedural_texture(
+        key, (1, height),
+        lambda: gradient_pixels(color_top, color_bottom, height),
+        wrap='repeat',
+    )
+
+
 class GradientBackground(BoxLayout):
     def __init__(self, color_top=BG_TOP, color_bottom=BG_BOTTOM, **kwargs):
         super().__init__(**kwargs)
@@ -31,21 +98,7 @@ class GradientBackground(BoxLayout):
         self.bind(size=self._update_rect, pos=self._update_rect)
 
     def _build_texture(self):
-        h = 128
-        tex = Texture.create(size=(1, h), colorfmt='rgba')
-        buf = bytearray()
-        r1, g1, b1, a1 = self.color_top
-        r2, g2, b2, a2 = self.color_bottom
-        for i in range(h):
-            t = i / (h - 1)
-            r = int((r1 * (1 - t) + r2 * t) * 255)
-            g = int((g1 * (1 - t) + g2 * t) * 255)
-            b = int((b1 * (1 - t) + b2 * t) * 255)
-            a = int((a1 * (1 - t) + a2 * t) * 255)
-            buf += bytes((r, g, b, a))
-        tex.blit_buffer(bytes(buf), colorfmt='rgba', bufferfmt='ubyte')
-        tex.wrap = 'repeat'
-        self.rect.texture = tex
+        self.rect.texture = gradient_texture(self.color_top, self.color_bottom)
         self.rect.tex_coords = (0, 0, 1, 0, 1, 1, 0, 1)
 
     def _update_rect(self, *args):
@@ -30,7 +30,6 @@ from kivymd.uix.card import MDCard
 from kivymd.uix.label import MDLabel
 from kivymd.uix.button import MDIconButton
 from kivymd.uix.boxlayout import MDBoxLayout
-from kivymd.uix.dialog import MDDialog
 from kivymd.uix.button import MDFlatButton
 from kivymd.uix.scrollview import MDScrollView
 from kivy.metrics import dp
@@ -291,6 +290,8 @@ class NewsCard(MDCard):
 
     def show_full_content_dialog(self, *args):
         """Afișează dialogul cu conținutul complet"""
+        # Loaded on first use, not when the home screen is imported
+        from kivymd.uix.dialog import MDDialog
         # Creează layout-ul pentru conținutul dialogului
         content_layout = MDBoxLayout(
             orientation="vertical",
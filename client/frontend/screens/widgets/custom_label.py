@@ -1,3 +1,8 @@
+import re
+from collections import OrderedDict
+
+from kivy.core.text import Label as CoreLabel
+from kivy.core.text.markup import MarkupLabel as CoreMarkupLabel
 from kivy.metrics import dp, sp
 from kivy.uix.behaviors import ButtonBehavior
 from kivy.uix.label import Label
@@ -61,26 +66,118 @@ class ScalableLabel(Label):
         if available_width <= 0:
             return
 
-        # Start from the maximum size and shrink until it fits.
-        target_size = self.max_font_size
-        self.font_size = target_size
-        self.texture_update()
-
-        if self.texture_size[0] > available_width:
-            scale_factor = available_width / max(self.texture_size[0], 1)
-            target_size = max(self.min_font_size, self.max_font_size * scale_factor)
-            self.font_size = target_size
-            self.texture_update()
-
-        step = sp(1)
-        while self.font_size > self.min_font_size and self.texture_size[0] > available_width:
-            self.font_size = max(self.min_font_size, self.font_size - step)
-            self.texture_update()
-
-        if self.enforce_single_line:
-            desired_height = self.font_size * 1.35
-            while self.font_size > self.min_font_size and self.texture_size[1] > desired_height:
-                self.font_size = max(self.min_font_size, self.font_size - step)
-                self.texture_update()
-
-        self.text_size = (self.width - self.padding_dp * 2, None)
+        self.font_size = fit_font_size(self, available_width)
+        self.text_size = (available_width, None)
+
+
+# Font fitting -------------------------------------------------------------
+#
+# Sizes are measured with the core text provider's layout pass
+# (render(real=False)), which only asks the font for glyph extents and
+# never rasterises a texture, and found by binary search. Results are
+# cached, so re-laying out the same titles at the same width is free.
+#
+# Wrapped at the label width, the layout pass would report that width and
+# break an overlong word itself, so nothing would ever look too wide.
+# Words are therefore measured unwrapped: a size fits when the widest word
+# does (and, with enforce_single_line, the whole text).
+
+FIT_CACHE_SIZE = 512
+# Binary search stops when the interval is this small (pixels)
+FIT_PRECISION = 0.5
+# Text taller than this many font sizes is more than one line
+SINGLE_LINE_HEIGHT = 1.35
+
+_fit_cache = OrderedDict()
+# A markup tag, whitespace, or text up to the next tag
+_MARKUP_TOKEN = re.compile(r"(\[/?[^\[\]\s]*(?:=[^\]]*)?\])|(\s+)|([^\[\s]+|\[)")
+
+
+def _measure(label, font_size, text):
+    """Unwrapped (width, height) of text in label's font at font_size."""
+    options = {name: getattr(label, name) for name in Label._font_properties if hasattr(label, name)}
+    options.update(text=text, font_size=font_size, text_size=(None, None))
+    measurer = (CoreMarkupLabel if label.markup else CoreLabel)(**options)
+    measurer.resolve_font_name()
+    return measurer.render()
+
+
+def _words(label):
+    """
+    The text's words. With markup each word keeps the tags open where it
+    starts, so "[b]Carte de[/b]" gives "[b]Carte" and "[b]de[/b]".
+    """
+    if not label.markup:
+        return label.text.split()
+    words, pieces, open_tags, prefix = [], [], [], ""
+    for tag, space, text in _MARKUP_TOKEN.findall(label.text):
+        if space:
+            if any(not piece.startswith("[") or piece == "[" for piece in pieces):
+                words.append(prefix + "".join(pieces))
+            pieces = []
+            continue
+        if not pieces:
+            prefix = "".join(open_tags)
+        pieces.append(tag or text)
+        if tag.startswith("[/"):
+            name = tag[2:-1]
+            for index in range(len(open_tags) - 1, -1, -1):
+                if open_tags[index][1:].split("=", 1)[0].rstrip("]") == name:
+                    del open_tags[index]
+                    break
+        elif tag:
+            open_tags.append(tag)
+    if any(not piece.startswith("[") or piece == "[" for piece in pieces):
+        words.append(prefix + "".join(pieces))
+    return words
+
+
+def _fits(label, font_size, width, word):
+    if word is not None and _measure(label, font_size, word)[0] > width:
+        return False
+    if not label.enforce_single_line:
+        return True
+    text_width, text_height = _measure(label, font_size, label.text)
+    return text_width <= width and text_height <= font_size * SINGLE_LINE_HEIGHT
+
+
+def fit_font_size(label, width):
+    """
+    Largest font size in [label.min_font_size, label.max_font_size] at which
+    no word of label's text is wider than width (and, with
+    enforce_single_line, the text stays on one line); min_font_size if
+    none fits.
+    """
+    low, high = label.min_font_size, label.max_font_size
+    key = (
+        label.text, label.markup, label.font_name, label.bold, label.italic,
+        round(width), low, high, label.enforce_single_line,
+    )
+    size = _fit_cache.get(key)
+    if size is not None:
+        _fit_cache.move_to_end(key)
+        return size
+
+    # Word widths grow in proportion to the font size, so the widest word
+    # at one size is the one to check at every size
+    words = _words(label)
+    word = max(words, key=lambda w: _measure(label, high, w)[0]) if words else None
+
+    if _fits(label, high, width, word):
+        size = high
+    elif not _fits(label, low, width, word):
+        size = low
+    else:
+        # Invariant: low fits, high does not
+        while high - low > FIT_PRECISION:
+            middle = (low + high) / 2
+            if _fits(label, middle, width, word):
+                low = middle
+            else:
+                high = middle
+        size = low
+
+    _fit_cache[key] = size
+    if len(_fit_cache) > FIT_CACHE_SIZE:
+        _fit_cache.popitem(last=False)
+    return size
@@ -1,4 +1,4 @@
-from typing import Iterable, List, Optional, Sequence
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
 
 from kivy.core.window import Window
 from kivy.metrics import dp, sp
@@ -12,6 +12,7 @@ from frontend.screens.widgets.custom_alignment import Alignment
 from frontend.screens.widgets.custom_background import GradientBackground
 from frontend.screens.widgets.custom_cards import CustomCards
 from frontend.screens.widgets.custom_label import ScalableLabel
+from frontend.screens.widgets.responsive import responsive_layout
 
 
 class DocumentListMixin(CustomCards, Alignment):
@@ -36,6 +37,8 @@ class DocumentListMixin(CustomCards, Alignment):
     CARD_MIN_HEIGHT = 132
     CARD_EXTRA_HEIGHT = 22
     EMPTY_HEIGHT = 220
+    # Removed cards kept for reuse by later documents
+    CARD_POOL_SIZE = 16
 
     TITLE_COLOR = "#33A3FF"
     TITLE_TEXT = "Documente"
@@ -58,9 +61,14 @@ class DocumentListMixin(CustomCards, Alignment):
 
         self.scale_ratio = self._compute_scale()
         self.documents: List[dict] = []
+        # Card entries in display order, and the document cards by key
         self._doc_widgets = []
+        self._doc_entries: Dict[Hashable, dict] = {}
+        self._card_pool: List[dict] = []
+        self._registered_entries: List[dict] = []
 
-        Window.bind(size=self._on_window_resize)
+        # Re-laid out once per frame while resizing, and only when on display
+        responsive_layout().register(self, self._on_window_resize)
 
         self.bg = GradientBackground()
         self.add_widget(self.bg)
@@ -148,37 +156,146 @@ class DocumentListMixin(CustomCards, Alignment):
         self._refresh_documents()
 
     def _refresh_documents(self) -> None:
-        self.cards_container.clear_widgets()
-        self._doc_widgets.clear()
-
-        if not self.documents:
+        """
+        Bring the cards in line with self.documents.
+
+        Cards are keyed by document (see _document_key): unchanged documents
+        keep their card, changed ones are updated in place, and only the
+        cards of added or removed documents are created or taken away.
+        Removed cards go to a small pool and are reused for new documents.
+        """
+        self._registered_entries = []
+        previous = self._doc_entries
+        entries: Dict[Hashable, dict] = {}
+        changed = []
+        for key, doc in self._keyed_documents():
+            entry = previous.pop(key, None)
+            if entry is None:
+                entry = self._reuse_pooled_card(doc) or self._new_document_card(doc)
+                changed.append(entry)
+            elif entry.get("signature") != self._card_fields(doc):
+                if not self._update_document_card(entry, doc):
+                    self._release_card(entry)
+                    entry = self._new_document_card(doc)
+                changed.append(entry)
+            entries[key] = entry
+        for entry in previous.values():
+            self._release_card(entry)
+        self._doc_entries = entries
+
+        # Subclass rows are rebuilt each time; their entries are scaled too
+        extra_rows = [row for row in self._get_additional_cards() if row]
+        extra_entries = self._registered_entries
+        self._registered_entries = []
+        self._doc_widgets = list(entries.values()) + extra_entries
+
+        if entries:
+            rows = [entry["row"] for entry in entries.values()]
+        else:
             self.empty_state_anchor.height = self._scale_dp(self.EMPTY_HEIGHT)
-            self.cards_container.add_widget(self.empty_state_anchor)
-            for extra_row in self._get_additional_cards():
-                if extra_row:
-                    self.cards_container.add_widget(extra_row)
-            self.cards_container.add_widget(self.bottom_spacer)
-            self._apply_scale()
-            return
-
-        for doc in self.documents:
-            card_row = self._create_document_card(doc)
-            self.cards_container.add_widget(card_row)
+            rows = [self.empty_state_anchor]
+        self._sync_children(self.cards_container, rows + extra_rows + [self.bottom_spacer])
 
-        for extra_row in self._get_additional_cards():
-            if extra_row:
-                self.cards_container.add_widget(extra_row)
+        for entry in changed + extra_entries:
+            self._scale_entry(entry)
 
-        self.cards_container.add_widget(self.bottom_spacer)
-        self._apply_scale()
-
-    def _create_document_card(self, doc: dict) -> AnchorLayout:
-        title = (
+    def _keyed_documents(self) -> Iterable[Tuple[Hashable, dict]]:
+        seen: Dict[Hashable, int] = {}
+        for doc in self.documents:
+            key = self._document_key(doc)
+            # Documents with the same key are told apart by their order
+            count = seen.get(key, 0)
+            seen[key] = count + 1
+            yield (key, count), doc
+
+    def _document_key(self, doc: dict) -> Hashable:
+        for field in ("id", "document_id", "doc_id"):
+            if doc.get(field) is not None:
+                return field, doc[field]
+        return "title", self._document_title(doc)
+
+    @staticmethod
+    def _document_title(doc: dict) -> str:
+        return (
             doc.get("title")
             or doc.get("name")
             or doc.get("document_name")
             or "Document"
         )
+
+    def _card_fields(self, doc: dict) -> Tuple[str, Tuple[str, ...]]:
+        """What a card shows of a document; the card is updated when it changes."""
+        return self._document_title(doc), tuple(self._collect_meta_lines(doc))
+
+    @staticmethod
+    def _sync_children(container: Widget, desired: Sequence[Widget]) -> None:
+        """Make container's children desired (top to bottom) with as few moves as possible."""
+        if container.children[::-1] == list(desired):
+            return
+        wanted = set(desired)
+        for child in list(container.children):
+            if child not in wanted:
+                container.remove_widget(child)
+        for position, widget in enumerate(desired):
+            children = container.children
+            if position < len(children) and children[len(children) - 1 - position] is widget:
+                continue
+            if widget.parent is not None:
+                widget.parent.remove_widget(widget)
+            # children is in reverse order: index counts from the bottom
+            container.add_widget(widget, index=len(container.children) - position)
+
+    def _new_document_card(self, doc: dict) -> dict:
+        row = self._create_document_card(doc)
+        registered = [entry for entry in self._registered_entries if entry["row"] is row]
+        for entry in registered:
+            self._registered_entries.remove(entry)
+        entry = registered[-1] if registered else {"row": row}
+        entry["signature"] = self._card_fields(doc)
+        return entry
+
+    def _reuse_pooled_card(self, doc: dict) -> Optional[dict]:
+        while self._card_pool:
+            entry = self._card_pool.pop()
+            if self._update_document_card(entry, doc):
+                return entry
+        return None
+
+    def _release_card(self, entry: dict) -> None:
+        row = entry["row"]
+        if row.parent is not None:
+            row.parent.remove_widget(row)
+        if "title_updater" in entry and len(self._card_pool) < self.CARD_POOL_SIZE:
+            self._card_pool.append(entry)
+
+    def _update_document_card(self, entry: dict, doc: dict) -> bool:
+        """Show doc on an existing card; False for cards not built by _create_document_card."""
+        if "title_updater" not in entry:
+            return False
+        title, meta_lines = self._card_fields(doc)
+        entry["title"].text = f"[b]{title}[/b]"
+
+        content = entry["content"]
+        meta_labels = entry["meta"]
+        meta_updaters = entry["meta_updaters"]
+        while len(meta_labels) > len(meta_lines):
+            content.remove_widget(meta_labels.pop())
+            meta_updaters.pop()
+        while len(meta_labels) < len(meta_lines):
+            label, updater = self._create_meta_label("")
+            content.add_widget(label)
+            meta_labels.append(label)
+            meta_updaters.append(updater)
+        for label, line in zip(meta_labels, meta_lines):
+            label.text = line
+
+        entry["base_height"] = self.CARD_MIN_HEIGHT + self.CARD_EXTRA_HEIGHT * len(meta_lines)
+        entry["height_updaters"] = [entry["title_updater"], *meta_updaters]
+        entry["signature"] = (title, tuple(meta_lines))
+        return True
+
+    def _create_document_card(self, doc: dict) -> AnchorLayout:
+        title = self._document_title(doc)
         meta_lines = self._collect_meta_lines(doc)
 
         base_height = self.CARD_MIN_HEIGHT + self.CARD_EXTRA_HEIGHT * max(len(meta_lines), 0)
@@ -214,16 +331,8 @@ class DocumentListMixin(CustomCards, Alignment):
         meta_labels = []
         meta_updaters = []
         for line in meta_lines:
-            lbl = Label(
-                text=line,
-                color=(0.70, 0.76, 0.86, 1),
-                font_size=self._scale_sp(self.META_FONT),
-                halign="left",
-                valign="middle",
-                size_hint=(1, None),
-            )
-            lbl.bind(size=lambda label, size: setattr(label, "text_size", (size[0], None)))
-            meta_updaters.append(self._bind_dynamic_height(lbl, padding_dp=2))
+            lbl, updater = self._create_meta_label(line)
+            meta_updaters.append(updater)
             content.add_widget(lbl)
             meta_labels.append(lbl)
 
@@ -238,7 +347,7 @@ class DocumentListMixin(CustomCards, Alignment):
         row.padding = [0, self._scale_dp(4), 0, self._scale_dp(4)]
         card.bind(height=lambda *_: setattr(row, "height", card.height + self._scale_dp(8)))
 
-        self._register_card_entry(
+        entry = self._register_card_entry(
             row=row,
             card=card,
             content=content,
@@ -251,9 +360,24 @@ class DocumentListMixin(CustomCards, Alignment):
                 if updater
             ],
         )
+        # Parts _update_document_card needs to reuse the card
+        entry["title_updater"] = title_updater
+        entry["meta_updaters"] = meta_updaters
 
         return row
 
+    def _create_meta_label(self, text: str):
+        label = Label(
+            text=text,
+            color=(0.70, 0.76, 0.86, 1),
+            font_size=self._scale_sp(self.META_FONT),
+            halign="left",
+            valign="middle",
+            size_hint=(1, None),
+        )
+        label.bind(size=lambda lbl, size: setattr(lbl, "text_size", (size[0], None)))
+        return label, self._bind_dynamic_height(label, padding_dp=2)
+
     def _get_additional_cards(self) -> Sequence[AnchorLayout]:
         return []
 
@@ -267,18 +391,18 @@ class DocumentListMixin(CustomCards, Alignment):
         meta: Optional[Sequence[Widget]] = None,
         base_height: float = 0,
         height_updaters: Optional[Sequence] = None,
-    ) -> None:
-        self._doc_widgets.append(
-            {
-                "row": row,
-                "card": card,
-                "content": content,
-                "title": title,
-                "meta": list(meta or []),
-                "base_height": base_height,
-                "height_updaters": list(height_updaters or []),
-            }
-        )
+    ) -> dict:
+        entry = {
+            "row": row,
+            "card": card,
+            "content": content,
+            "title": title,
+            "meta": list(meta or []),
+            "base_height": base_height,
+            "height_updaters": list(height_updaters or []),
+        }
+        self._registered_entries.append(entry)
+        return entry
 
     def _collect_meta_lines(self, doc: dict) -> Sequence[str]:
         """Return only expiry-related meta info."""
@@ -357,38 +481,43 @@ class DocumentListMixin(CustomCards, Alignment):
         self.bottom_spacer.height = self._scale_dp(24)
 
         for entry in self._doc_widgets:
-            card = entry["card"]
-            base_height = entry["base_height"]
-            card.height = self._scale_dp(base_height)
-            card.width = self._compute_card_width()
+            self._scale_entry(entry)
 
-            entry["row"].padding = [0, self._scale_dp(4), 0, self._scale_dp(4)]
-            entry["row"].height = card.height + self._scale_dp(8)
-
-            content = entry["content"]
-            content.padding = [
-                self._scale_dp(self.CARD_PADDING[0]),
-                self._scale_dp(self.CARD_PADDING[1]),
-                self._scale_dp(self.CARD_PADDING[0]),
-                self._scale_dp(self.CARD_PADDING[1]),
-            ]
-            content.spacing = self._scale_dp(8)
-
-            title_label = entry["title"]
-            if title_label:
-                if hasattr(title_label, "max_font_size"):
-                    title_label.max_font_size = self._scale_sp(self.TITLE_CARD_FONT)
-                if hasattr(title_label, "padding_dp"):
-                    title_label.padding_dp = self._scale_dp(4)
-                update_fn = getattr(title_label, "_update_font_size", None)
-                if callable(update_fn):
-                    update_fn()
-
-            for meta_label in entry["meta"]:
-                meta_label.font_size = self._scale_sp(self.META_FONT)
-
-            for updater in entry["height_updaters"]:
-                updater()
+    def _scale_entry(self, entry: dict) -> None:
+        card = entry.get("card")
+        if card is None:
+            return
+        base_height = entry["base_height"]
+        card.height = self._scale_dp(base_height)
+        card.width = self._compute_card_width()
+
+        entry["row"].padding = [0, self._scale_dp(4), 0, self._scale_dp(4)]
+        entry["row"].height = card.height + self._scale_dp(8)
+
+        content = entry["content"]
+        content.padding = [
+            self._scale_dp(self.CARD_PADDING[0]),
+            self._scale_dp(self.CARD_PADDING[1]),
+            self._scale_dp(self.CARD_PADDING[0]),
+            self._scale_dp(self.CARD_PADDING[1]),
+        ]
+        content.spacing = self._scale_dp(8)
+
+        title_label = entry["title"]
+        if title_label:
+            if hasattr(title_label, "max_font_size"):
+                title_label.max_font_size = self._scale_sp(self.TITLE_CARD_FONT)
+            if hasattr(title_label, "padding_dp"):
+                title_label.padding_dp = self._scale_dp(4)
+            update_fn = getattr(title_label, "_update_font_size", None)
+            if callable(update_fn):
+                update_fn()
+
+        for meta_label in entry["meta"]:
+            meta_label.font_size = self._scale_sp(self.META_FONT)
+
+        for updater in entry["height_updaters"]:
+            updater()
 
     def _compute_card_width(self) -> float:
         return self._clamp(Window.width * 0.88, self._scale_dp(260), self._scale_dp(580))
@@ -400,10 +529,7 @@ class DocumentListMixin(CustomCards, Alignment):
         return sp(value * self.scale_ratio)
 
     def _compute_scale(self) -> float:
-        width_ratio = Window.width / self.BASE_WIDTH
-        height_ratio = Window.height / self.BASE_HEIGHT
-        scale = min(width_ratio, height_ratio)
-        return max(self.MIN_SCALE, min(self.MAX_SCALE, scale))
+        return responsive_layout().scale_for(self.BASE_WIDTH, self.BASE_HEIGHT, self.MIN_SCALE, self.MAX_SCALE)
 
     def _on_window_resize(self, *_):
         self.scale_ratio = self._compute_scale()
@@ -1,27 +1,151 @@
 
-import io
-import qrcode
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+
+from kivy.clock import Clock
+from kivy.graphics.texture import Texture
+from kivy.logger import Logger
 from kivy.uix.image import Image
-from kivy.core.image import Image as CoreImage
+
+from server_requests.request_executor import RequestHandle
+
+
+# Textures kept for codes shown again (same payload and module size)
+QR_CACHE_SIZE = 32
+# One pixel per module: the GPU scales it up (nearest filter), so the pixel
+# buffer kept for GL context reloads stays a few KB per code
+BOX_SIZE = 1
+BORDER = 2
+
+
+def qr_pixels(data_str, box_size=BOX_SIZE, border=BORDER):
+    """
+    Encode data_str and draw its modules as RGBA bytes, rows bottom up
+    (texture order). Returns (side in pixels, bytes). Thread safe.
+    """
+    # qrcode is only needed once a code is shown
+    import qrcode
+
+    qr = qrcode.QRCode(version=1, box_size=box_size, border=border)
+    qr.add_data(data_str)
+    qr.make(fit=True)
+    black, white = b"\x00\x00\x00\xff", b"\xff\xff\xff\xff"
+    matrix = qr.get_matrix()
+    rows = []
+    for modules in reversed(matrix):
+        row = b"".join((black if dark else white) * box_size for dark in modules)
+        rows.append(row * box_size)
+    return len(matrix) * box_size, b"".join(rows)
+
+
+class QRRenderer:
+    """
+    Renders QR codes off the UI thread into cached textures.
+
+    Encoding runs on one worker thread; only the texture upload (one
+    blit_buffer of the module pixels, no PNG round trip) happens on the
+    main thread. Textures are cached by payload hash and module size, least
+    recently used first out.
+    """
+
+    def __init__(self, cache_size=QR_CACHE_SIZE):
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="qr-render")
+
+    def render(self, data_str, callback, box_size=BOX_SIZE, border=BORDER):
+        """
+        Call callback(texture) on the main thread once the code is ready
+        (right away when cached; texture is None if encoding failed).
+        Returns a RequestHandle; cancelling it drops the callback.
+        """
+        handle = RequestHandle()
+        key = (hashlib.sha256(data_str.encode("utf-8")).hexdigest(), box_size, border)
+        texture = self._cache.get(key)
+        if texture is not None:
+            self._cache.move_to_end(key)
+            callback(texture)
+            return handle
+
+        def on_done(future):
+            Clock.schedule_once(lambda dt: deliver(future), 0)
+
+        def deliver(future):
+            if handle.cancelled:
+                return
+            try:
+                side, pixels = future.result()
+            except Exception as e:
+                Logger.error(f"QRRenderer: encoding failed: {e}")
+                callback(None)
+                return
+            callback(self._store(key, side, pixels))
+
+        handle.future = self._executor.submit(qr_pixels, data_str, box_size, border)
+        handle.future.add_done_callback(on_done)
+        return handle
+
+    def _store(self, key, side, pixels):
+        texture = self._cache.get(key)
+        if texture is None:
+            texture = Texture.create(size=(side, side), colorfmt="rgba")
+            texture.blit_buffer(pixels, colorfmt="rgba", bufferfmt="ubyte")
+            texture.mag_filter = "nearest"
+            # Uploaded again if the GL context is lost (Android pause/resume)
+            texture.add_reload_observer(
+                lambda tex: tex.blit_buffer(pixels, colorfmt="rgba", bufferfmt="ubyte")
+            )
+            self._cache[key] = texture
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return texture
+
+
+_qr_renderer = None
+
+
+def qr_renderer():
+    """The app-wide QRRenderer (created on first use)."""
+    global _qr_renderer
+    if _qr_renderer is None:
+        _qr_renderer = QRRenderer()
+    return _qr_renderer
 
 
 class QRCodeWidget(Image):
-    def __init__(self, data_str, **kwargs):
+    """
+    Image of a QR code, rendered in the background.
+
+    Shows nothing until the code is ready; ready_callback(widget) is called
+    then (also when it came from the cache), so a placeholder can be
+    swapped out. The texture has one pixel per module and is stretched to
+    the widget.
+    """
+
+    def __init__(self, data_str, ready_callback=None, **kwargs):
+        if hasattr(Image, "fit_mode"):
+            kwargs.setdefault("fit_mode", "contain")
+        else:  # Kivy < 2.2
+            kwargs.setdefault("allow_stretch", True)
         super().__init__(**kwargs)
+        self.ready_callback = ready_callback
+        self.request = None
         self.generate_qr(data_str)
 
     def generate_qr(self, data_str):
-        # Generăm codul QR
-        qr = qrcode.QRCode(version=1, box_size=8, border=2)
-        qr.add_data(data_str)
-        qr.make(fit=True)
-        img = qr.make_image(fill_color="black", back_color="white")
-
-        # Salvăm în buffer (nu pe disc)
-        buffer = io.BytesIO()
-        img.save(buffer, format='PNG')
-        buffer.seek(0)
-
-        # Convertim în imagine Kivy
-        core_img = CoreImage(buffer, ext='png')
-        self.texture = core_img.texture
+        if self.request is not None:
+            self.request.cancel()
+        self.request = qr_renderer().render(data_str, self._on_texture)
+
+    def _on_texture(self, texture):
+        self.request = None
+        if texture is not None:
+            self.texture = texture
+        if self.ready_callback is not None:
+            self.ready_callback(self)
+
+    def cancel(self):
+        if self.request is not None:
+            self.request.cancel()
+            self.request = None
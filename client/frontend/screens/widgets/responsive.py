@@ -0,0 +1,129 @@
+from typing import Callable, Dict, Optional, Tuple
+import weakref
+
+from kivy.clock import Clock
+from kivy.core.window import Window
+from kivy.event import EventDispatcher
+from kivy.properties import ListProperty, NumericProperty
+from kivy.weakmethod import WeakMethod
+
+
+BASE_WIDTH = 412
+BASE_HEIGHT = 915
+MIN_SCALE = 0.75
+MAX_SCALE = 1.6
+
+
+class ResponsiveLayout(EventDispatcher):
+    """
+    One place that reacts to window resizes and rotations.
+
+    Window size events are coalesced to at most one per frame. The scale
+    ratio is computed once per resize and shared. Screens register a
+    re-layout callback: the screens on display run it right away, the others
+    are only marked dirty and run it in their on_pre_enter, so hidden screens
+    do no layout work while the window is being resized.
+
+    scale and window_size are Kivy properties for widgets that just need to
+    follow them.
+    """
+
+    scale = NumericProperty(1.0)
+    window_size = ListProperty([0, 0])
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # id -> (callback or WeakMethod, weakref to the owning screen or None)
+        self._targets: Dict[int, Tuple[object, Optional[weakref.ref]]] = {}
+        self._dirty = set()
+        self._scales: Dict[Tuple[float, float, float, float], float] = {}
+        self._next_id = 0
+        self._trigger = Clock.create_trigger(self._apply, -1)
+        Window.bind(size=self._trigger, on_rotate=self._trigger)
+        self._update_size()
+
+    def register(self, screen, callback: Callable[[], None]) -> int:
+        """
+        Call callback() after resizes while screen is displayed, or before
+        it is entered next otherwise. With screen None it always runs.
+        Returns an id for unregister.
+        """
+        target_id = self._next_id
+        self._next_id += 1
+        ref = WeakMethod(callback) if hasattr(callback, "__self__") else callback
+        owner = weakref.ref(screen) if screen is not None else None
+        self._targets[target_id] = (ref, owner)
+        if screen is not None and not getattr(screen, "_responsive_bound", False):
+            screen._responsive_bound = True
+            screen.fbind("on_pre_enter", self._on_pre_enter)
+        return target_id
+
+    def unregister(self, target_id: int) -> None:
+        self._targets.pop(target_id, None)
+        self._dirty.discard(target_id)
+
+    def scale_for(self, base_width=BASE_WIDTH, base_height=BASE_HEIGHT,
+                  min_scale=MIN_SCALE, max_scale=MAX_SCALE) -> float:
+        """Scale of the current window against a base design size, clamped."""
+        key = (base_width, base_height, min_scale, max_scale)
+        scale = self._scales.get(key)
+        if scale is None:
+            width, height = self.window_size
+            scale = min(width / base_width, height / base_height)
+            scale = self._scales[key] = max(min_scale, min(max_scale, scale))
+        return scale
+
+    def _update_size(self) -> None:
+        self._scales.clear()
+        self.window_size = list(Window.size)
+        self.scale = self.scale_for()
+
+    def _apply(self, *_):
+        if tuple(self.window_size) == tuple(Window.size):
+            return
+        self._update_size()
+        for target_id, (_, owner) in list(self._targets.items()):
+            screen = owner() if owner is not None else None
+            if owner is not None and screen is None:
+                self.unregister(target_id)
+            elif screen is None or self._is_displayed(screen):
+                self._run(target_id)
+            else:
+                self._dirty.add(target_id)
+
+    @staticmethod
+    def _is_displayed(screen) -> bool:
+        # A ScreenManager only parents the current screen (and the previous
+        # one during a transition)
+        return screen.get_parent_window() is not None
+
+    def _on_pre_enter(self, screen, *_):
+        for target_id in [t for t in self._dirty if self._owner(t) is screen]:
+            self._run(target_id)
+
+    def _owner(self, target_id):
+        owner = self._targets[target_id][1]
+        return owner() if owner is not None else None
+
+    def _run(self, target_id) -> None:
+        self._dirty.discard(target_id)
+        ref = self._targets[target_id][0]
+        callback = ref() if isinstance(ref, WeakMethod) else ref
+        if callback is None:
+            self.unregister(target_id)
+            return
+        callback()
+
+
+_responsive_layout = None
+
+
+def responsive_layout() -> ResponsiveLayout:
+    """The app-wide ResponsiveLayout (created on first use)."""
+    global _responsive_layout
+    if _responsive_layout is None:
+        _responsive_layout = ResponsiveLayout()
+    return _responsive_layout
+
+
+__all__ = ["ResponsiveLayout", "responsive_layout"]
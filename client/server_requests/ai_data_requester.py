@@ -3,9 +3,9 @@
 # "health" => AiRequests::call_python_health().await,
 
 import base64
-import os
-from pathlib import Path
-from kivy.logger import Logger
+
+from server_requests.transport import AI_READ_TIMEOUT, timeouts
+from server_requests.chunked_upload import CHUNKED_UPLOAD_FEATURE, ChunkedUpload, UploadFailed, UploadNotSupported
 
 class AI_DataRequester:
     def __init__(self):
@@ -20,10 +20,10 @@ class AI_DataRequester:
                 "token": self.token
             }
             
-            response = self.session.post(
+            response = self.ai_session.post(
                 f"{self.server_url}/api/AI", 
                 json=payload, 
-                timeout=120,
+                timeout=timeouts(AI_READ_TIMEOUT),
             )
             
             if response.status_code == 200:
@@ -45,10 +45,10 @@ class AI_DataRequester:
                 "token": self.token
             }
             
-            response = self.session.post(
+            response = self.ai_session.post(
                 f"{self.server_url}/api/AI", 
                 json=payload, 
-                timeout=120,
+                timeout=timeouts(AI_READ_TIMEOUT),
             )
             
             if response.status_code == 200:
@@ -60,4 +60,26 @@ class AI_DataRequester:
                 return None
         except Exception as e:
             print(f"❌ Eroare: {str(e)}")
-            return None
\ No newline at end of file
+            return None
+
+    def upload_OCR_image(self, image_bytes):
+        """
+        Send an image for OCR with a resumable chunked upload.
+
+        A dropped connection only costs the chunk in flight. Only used when
+        the server lists chunked uploads among its /health features; other
+        servers get the whole image in one request (sent_OCR_image), without
+        probing /api/upload first.
+        """
+        if not self.monitor.supports(CHUNKED_UPLOAD_FEATURE):
+            return self.sent_OCR_image(base64.b64encode(image_bytes).decode('utf-8'))
+        upload = ChunkedUpload(self, image_bytes, "OCR")
+        try:
+            data = upload.run()
+            print(f"✅ {data['success']} ({upload.summary()})")
+            return data
+        except UploadNotSupported:
+            return self.sent_OCR_image(base64.b64encode(image_bytes).decode('utf-8'))
+        except UploadFailed as e:
+            print(f"❌ Eroare: {str(e)}")
+            return None
@@ -1,3 +1,4 @@
+from server_requests.transport import timeouts
 
 
 
@@ -18,7 +19,7 @@ class AuthRequester:
             response = self.session.post(
                 f"{self.server_url}/api/message", 
                 json=payload, 
-                timeout=5
+                timeout=timeouts()
             )
             
             if response.status_code == 200:
@@ -32,6 +33,8 @@ class AuthRequester:
         except Exception as e:
             print(f"❌ Eroare: {str(e)}")
             return None
+        finally:
+            self.clear_data()
         
 
     def send_login(self, username, password):
@@ -44,7 +47,7 @@ class AuthRequester:
             response = self.session.post(
                 f"{self.server_url}/login", 
                 json=payload, 
-                timeout=5
+                timeout=timeouts()
             )
             
             if response.status_code == 200:
@@ -57,6 +60,11 @@ class AuthRequester:
                             'Authorization': f'Bearer {self.token}'
                         })
                     print("login succesdful")
+                    self.start_prefetch()
+                    # Send documents saved while offline or before a logout
+                    queue = self.write_queue()
+                    if queue is not None:
+                        queue.flush_now()
                     return data
                 else:
                     print(f"❌ {data.get('message', 'Login eșuat')}")
@@ -81,7 +89,7 @@ class AuthRequester:
             response = self.session.post(
                 f"{self.server_url}/register", 
                 json=payload, 
-                timeout=5
+                timeout=timeouts()
             )
             
             if response.status_code == 200:
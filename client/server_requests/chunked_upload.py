@@ -0,0 +1,161 @@
+import hashlib
+import random
+import threading
+
+import requests
+from kivy.logger import Logger
+
+
+# Listed in the /health "features" of servers that have /api/upload
+CHUNKED_UPLOAD_FEATURE = "chunked_upload"
+CHUNK_SIZE = 64 * 1024
+MAX_ATTEMPTS = 6
+# Short per-chunk timeouts: a stalled chunk is retried instead of waiting 120 s
+CHUNK_TIMEOUT = (5, 20)
+# Finishing runs the OCR itself on the server
+FINISH_TIMEOUT = 120
+
+
+class UploadNotSupported(Exception):
+    """The server has no /api/upload endpoints (single-request upload only)."""
+
+
+class UploadFailed(Exception):
+    """The upload made no progress in MAX_ATTEMPTS reconnects, or was cancelled."""
+
+
+class ChunkedUpload:
+    """
+    Resumable upload of one binary payload to an AI message (e.g. OCR).
+
+    Protocol (all endpoints under /api/upload, Bearer token as for /api/*):
+
+        POST /api/upload/start   {user_id, message_type, size, sha256}
+                                 -> {upload_id, offset, chunk_size}
+        PUT  /api/upload/<id>?offset=N   raw chunk bytes -> {offset}
+        GET  /api/upload/<id>            -> {offset, size}
+        POST /api/upload/<id>/finish     -> same response as /api/AI
+
+    The server only acknowledges whole chunks and returns the next offset
+    it expects. After a dropped connection the client asks for that offset
+    and carries on from there, so only the unacknowledged chunk is sent
+    again. A chunk sent at the wrong offset is answered with 409 and the
+    server's offset. start is keyed by the payload hash, so retrying the
+    same image later resumes the server side upload too.
+    """
+
+    def __init__(self, server, data: bytes, message_type="OCR", chunk_size=CHUNK_SIZE):
+        self.server = server
+        self.session = server.ai_session
+        self.data = bytes(data)
+        self.message_type = message_type
+        self.chunk_size = chunk_size
+        self.sha256 = hashlib.sha256(self.data).hexdigest()
+        self.upload_id = None
+        self.offset = 0
+        self.bytes_sent = 0
+        self.resumes = 0
+        self.cancelled = threading.Event()
+
+    def _url(self, suffix=""):
+        return f"{self.server.server_url}/api/upload{suffix}"
+
+    def _start(self):
+        payload = {
+            "user_id": self.server.user_id,
+            "message_type": self.message_type,
+            "size": len(self.data),
+            "sha256": self.sha256,
+            "token": self.server.token
+        }
+        response = self.session.post(self._url("/start"), json=payload, timeout=CHUNK_TIMEOUT)
+        if response.status_code in (404, 405):
+            raise UploadNotSupported()
+        response.raise_for_status()
+        data = response.json()
+        self.upload_id = data["upload_id"]
+        self.offset = int(data.get("offset", 0))
+        self.chunk_size = min(self.chunk_size, int(data.get("chunk_size") or self.chunk_size))
+
+    def _server_offset(self):
+        response = self.session.get(self._url(f"/{self.upload_id}"), timeout=CHUNK_TIMEOUT)
+        if response.status_code == 404:
+            # Expired on the server; start over with a new upload
+            self.upload_id = None
+            return 0
+        response.raise_for_status()
+        return int(response.json()["offset"])
+
+    def _send_chunk(self):
+        chunk = self.data[self.offset:self.offset + self.chunk_size]
+        self.bytes_sent += len(chunk)
+        response = self.session.put(
+            self._url(f"/{self.upload_id}"),
+            params={"offset": self.offset},
+            data=chunk,
+            headers={"Content-Type": "application/octet-stream"},
+            timeout=CHUNK_TIMEOUT,
+        )
+        if response.status_code == 409:
+            self.offset = int(response.json()["offset"])
+            return
+        response.raise_for_status()
+        self.offset = int(response.json()["offset"])
+
+    def _finish(self):
+        response = self.session.post(self._url(f"/{self.upload_id}/finish"), timeout=FINISH_TIMEOUT)
+        response.raise_for_status()
+        return response.json()
+
+    def _backoff(self, attempt):
+        # Exponential with jitter so many clients do not reconnect in lockstep
+        delay = min(0.5 * 2 ** attempt, 8) * random.uniform(0.5, 1.0)
+        self.cancelled.wait(delay)
+
+    def run(self):
+        """
+        Upload everything and return the server's response to the message.
+
+        Raises:
+            UploadNotSupported: The server cannot take chunked uploads
+            UploadFailed: No progress in MAX_ATTEMPTS reconnects, or cancelled
+        """
+        attempt = 0
+        failed_at = -1
+        while not self.cancelled.is_set():
+            try:
+                if self.upload_id is None:
+                    self._start()
+                elif failed_at >= 0:
+                    self.offset = self._server_offset()
+                    if self.upload_id is None:
+                        continue
+                while self.offset < len(self.data):
+                    if self.cancelled.is_set():
+                        raise UploadFailed("cancelled")
+                    self._send_chunk()
+                return self._finish()
+            except (UploadNotSupported, UploadFailed):
+                raise
+            except (requests.RequestException, ValueError, KeyError) as e:
+                status = getattr(getattr(e, "response", None), "status_code", None)
+                if status in (400, 401, 403, 413):
+                    # Retrying will not change the answer
+                    raise UploadFailed(f"{e}")
+                # Only count reconnects that made no progress since the last failure
+                attempt = attempt + 1 if self.offset <= failed_at else 1
+                failed_at = self.offset
+                if attempt >= MAX_ATTEMPTS:
+                    raise UploadFailed(f"{e} (after {attempt} attempts)")
+                self.resumes += 1
+                Logger.warning(f"ChunkedUpload: {e}; resuming at {self.offset}/{len(self.data)} (attempt {attempt})")
+                self._backoff(attempt)
+        raise UploadFailed("cancelled")
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def summary(self):
+        overhead = self.bytes_sent - len(self.data)
+        return (f"{len(self.data)} bytes in {self.chunk_size // 1024} KB chunks, "
+                f"{self.resumes} resumes, {max(overhead, 0)} bytes resent")
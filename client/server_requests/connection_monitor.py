@@ -0,0 +1,143 @@
+import random
+import threading
+import time
+
+import requests
+from kivy.clock import Clock
+from kivy.event import EventDispatcher
+from kivy.logger import Logger
+from kivy.properties import BooleanProperty, NumericProperty, OptionProperty
+
+from server_requests.transport import make_session
+
+
+class ConnectionMonitor(EventDispatcher):
+    """
+    Tracks whether the server is reachable, without polling it constantly.
+
+    Any response the foreground session gets counts as a successful check,
+    so /health is only asked when the app has been quiet for IDLE_INTERVAL.
+    While the server is unreachable the checks back off exponentially (with
+    jitter) up to MAX_BACKOFF. Nothing runs while the app is paused.
+
+    The optional endpoints a server offers are read from the "features" list
+    of its /health answer; supports() tells callers whether to use them.
+
+    state, failures and paused are Kivy properties, updated on the main
+    thread, so screens can bind to them.
+    """
+
+    state = OptionProperty("unknown", options=["unknown", "online", "offline"])
+    # Consecutive failed checks since the server was last reachable
+    failures = NumericProperty(0)
+    paused = BooleanProperty(False)
+
+    IDLE_INTERVAL = 60
+    BASE_BACKOFF = 1.0
+    MAX_BACKOFF = 60.0
+    HEALTH_TIMEOUT = (3, 5)
+
+    def __init__(self, server, **kwargs):
+        super().__init__(**kwargs)
+        self.server = server
+        # Own session: health checks never wait behind (or block) foreground requests
+        self.session = make_session(verify=server.session.verify, pool_size=1, http2=False)
+        self._last_success = 0.0
+        self._failures = 0
+        self.features = frozenset()
+        self._wake = threading.Event()
+        self._running = threading.Event()
+        self._thread = None
+        server.session.hooks["response"].append(self._on_foreground_response)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._running.set()
+            self._thread = threading.Thread(target=self._loop, name="connection-monitor", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._running.clear()
+        self._wake.set()
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+        self.check_now()
+
+    def reset(self):
+        """Forget the last result, e.g. after the server URL changed. Main thread only."""
+        self._failures = 0
+        self.failures = 0
+        self.state = "unknown"
+        self.features = frozenset()
+        self.check_now()
+
+    def check_now(self):
+        """Ask /health right away (e.g. on the splash screen or after a resume)."""
+        self._last_success = 0.0
+        self._wake.set()
+
+    def supports(self, feature):
+        """Whether the last /health answer listed feature (False until one arrived)."""
+        return feature in self.features
+
+    def _on_foreground_response(self, response, *args, **kwargs):
+        # Runs on whichever thread made the request; any HTTP answer means reachable
+        if response.url.startswith(self.server.server_url) and response.status_code < 500:
+            self._record(True)
+        return response
+
+    def _next_delay(self):
+        if self._failures == 0:
+            return max(self.IDLE_INTERVAL - (time.monotonic() - self._last_success), 0)
+        backoff = min(self.BASE_BACKOFF * 2 ** (self._failures - 1), self.MAX_BACKOFF)
+        return backoff * random.uniform(0.5, 1.0)
+
+    def _loop(self):
+        while self._running.is_set():
+            if self.paused:
+                self._wake.wait()
+            else:
+                self._wake.wait(self._next_delay())
+            self._wake.clear()
+            if not self._running.is_set() or self.paused:
+                continue
+            if self._failures == 0 and time.monotonic() - self._last_success < self.IDLE_INTERVAL:
+                # A foreground request proved the server reachable meanwhile
+                continue
+            self._record(self._check())
+
+    def _check(self):
+        try:
+            response = self.session.get(f"{self.server.server_url}/health", timeout=self.HEALTH_TIMEOUT)
+        except requests.RequestException as e:
+            Logger.info(f"ConnectionMonitor: health check failed: {e}")
+            return False
+        if response.status_code != 200:
+            return False
+        try:
+            features = response.json().get("features") or ()
+            self.features = frozenset(str(feature) for feature in features)
+        except (ValueError, AttributeError, TypeError):
+            # Older servers answer without a feature list
+            self.features = frozenset()
+        return True
+
+    def _record(self, reachable):
+        if reachable:
+            self._last_success = time.monotonic()
+            self._failures = 0
+        else:
+            self._failures += 1
+        state = "online" if reachable else "offline"
+        failures = self._failures
+        if state != self.state or failures != self.failures:
+            Clock.schedule_once(lambda dt: self._publish(state, failures), 0)
+
+    def _publish(self, state, failures):
+        self.failures = failures
+        self.state = state
@@ -11,6 +11,24 @@
 #"GetWalletCards" => PersonalDataManager::get_wallet_data(&request, app_state).await,
 # "News"=>NewsData::get_latest_news(app_state).await,
 
+import threading
+
+from kivy.app import App
+from kivy.logger import Logger
+
+from server_requests.transport import is_idempotent, post_idempotent, timeouts
+from server_requests.wallet_cache import WalletCache
+from server_requests.write_queue import WriteQueue
+
+# Detail message for each card title listed by GetWalletCards / GetWalletAuto
+CARD_MESSAGES = {
+    "identity_card": "GetIdenityCard",
+    "driving_license": "GetDrivingLicense",
+    "passport": "GetPassport",
+    "vehicle_registration": "GetVehicleRegistration",
+    "insurance_auto": "GetInsuranceAuto",
+}
+
 
 class DataRequester:
     _MOCK_WALLET_CARDS = [
@@ -37,9 +55,139 @@ class DataRequester:
         },
     ]
 
+    _cache_lock = threading.Lock()
+
     def __init__(self):
         pass
 
+    def wallet_cache(self):
+        """Encrypted local cache in the app data directory (None outside the app)."""
+        cache = getattr(self, "_wallet_cache", None)
+        if cache is None:
+            app = App.get_running_app()
+            if app is None:
+                return None
+            with DataRequester._cache_lock:
+                cache = getattr(self, "_wallet_cache", None)
+                if cache is None:
+                    try:
+                        cache = WalletCache(app.user_data_dir)
+                    except OSError as e:
+                        Logger.warning(f"DataRequester: wallet cache disabled: {e}")
+                        return None
+                    self._wallet_cache = cache
+        return cache
+
+    def write_queue(self):
+        """Encrypted outbox for Insert* writes (None outside the app)."""
+        queue = getattr(self, "_write_queue", None)
+        if queue is None:
+            app = App.get_running_app()
+            if app is None:
+                return None
+            with DataRequester._cache_lock:
+                queue = getattr(self, "_write_queue", None)
+                if queue is None:
+                    try:
+                        queue = WriteQueue(self, app.user_data_dir)
+                    except OSError as e:
+                        Logger.warning(f"DataRequester: write queue disabled: {e}")
+                        return None
+                    self._write_queue = queue
+        return queue
+
+    def queue_write(self, message_type, json_content):
+        """
+        Save a document locally and send it in the background.
+
+        Returns:
+            True when queued; False when there is no queue and the caller
+            has to send it itself.
+        """
+        queue = self.write_queue()
+        if queue is None:
+            return False
+        queue.put(self.user_id, message_type, json_content)
+        return True
+
+    def cached_data(self, message_type):
+        """Last stored response for message_type, without a network call."""
+        cache = self.wallet_cache()
+        return cache.get(self.user_id, message_type) if cache else None
+
+    def cached_age(self, message_type):
+        """Seconds since message_type was last fetched, None when not cached."""
+        cache = self.wallet_cache()
+        return cache.age(self.user_id, message_type) if cache else None
+
+    def _still_current(self, user_id, cancelled=None):
+        """Whether a response fetched for user_id may still be cached and shown."""
+        if cancelled is not None and cancelled.is_set():
+            return False
+        return user_id == self.user_id
+
+    @staticmethod
+    def card_detail_messages(list_response):
+        """Detail message types for the cards in a GetWalletCards/GetWalletAuto response."""
+        cards = ((list_response or {}).get('data') or {}).get('cards') or []
+        messages = []
+        for card in cards:
+            title = card.get('title') if isinstance(card, dict) else card
+            if title in CARD_MESSAGES:
+                messages.append(CARD_MESSAGES[title])
+        return messages
+
+    def get_batch_data(self, message_types, cancelled=None):
+        """
+        Fetch several read-only messages in a single round trip.
+
+        Args:
+            cancelled: Optional threading.Event; once set, the answer is
+                neither cached nor returned
+
+        Returns:
+            Dict message_type -> response, with None for failed entries (as
+            get_specific_data returns). Falls back to one request per message
+            when the server has no /api/batch endpoint.
+        """
+        message_types = list(dict.fromkeys(message_types))
+        results = {message_type: None for message_type in message_types}
+        if not message_types:
+            return results
+        # The user this request is for; it may log out before the answer arrives
+        user_id = self.user_id
+        try:
+            payload = {
+                "user_id": user_id,
+                "message_types": message_types,
+                "token": self.token
+            }
+            
+            # Read-only, so safe to resend after a dropped connection
+            response = post_idempotent(self.session, f"{self.server_url}/api/batch", payload, timeouts())
+            
+            if response.status_code == 404:
+                return {message_type: self.get_specific_data(message_type, cancelled)
+                        for message_type in message_types}
+            if response.status_code == 200:
+                if not self._still_current(user_id, cancelled):
+                    Logger.info("DataRequester: batch answered after logout or cancel, dropped")
+                    return results
+                cache = self.wallet_cache()
+                for item in response.json().get('responses', []):
+                    message_type = item.get('message_type')
+                    if message_type in results and item.get('success'):
+                        results[message_type] = item
+                        if cache:
+                            cache.put(user_id, message_type, item)
+                return results
+            else:
+                print(f"❌ Eroare: {response.status_code}")
+                return results
+        except Exception as e:
+            print(f"❌ Eroare: {str(e)}")
+            return results
+
     def _mock_wallet_cards(self, message_type: str):
         """Return a mocked wallet response to populate the UI without a backend."""
         return {
@@ -51,20 +199,24 @@ class DataRequester:
             },
         }
 
-    def get_specific_data(self, message_type):
+    def get_specific_data(self, message_type, cancelled=None):
+        user_id = self.user_id
         try:
             payload = {
                 "message_type": message_type,
-                "user_id": self.user_id, 
+                "user_id": user_id, 
                 "content": None,
                 "token": self.token
             }
             
-            response = self.session.post(
-                f"{self.server_url}/api/message", 
-                json=payload, 
-                timeout=5
-            )
+            if is_idempotent(message_type):
+                response = post_idempotent(self.session, f"{self.server_url}/api/message", payload, timeouts())
+            else:
+                response = self.session.post(
+                    f"{self.server_url}/api/message", 
+                    json=payload, 
+                    timeout=timeouts()
+                )
             
             if response.status_code == 200:
                 data = response.json()
@@ -72,6 +224,12 @@ class DataRequester:
                 if data['success'] is False:
                     return None
                 #print(data['data'])
+                if not self._still_current(user_id, cancelled):
+                    Logger.info(f"DataRequester: {message_type} answered after logout or cancel, dropped")
+                    return None
+                cache = self.wallet_cache()
+                if cache:
+                    cache.put(user_id, message_type, data)
                 return data
             else:
                 print(f"❌ Eroare: {response.status_code}")
@@ -80,10 +238,11 @@ class DataRequester:
             print(f"❌ Eroare: {str(e)}")
             return None
     def sent_specific_data(self, message_type, json_content):
+        user_id = self.user_id
         try:
             payload = {
                 "message_type": message_type,
-                "user_id": self.user_id, 
+                "user_id": user_id, 
                 "content": json_content,
                 "token": self.token
             }
@@ -91,12 +250,15 @@ class DataRequester:
             response = self.session.post(
                 f"{self.server_url}/api/message", 
                 json=payload, 
-                timeout=5
+                timeout=timeouts()
             )
             
             if response.status_code == 200:
                 data = response.json()
                 print(f"✅ {data['success']}")
+                cache = self.wallet_cache()
+                if cache and data.get('success'):
+                    cache.invalidate_for_write(user_id, message_type)
                 return data
             else:
                 print(f"❌ Eroare: {response.status_code}")
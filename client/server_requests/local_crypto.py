@@ -0,0 +1,249 @@
+"""
+Encryption at rest for the wallet cache and the outbox.
+
+Threat model: the data key (wallet.key in the app data directory) is kept
+wrapped by a platform keystore whenever one is available, so a copy of the
+app data alone (a backup, files pulled off the device, another app reading
+shared storage) does not reveal the cached documents:
+
+- Android: an AES key in the Android Keystore (hardware backed on most
+  devices, never leaves it) wraps the data key.
+- Desktop: with the keyring package installed, a wrapping key is kept in
+  the OS credential store (Keychain, Credential Manager, Secret Service).
+
+Code running as the app, or as root, can still ask the keystore to unwrap
+the key; that is out of scope. Without a keystore the data key is stored as
+a plain 0600 file next to the ciphertext. Then the encryption only detects
+tampering and keeps the documents out of casual file browsing; it is not
+confidential against anyone who can read the app data directory. A warning
+is logged in that case.
+"""
+import base64
+import hashlib
+import hmac
+import os
+import threading
+from pathlib import Path
+
+from kivy.logger import Logger
+from kivy.utils import platform
+
+try:
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+except ImportError:  # not packaged on every build target
+    AESGCM = None
+
+try:
+    import keyring
+except ImportError:  # not packaged on every build target
+    keyring = None
+
+
+KEY_SIZE = 32
+NONCE_SIZE = 12
+TAG_SIZE = 32
+
+FORMAT_AESGCM = b"\x01"
+FORMAT_HMAC_CTR = b"\x02"
+
+# wallet.key holding a wrapped key: magic, keystore id, wrapped blob
+WRAPPED_MAGIC = b"SWK"
+KEYSTORE_ANDROID = b"\x01"
+KEYSTORE_KEYRING = b"\x02"
+KEY_ALIAS = "smart_identity_wallet_data_key"
+KEYRING_SERVICE = "smart-identity-wallet"
+
+
+class LocalCipherError(ValueError):
+    """Raised when stored data cannot be decrypted (wrong key or tampering)."""
+
+
+class AndroidKeystore:
+    """Wraps the data key with a non-exportable AES-GCM key in the Android Keystore."""
+
+    store_id = KEYSTORE_ANDROID
+
+    def __init__(self):
+        from jnius import autoclass
+        self._cipher_class = autoclass("javax.crypto.Cipher")
+        self._gcm_spec = autoclass("javax.crypto.spec.GCMParameterSpec")
+        key_store = autoclass("java.security.KeyStore").getInstance("AndroidKeyStore")
+        key_store.load(None)
+        if not key_store.containsAlias(KEY_ALIAS):
+            properties = autoclass("android.security.keystore.KeyProperties")
+            builder = autoclass("android.security.keystore.KeyGenParameterSpec$Builder")(
+                KEY_ALIAS, properties.PURPOSE_ENCRYPT | properties.PURPOSE_DECRYPT)
+            spec = (builder.setBlockModes([properties.BLOCK_MODE_GCM])
+                    .setEncryptionPaddings([properties.ENCRYPTION_PADDING_NONE])
+                    .setKeySize(256)
+                    .build())
+            generator = autoclass("javax.crypto.KeyGenerator").getInstance(
+                properties.KEY_ALGORITHM_AES, "AndroidKeyStore")
+            generator.init(spec)
+            generator.generateKey()
+        self._key = key_store.getKey(KEY_ALIAS, None)
+
+    @staticmethod
+    def _bytes(java_array) -> bytes:
+        return bytes(b & 0xFF for b in java_array)
+
+    def wrap(self, data_key: bytes) -> bytes:
+        cipher = self._cipher_class.getInstance("AES/GCM/NoPadding")
+        # The keystore picks the IV itself
+        cipher.init(self._cipher_class.ENCRYPT_MODE, self._key)
+        return self._bytes(cipher.getIV()) + self._bytes(cipher.doFinal(data_key))
+
+    def unwrap(self, blob: bytes) -> bytes:
+        cipher = self._cipher_class.getInstance("AES/GCM/NoPadding")
+        cipher.init(self._cipher_class.DECRYPT_MODE, self._key, self._gcm_spec(128, blob[:NONCE_SIZE]))
+        return self._bytes(cipher.doFinal(blob[NONCE_SIZE:]))
+
+
+class KeyringKeystore:
+    """Wraps the data key with a key kept in the OS credential store (keyring package)."""
+
+    store_id = KEYSTORE_KEYRING
+
+    def __init__(self, path: Path):
+        account = str(path.resolve())
+        stored = keyring.get_password(KEYRING_SERVICE, account)
+        if stored is None:
+            stored = base64.b64encode(os.urandom(KEY_SIZE)).decode("ascii")
+            keyring.set_password(KEYRING_SERVICE, account, stored)
+        self._cipher = LocalCipher(base64.b64decode(stored))
+
+    def wrap(self, data_key: bytes) -> bytes:
+        return self._cipher.encrypt(data_key, b"wallet.key")
+
+    def unwrap(self, blob: bytes) -> bytes:
+        return self._cipher.decrypt(blob, b"wallet.key")
+
+
+def platform_keystore(path: Path):
+    """The keystore protecting the key at path, or None when there is none."""
+    try:
+        if platform == "android":
+            return AndroidKeystore()
+        if keyring is not None:
+            return KeyringKeystore(path)
+    except Exception as e:
+        # No usable backend (e.g. keyring without a credential store)
+        Logger.warning(f"LocalCipher: platform keystore unavailable: {e}")
+    return None
+
+
+def _write_key_file(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    fd = os.open(str(tmp), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    tmp.replace(path)
+
+
+_keys = {}
+_keys_lock = threading.Lock()
+
+
+def load_or_create_key(path) -> bytes:
+    """
+    Read the device data key from path, creating a random one the first time.
+
+    The key is stored wrapped by platform_keystore() when there is one; a
+    plain key left by an older version is wrapped on first use. Loaded keys
+    are kept per path, so the cache and the outbox share one.
+    """
+    path = Path(path)
+    with _keys_lock:
+        key = _keys.get(path)
+        if key is None:
+            key = _keys[path] = _load_or_create_key(path)
+        return key
+
+
+def _load_or_create_key(path: Path) -> bytes:
+    keystore = platform_keystore(path)
+    stored = path.read_bytes() if path.exists() else b""
+
+    if stored.startswith(WRAPPED_MAGIC):
+        store_id, blob = stored[len(WRAPPED_MAGIC):len(WRAPPED_MAGIC) + 1], stored[len(WRAPPED_MAGIC) + 1:]
+        if keystore is None or keystore.store_id != store_id:
+            Logger.error("LocalCipher: the keystore holding the data key is gone, starting over")
+        else:
+            try:
+                key = keystore.unwrap(blob)
+                if len(key) == KEY_SIZE:
+                    return key
+            except Exception as e:
+                Logger.error(f"LocalCipher: could not unwrap the data key, starting over: {e}")
+        key = os.urandom(KEY_SIZE)
+    elif len(stored) == KEY_SIZE:
+        key = stored
+    else:
+        key = os.urandom(KEY_SIZE)
+
+    if keystore is None:
+        Logger.warning("LocalCipher: no platform keystore, the data key is stored unprotected")
+        if key != stored:
+            _write_key_file(path, key)
+    else:
+        _write_key_file(path, WRAPPED_MAGIC + keystore.store_id + keystore.wrap(key))
+    return key
+
+
+class LocalCipher:
+    """
+    Authenticated encryption for data stored on the device.
+
+    Uses AES-GCM when the cryptography package is available. Otherwise falls
+    back to an HMAC-SHA256 keystream with an HMAC-SHA256 tag
+    (encrypt-then-MAC), which only needs the standard library. The format
+    byte in front of every blob records which one was used.
+    """
+
+    def __init__(self, key: bytes):
+        if len(key) != KEY_SIZE:
+            raise ValueError("Key must be 32 bytes")
+        self._key = key
+        self._enc_key = hmac.new(key, b"enc", hashlib.sha256).digest()
+        self._mac_key = hmac.new(key, b"mac", hashlib.sha256).digest()
+
+    def derive(self, label: str) -> "LocalCipher":
+        """Cipher with a sub-key bound to label (e.g. one key per user)."""
+        return LocalCipher(hmac.new(self._key, label.encode("utf-8"), hashlib.sha256).digest())
+
+    def _keystream(self, nonce: bytes, length: int) -> bytes:
+        blocks = []
+        for counter in range((length + 31) // 32):
+            blocks.append(hmac.new(self._enc_key, nonce + counter.to_bytes(8, "big"), hashlib.sha256).digest())
+        return b"".join(blocks)[:length]
+
+    def encrypt(self, plaintext: bytes, associated_data: bytes = b"") -> bytes:
+        nonce = os.urandom(NONCE_SIZE)
+        if AESGCM is not None:
+            return FORMAT_AESGCM + nonce + AESGCM(self._key).encrypt(nonce, plaintext, associated_data)
+
+        stream = self._keystream(nonce, len(plaintext))
+        ciphertext = bytes(a ^ b for a, b in zip(plaintext, stream))
+        tag = hmac.new(self._mac_key, associated_data + nonce + ciphertext, hashlib.sha256).digest()
+        return FORMAT_HMAC_CTR + nonce + ciphertext + tag
+
+    def decrypt(self, blob: bytes, associated_data: bytes = b"") -> bytes:
+        fmt, nonce, body = blob[:1], blob[1:1 + NONCE_SIZE], blob[1 + NONCE_SIZE:]
+        if fmt == FORMAT_AESGCM:
+            if AESGCM is None:
+                raise LocalCipherError("AES-GCM data but cryptography is not installed")
+            try:
+                return AESGCM(self._key).decrypt(nonce, body, associated_data)
+            except Exception as e:
+                raise LocalCipherError(f"Decryption failed: {e}")
+
+        if fmt == FORMAT_HMAC_CTR and len(body) >= TAG_SIZE:
+            ciphertext, tag = body[:-TAG_SIZE], body[-TAG_SIZE:]
+            expected = hmac.new(self._mac_key, associated_data + nonce + ciphertext, hashlib.sha256).digest()
+            if not hmac.compare_digest(tag, expected):
+                raise LocalCipherError("Decryption failed: bad tag")
+            stream = self._keystream(nonce, len(ciphertext))
+            return bytes(a ^ b for a, b in zip(ciphertext, stream))
+
+        raise LocalCipherError("Unknown data format")
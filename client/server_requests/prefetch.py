@@ -0,0 +1,84 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+
+from kivy.logger import Logger
+
+
+# Wallet indexes fetched together; their card details follow in a second batch
+WALLET_INDEX = ("GetWalletCards", "GetWalletAuto")
+
+
+def _lower_thread_priority():
+    """Best effort: make prefetch threads yield to the UI and foreground requests."""
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 10)
+    except (AttributeError, OSError):
+        # Not available on every platform (Windows); prefetch still works
+        pass
+
+
+class PrefetchScheduler:
+    """
+    Warms the wallet cache right after login.
+
+    The wallet index (plus the details of every card it lists), the news and
+    the user info are fetched in parallel on a small pool of low-priority
+    threads, separate from the I/O pool the screens use. The first visit to
+    each screen then renders from the cache. cancel() stops everything that
+    has not started yet; requests already in flight finish, but their
+    answers are neither cached nor reported.
+    """
+
+    WORKERS = 2
+
+    def __init__(self, server):
+        self.server = server
+        self._cancelled = threading.Event()
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.WORKERS,
+            thread_name_prefix="prefetch",
+            initializer=_lower_thread_priority,
+        )
+        self._futures = []
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def start(self):
+        jobs = (self._prefetch_wallet, self._prefetch_user_info, self._prefetch_news)
+        for job in jobs:
+            self._futures.append(self._pool.submit(self._run, job))
+        # Workers exit once the queued jobs are done
+        self._pool.shutdown(wait=False)
+        return self
+
+    def cancel(self):
+        self._cancelled.set()
+        for future in self._futures:
+            future.cancel()
+
+    def _run(self, job):
+        if self.cancelled:
+            return
+        try:
+            job()
+        except Exception as e:
+            Logger.warning(f"PrefetchScheduler: {job.__name__} failed: {e}")
+
+    def _prefetch_wallet(self):
+        results = self.server.get_batch_data(list(WALLET_INDEX), self._cancelled)
+        details = []
+        for message_type in WALLET_INDEX:
+            details.extend(self.server.card_detail_messages(results.get(message_type)))
+        if details and not self.cancelled:
+            self.server.get_batch_data(details, self._cancelled)
+        if not self.cancelled:
+            Logger.info(f"PrefetchScheduler: wallet ready ({len(details)} cards)")
+
+    def _prefetch_user_info(self):
+        self.server.get_specific_data("UserInfo", self._cancelled)
+
+    def _prefetch_news(self):
+        self.server.get_specific_data("News", self._cancelled)
@@ -0,0 +1,55 @@
+"""
+Device signing key for shared QR codes.
+
+Each install gets its own Ed25519 key pair. The private half stays on the
+device, encrypted with a sub-key of the device data key (so it is covered
+by the same keystore wrapping, see local_crypto); the public half is meant
+to be handed out, as the enrollment text of wallet_codec.public_key_text(),
+to whoever has to verify the codes. Without the cryptography package there
+is no key and the codes are shared unsigned.
+"""
+import threading
+from pathlib import Path
+
+from kivy.logger import Logger
+
+from server_requests.local_crypto import LocalCipher, LocalCipherError, load_or_create_key
+from wallet_codec.codec import Ed25519Signer, ed25519_available
+
+KEY_FILE = "qr_signing.key"
+_LABEL = "qr-signing"
+
+_signers = {}
+_signers_lock = threading.Lock()
+
+
+def device_qr_signer(directory):
+    """Ed25519Signer of this install (created the first time), or None without cryptography."""
+    if not ed25519_available():
+        return None
+    directory = Path(directory)
+    with _signers_lock:
+        signer = _signers.get(directory)
+        if signer is None:
+            signer = _signers[directory] = _load_or_create_signer(directory)
+        return signer
+
+
+def _load_or_create_signer(directory: Path) -> Ed25519Signer:
+    cipher = LocalCipher(load_or_create_key(directory / "wallet.key")).derive(_LABEL)
+    path = directory / KEY_FILE
+    if path.exists():
+        try:
+            return Ed25519Signer(cipher.decrypt(path.read_bytes(), _LABEL.encode()))
+        except (OSError, ValueError, LocalCipherError) as e:
+            # A new key only means verifiers have to enroll it again
+            Logger.error(f"QrSigning: could not read the signing key, creating a new one: {e}")
+
+    private_key = Ed25519Signer.generate_private_key()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(cipher.encrypt(private_key, _LABEL.encode()))
+    tmp.replace(path)
+    signer = Ed25519Signer(private_key)
+    Logger.info(f"QrSigning: created signing key {signer.key_id}")
+    return signer
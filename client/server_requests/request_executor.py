@@ -0,0 +1,136 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+from kivy.clock import Clock
+from kivy.logger import Logger
+
+
+def same_payload(response, other) -> bool:
+    """
+    Whether two server responses carry the same data. The envelope also has
+    a timestamp that differs on every reply, so only success and data count.
+    """
+    if not isinstance(response, dict) or not isinstance(other, dict):
+        return response == other
+    return (response.get("success"), response.get("data")) == (other.get("success"), other.get("data"))
+
+
+class RequestHandle:
+    """
+    Handle for a request running on the I/O pool.
+
+    Cancelling it drops the result: the callback is never called, even when
+    the HTTP call itself already finished.
+    """
+
+    def __init__(self):
+        self.future = None
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+        if self.future is not None:
+            self.future.cancel()
+
+    @property
+    def done(self):
+        # No future means the result was served from the cache
+        return self.future is None or self.future.done()
+
+
+class AsyncRequester:
+    """
+    Runs blocking requests on a small I/O thread pool and hands the result
+    back on the Kivy main thread, so screens never wait on the network.
+    """
+
+    IO_WORKERS = 4
+    # Cached responses younger than this are used without asking the server
+    FRESH_SECONDS = 30
+    _pool_lock = threading.Lock()
+
+    def __init__(self):
+        pass
+
+    def _io_pool(self):
+        # Created lazily: mixin __init__ methods are not called by ServerConnection.
+        pool = getattr(self, "_io_executor", None)
+        if pool is None:
+            with AsyncRequester._pool_lock:
+                pool = getattr(self, "_io_executor", None)
+                if pool is None:
+                    pool = ThreadPoolExecutor(max_workers=self.IO_WORKERS, thread_name_prefix="server-io")
+                    self._io_executor = pool
+        return pool
+
+    def submit_request(self, func, *args, callback=None, **kwargs):
+        """
+        Run func(*args, **kwargs) on the I/O pool.
+
+        Args:
+            func: Blocking request method (e.g. self.get_specific_data)
+            callback: Called on the main thread with the result; request
+                methods return None on error, so the callback gets None too
+
+        Returns:
+            RequestHandle that can cancel delivery of the result
+        """
+        handle = RequestHandle()
+
+        def deliver(result):
+            if not handle.cancelled and callback is not None:
+                callback(result)
+
+        def on_done(future):
+            if handle.cancelled or future.cancelled():
+                return
+            try:
+                result = future.result()
+            except Exception as e:
+                Logger.error(f"AsyncRequester: {getattr(func, '__name__', func)} failed: {e}")
+                result = None
+            Clock.schedule_once(lambda dt: deliver(result), 0)
+
+        handle.future = self._io_pool().submit(func, *args, **kwargs)
+        handle.future.add_done_callback(on_done)
+        return handle
+
+    def get_specific_data_async(self, message_type, callback, use_cache=True):
+        """
+        Non-blocking get_specific_data; callback(data) runs on the main thread.
+
+        With use_cache, a cached response is passed to callback immediately
+        and the server is asked in the background (stale-while-revalidate):
+        callback runs a second time only if the fresh data differs. When the
+        server cannot be reached the cached data stays on screen.
+        """
+        cached = self.cached_data(message_type) if use_cache else None
+        if cached is None:
+            return self.submit_request(self.get_specific_data, message_type, callback=callback)
+
+        callback(cached)
+        age = self.cached_age(message_type)
+        if age is not None and age < self.FRESH_SECONDS:
+            # Just fetched (e.g. by a batch prefetch); skip the round trip
+            return RequestHandle()
+
+        def revalidate(fresh):
+            if fresh is not None and not same_payload(fresh, cached):
+                callback(fresh)
+
+        return self.submit_request(self.get_specific_data, message_type, callback=revalidate)
+
+    def get_batch_data_async(self, message_types, callback=None):
+        """Non-blocking get_batch_data; callback(results) runs on the main thread."""
+        return self.submit_request(self.get_batch_data, message_types, callback=callback)
+
+    def sent_specific_data_async(self, message_type, json_content, callback=None):
+        """Non-blocking sent_specific_data; callback(response) runs on the main thread."""
+        return self.submit_request(self.sent_specific_data, message_type, json_content, callback=callback)
+
+    def shutdown_requests(self):
+        pool = getattr(self, "_io_executor", None)
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+            self._io_executor = None
+
@@ -1,27 +1,34 @@
 from kivy.uix.label import Label
 from kivy.properties import StringProperty
-from kivy.clock import Clock
-import requests
-import threading
 import urllib3
 
 
 from server_requests.data_requester import DataRequester
 from server_requests.auth_requester import AuthRequester
 from server_requests.ai_data_requester import AI_DataRequester
+from server_requests.request_executor import AsyncRequester
+from server_requests.prefetch import PrefetchScheduler
+from server_requests.connection_monitor import ConnectionMonitor
+from server_requests.transport import make_session, timeouts
 
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 
-class ServerConnection(Label,DataRequester,AuthRequester,AI_DataRequester):
+class ServerConnection(Label,DataRequester,AuthRequester,AI_DataRequester,AsyncRequester):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.session = requests.Session()
+        self.session = make_session(verify=False)
+        # Separate small pool for OCR and chat, so a long upload never holds
+        # up the connections wallet requests use; login headers are shared
+        self.ai_session = make_session(verify=False, pool_size=2)
+        self.ai_session.headers = self.session.headers
+        self.ai_session.hooks = self.session.hooks
         self.token=""
         self.user_id=""
         self.server_url="https://127.0.0.1:8443"
-        self.session.verify = False
+        self._prefetch = None
+        self.monitor = ConnectionMonitor(self)
     def set_server_url(self, url: str) -> "ServerConnection":
         """Update the base URL that subsequent requests should hit."""
         if not isinstance(url, str):
@@ -30,7 +37,7 @@ class ServerConnection(Label,DataRequester,AuthRequester,AI_DataRequester):
         return self
     def connect(self):
         try:
-            response = self.session.get(f"{self.server_url}/health", timeout=5)
+            response = self.session.get(f"{self.server_url}/health", timeout=timeouts(5))
             if response.status_code == 200:
                 data = response.json()
                 return True
@@ -40,30 +47,36 @@ class ServerConnection(Label,DataRequester,AuthRequester,AI_DataRequester):
         except Exception as e:
             self.last_message = f"❌ Eroare conexiune: {str(e)}"
             return None
+    def connect_async(self, callback):
+        """Non-blocking connect; callback(True or None) runs on the main thread."""
+        return self.submit_request(self.connect, callback=callback)
+    def start_prefetch(self):
+        """Warm the cache in the background after a successful login."""
+        self.cancel_prefetch()
+        self._prefetch = PrefetchScheduler(self).start()
+    def cancel_prefetch(self):
+        if self._prefetch is not None:
+            self._prefetch.cancel()
+            self._prefetch = None
     def clear_data(self):
+        self.cancel_prefetch()
+        # Decrypted wallet data must not outlive the session in memory
+        cache = getattr(self, "_wallet_cache", None)
+        if cache is not None:
+            cache.forget_memory()
+        queue = getattr(self, "_write_queue", None)
+        if queue is not None:
+            queue.forget_memory()
+        self.session.headers.pop('Authorization', None)
         self.token=""
         self.user_id=""
-    def start_periodic_check(self, interval=5):
-        def check_server():
-            while True:
-                try:
-                    response = self.session.get(f"{self.server_url}/health", timeout=2)
-                    if response.status_code == 200:
-                        data = response.json()
-                        Clock.schedule_once(
-                            lambda dt: self.update_message(f"🟢 Server OK - {data['timestamp']}")
-                        )
-                    else:
-                        Clock.schedule_once(
-                            lambda dt: self.update_message("🔴 Server nu răspunde")
-                        )
-                except:
-                    Clock.schedule_once(
-                        lambda dt: self.update_message("🔴 Conexiune pierdută")
-                    )
-                threading.Event().wait(interval)
-        threading.Thread(target=check_server, daemon=True).start()
+    def start_periodic_check(self):
+        """Start watching the connection; observe self.monitor.state for changes."""
+        return self.monitor.start()
 
     def close(self):
+        self.monitor.stop()
+        self.shutdown_requests()
         if self.session:
             self.session.close()
+        self.ai_session.close()
@@ -0,0 +1,258 @@
+import os
+import ssl
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+try:
+    import httpx
+    import h2  # noqa: F401  (httpx needs it for HTTP/2)
+except ImportError:  # optional, HTTP/1.1 keep-alive is used without it
+    httpx = None
+
+
+# Enough keep-alive connections for the I/O pool plus prefetch and the UI
+POOL_SIZE = 8
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 10
+# OCR and the chat bot wait for the AI service
+AI_READ_TIMEOUT = 120
+# Extra attempts for read-only messages that failed after being sent
+IDEMPOTENT_RETRIES = 2
+
+
+def timeouts(read=READ_TIMEOUT):
+    """(connect, read) timeout: fail fast on a dead network, wait for slow answers."""
+    return (CONNECT_TIMEOUT, read)
+
+
+def is_idempotent(message_type):
+    """Messages that only read data and can safely be sent twice."""
+    return message_type.startswith("Get") or message_type in ("UserInfo", "News")
+
+
+def post_idempotent(session, url, payload, timeout, retries=IDEMPOTENT_RETRIES):
+    """
+    POST a read-only message, retrying on timeouts and dropped connections.
+
+    Connection failures before the request is sent are already retried by
+    the adapter for every message; this also covers failures after the
+    request went out, which is only safe for reads.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return session.post(url, json=payload, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == retries:
+                raise
+            time.sleep(0.2 * 2 ** attempt)
+
+
+class _ResumableSocket(ssl.SSLSocket):
+    session_saved = False
+
+    def recv_into(self, buffer, nbytes=None, flags=0):
+        received = super().recv_into(buffer, nbytes, flags)
+        # TLS 1.3 tickets arrive after the handshake, ahead of the first response
+        if not self.session_saved and isinstance(self.context, ResumingSSLContext):
+            self.session_saved = self.context.save_session(self)
+        return received
+
+
+class ResumingSSLContext(ssl.SSLContext):
+    """
+    Client SSLContext that resumes TLS sessions.
+
+    Each new connection offers the last session saved for its host and
+    port, so reconnecting after an idle close (or opening more connections
+    than the pool keeps) is an abbreviated handshake when the server still
+    knows the session. Sessions are saved once resumable: after the
+    handshake (TLS 1.2) or after the first read (TLS 1.3). Hostnames are left to urllib3 to match
+    (check_hostname is off), which also lets verify=False work on the
+    shared context.
+    """
+
+    sslsocket_class = _ResumableSocket
+
+    def __new__(cls, protocol=ssl.PROTOCOL_TLS_CLIENT, *args, **kwargs):
+        return super().__new__(cls, protocol, *args, **kwargs)
+
+    def __init__(self, protocol=ssl.PROTOCOL_TLS_CLIENT):
+        super().__init__()
+        self._sessions = {}
+        self._sessions_lock = threading.Lock()
+        self.resumed = 0
+        self.check_hostname = False
+        self.minimum_version = ssl.TLSVersion.TLSv1_2
+        # Same defaults as urllib3's own context, but with TLS 1.2 tickets
+        self.options |= ssl.OP_NO_COMPRESSION
+        self.hostname_checks_common_name = False
+        self.load_default_certs()
+
+    @staticmethod
+    def _session_key(sock, server_hostname):
+        try:
+            return server_hostname, sock.getpeername()[1]
+        except (OSError, IndexError):
+            return None
+
+    def wrap_socket(self, sock, server_side=False, do_handshake_on_connect=True,
+                    suppress_ragged_eofs=True, server_hostname=None, session=None):
+        key = None if server_side else self._session_key(sock, server_hostname)
+        if session is None and key is not None:
+            with self._sessions_lock:
+                session = self._sessions.get(key)
+        ssl_sock = super().wrap_socket(
+            sock, server_side, do_handshake_on_connect, suppress_ragged_eofs, server_hostname, session,
+        )
+        ssl_sock.resume_key = key
+        if ssl_sock.session_reused:
+            self.resumed += 1
+        if do_handshake_on_connect:
+            ssl_sock.session_saved = self.save_session(ssl_sock)
+        return ssl_sock
+
+    def save_session(self, ssl_sock) -> bool:
+        """Keep ssl_sock's session for its host; False while it is not resumable yet."""
+        key = getattr(ssl_sock, "resume_key", None)
+        if key is None:
+            return True
+        try:
+            session = ssl_sock.session
+            # A TLS 1.3 session is only resumable once its ticket has arrived
+            resumable = session is not None and (session.has_ticket or ssl_sock.version() != "TLSv1.3")
+        except (OSError, ValueError):
+            return True
+        if resumable:
+            with self._sessions_lock:
+                self._sessions[key] = session
+        return resumable
+
+
+class ResumingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose HTTPS connections share one ResumingSSLContext."""
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        self.ssl_context = pool_kwargs.setdefault("ssl_context", ResumingSSLContext())
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+
+
+def _adapter(pool_size):
+    # Connect errors are retried for any method: nothing reached the server yet
+    retry = Retry(total=2, connect=2, read=0, status=0, redirect=0, backoff_factor=0.2)
+    return ResumingHTTPAdapter(pool_connections=2, pool_maxsize=pool_size, max_retries=retry)
+
+
+def make_session(verify=False, pool_size=POOL_SIZE, http2=None):
+    """
+    Session for talking to the wallet server.
+
+    HTTP/1.1 keep-alive with an explicit pool size, so parallel requests reuse
+    open TLS connections instead of handshaking again, and new connections
+    (after an idle close or beyond the pool) resume the last TLS session
+    (ResumingSSLContext). With http2 (or SMARTID_HTTP2=1) and httpx[http2]
+    installed, all requests share one multiplexed HTTP/2 connection
+    instead; httpx does not resume sessions.
+    """
+    if http2 is None:
+        http2 = os.environ.get("SMARTID_HTTP2") == "1"
+    if http2 and httpx is not None:
+        return Http2Session(verify=verify)
+
+    session = requests.Session()
+    session.verify = verify
+    adapter = _adapter(pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class Http2Response:
+    """The parts of requests.Response the request mixins use."""
+
+    def __init__(self, response):
+        self._response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.url = str(response.url)
+        self.content = response.content
+        self.text = response.text
+
+    def json(self):
+        return self._response.json()
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} for url: {self.url}", response=self)
+
+
+class Http2Session:
+    """
+    requests.Session look-alike backed by an httpx HTTP/2 client.
+
+    Supports what ServerConnection uses (get/post/put, headers, hooks,
+    verify, close) and raises requests exceptions, so the request mixins
+    work unchanged on either transport.
+    """
+
+    def __init__(self, verify=False):
+        self.headers = CaseInsensitiveDict()
+        self.hooks = {"response": []}
+        self._verify = verify
+        self._client = None
+
+    @property
+    def verify(self):
+        return self._verify
+
+    @verify.setter
+    def verify(self, value):
+        self._verify = value
+        self.close()
+
+    def _http_client(self):
+        if self._client is None:
+            limits = httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE)
+            self._client = httpx.Client(http2=True, verify=self._verify, limits=limits)
+        return self._client
+
+    @staticmethod
+    def _timeout(timeout):
+        if isinstance(timeout, tuple):
+            return httpx.Timeout(timeout[1], connect=timeout[0])
+        return httpx.Timeout(timeout)
+
+    def request(self, method, url, params=None, data=None, json=None, headers=None, timeout=None):
+        merged = dict(self.headers)
+        merged.update(headers or {})
+        try:
+            response = self._http_client().request(
+                method, url, params=params, content=data, json=json,
+                headers=merged, timeout=self._timeout(timeout or timeouts()),
+            )
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(str(e))
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(str(e))
+        response = Http2Response(response)
+        for hook in self.hooks["response"]:
+            hook(response)
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def close(self):
+        if self._client is not None:
+            self._client.close()
+            self._client = None
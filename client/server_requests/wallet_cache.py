@@ -0,0 +1,127 @@
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+
+from kivy.logger import Logger
+
+from server_requests.local_crypto import LocalCipher, LocalCipherError, load_or_create_key
+
+
+# Read-only message types whose responses are kept on the device
+CACHEABLE_MESSAGES = (
+    "GetWalletCards",
+    "GetWalletAuto",
+    "GetIdenityCard",
+    "GetDrivingLicense",
+    "GetPassport",
+    "GetVehicleRegistration",
+    "GetInsuranceAuto",
+    "UserInfo",
+    "News",
+)
+
+# Cached responses made stale by a successful write
+INVALIDATED_BY = {
+    "InsertIdenityCard": ("GetIdenityCard", "GetWalletCards"),
+    "InsertDrivingLicense": ("GetDrivingLicense", "GetWalletCards"),
+    "InsertPassport": ("GetPassport", "GetWalletCards"),
+    "InsertVehicleRegistration": ("GetVehicleRegistration", "GetWalletAuto"),
+    "InsertInsuranceAuto": ("GetInsuranceAuto", "GetWalletAuto"),
+}
+
+
+class WalletCache:
+    """
+    Encrypted on-device copy of the wallet responses.
+
+    Entries are keyed by (user, message_type), encrypted with a per-user key
+    derived from the device data key, and mirrored in memory so repeated
+    reads do not touch the disk. How well the data key itself is protected
+    depends on the platform keystore; see local_crypto.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self._device_cipher = LocalCipher(load_or_create_key(self.directory / "wallet.key"))
+        self._ciphers = {}
+        self._memory = {}
+        self._lock = threading.Lock()
+
+    def _cipher(self, user_id):
+        cipher = self._ciphers.get(user_id)
+        if cipher is None:
+            cipher = self._ciphers[user_id] = self._device_cipher.derive(f"user:{user_id}")
+        return cipher
+
+    def _path(self, user_id, message_type):
+        name = hashlib.sha256(f"{user_id}\0{message_type}".encode("utf-8")).hexdigest()[:32]
+        return self.directory / "wallet_cache" / f"{name}.bin"
+
+    def _entry(self, user_id, message_type):
+        if not user_id or message_type not in CACHEABLE_MESSAGES:
+            return None
+        key = (user_id, message_type)
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                entry = self._read(user_id, message_type)
+                if entry is not None:
+                    self._memory[key] = entry
+        return entry
+
+    def get(self, user_id, message_type):
+        """Cached response, or None when there is no (readable) entry."""
+        entry = self._entry(user_id, message_type)
+        return entry["response"] if entry else None
+
+    def age(self, user_id, message_type):
+        """Seconds since the entry was stored, or None when there is none."""
+        entry = self._entry(user_id, message_type)
+        return time.time() - entry["stored_at"] if entry else None
+
+    def _read(self, user_id, message_type):
+        path = self._path(user_id, message_type)
+        if not path.exists():
+            return None
+        try:
+            plaintext = self._cipher(user_id).decrypt(path.read_bytes(), message_type.encode("utf-8"))
+            return json.loads(plaintext.decode("utf-8"))
+        except (OSError, ValueError, LocalCipherError) as e:
+            Logger.warning(f"WalletCache: dropping unreadable entry for {message_type}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+    def put(self, user_id, message_type, response):
+        if not user_id or message_type not in CACHEABLE_MESSAGES:
+            return
+        entry = {"stored_at": time.time(), "response": response}
+        blob = self._cipher(user_id).encrypt(
+            json.dumps(entry).encode("utf-8"), message_type.encode("utf-8"))
+        path = self._path(user_id, message_type)
+        with self._lock:
+            self._memory[(user_id, message_type)] = entry
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(".tmp")
+                tmp.write_bytes(blob)
+                tmp.replace(path)
+            except OSError as e:
+                Logger.warning(f"WalletCache: could not persist {message_type}: {e}")
+
+    def invalidate_for_write(self, user_id, write_message_type):
+        """Drop the entries a successful Insert* makes stale."""
+        for message_type in INVALIDATED_BY.get(write_message_type, ()):
+            self.invalidate(user_id, message_type)
+
+    def invalidate(self, user_id, message_type):
+        with self._lock:
+            self._memory.pop((user_id, message_type), None)
+            self._path(user_id, message_type).unlink(missing_ok=True)
+
+    def forget_memory(self):
+        """Clear the in-memory copy (on logout); encrypted files stay for offline use."""
+        with self._lock:
+            self._memory.clear()
+            self._ciphers.clear()
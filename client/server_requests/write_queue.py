@@ -0,0 +1,239 @@
+import hashlib
+import json
+import random
+import threading
+import time
+from pathlib import Path
+
+from kivy.clock import Clock
+from kivy.event import EventDispatcher
+from kivy.logger import Logger
+from kivy.properties import NumericProperty
+
+from server_requests.local_crypto import LocalCipher, LocalCipherError, load_or_create_key
+
+
+class WriteQueue(EventDispatcher):
+    """
+    Encrypted outbox for Insert* writes, sent by a background worker.
+
+    Saving only stores the document locally, so it is instant and survives
+    network errors and restarts. Writes are keyed by (user, message_type):
+    saving the same document type again replaces the queued copy, so only
+    the latest version is sent. Failed sends back off exponentially (with
+    jitter); the queue is flushed again as soon as the connection monitor
+    reports the server online or the user logs in.
+
+    A write the server answers with success False is not dropped: it stays
+    on the device marked as failed, is not sent again on its own and waits
+    for the user to retry or discard it (or to save that document again).
+
+    pending is the number of writes of the logged in user still to be sent,
+    failed the number the server rejected.
+    """
+
+    pending = NumericProperty(0)
+    failed = NumericProperty(0)
+
+    BASE_BACKOFF = 2.0
+    MAX_BACKOFF = 300.0
+
+    def __init__(self, server, directory):
+        super().__init__()
+        self.server = server
+        self.directory = Path(directory) / "outbox"
+        self._device_cipher = LocalCipher(load_or_create_key(Path(directory) / "wallet.key"))
+        self._entries = {}
+        self._loaded_users = set()
+        self._failures = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        server.monitor.bind(state=self._on_connection_state)
+
+    def _user_dir(self, user_id):
+        return self.directory / hashlib.sha256(f"user:{user_id}".encode("utf-8")).hexdigest()[:32]
+
+    def _path(self, user_id, message_type):
+        name = hashlib.sha256(message_type.encode("utf-8")).hexdigest()[:32]
+        return self._user_dir(user_id) / f"{name}.bin"
+
+    def _cipher(self, user_id):
+        return self._device_cipher.derive(f"outbox:{user_id}")
+
+    def _load(self, user_id):
+        """Read the user's queued writes from disk once. Caller holds the lock."""
+        if user_id in self._loaded_users:
+            return
+        self._loaded_users.add(user_id)
+        user_dir = self._user_dir(user_id)
+        if not user_dir.exists():
+            return
+        cipher = self._cipher(user_id)
+        for path in user_dir.glob("*.bin"):
+            try:
+                entry = json.loads(cipher.decrypt(path.read_bytes(), b"outbox").decode("utf-8"))
+            except (OSError, ValueError, LocalCipherError) as e:
+                Logger.warning(f"WriteQueue: dropping unreadable entry {path.name}: {e}")
+                path.unlink(missing_ok=True)
+                continue
+            self._entries[(user_id, entry["message_type"])] = entry
+
+    def put(self, user_id, message_type, content):
+        """Queue a write, replacing an unsent one of the same type."""
+        with self._lock:
+            self._load(user_id)
+            previous = self._entries.get((user_id, message_type))
+            entry = {
+                "message_type": message_type,
+                "content": content,
+                "queued_at": time.time(),
+                "version": previous["version"] + 1 if previous else 1,
+            }
+            self._entries[(user_id, message_type)] = entry
+            self._persist(user_id, entry)
+        if previous:
+            Logger.info(f"WriteQueue: {message_type} replaces an unsent copy")
+        self._publish_pending()
+        self.flush_now()
+
+    def _persist(self, user_id, entry):
+        """Write an entry to disk. Caller holds the lock."""
+        message_type = entry["message_type"]
+        try:
+            path = self._path(user_id, message_type)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(self._cipher(user_id).encrypt(json.dumps(entry).encode("utf-8"), b"outbox"))
+            tmp.replace(path)
+        except OSError as e:
+            # Still sent from memory; only a restart before that would lose it
+            Logger.warning(f"WriteQueue: could not persist {message_type}: {e}")
+
+    def failed_writes(self):
+        """The logged in user's rejected writes: dicts with message_type, error and queued_at."""
+        user_id = self.server.user_id
+        with self._lock:
+            self._load(user_id)
+            return sorted(
+                (dict(entry) for (owner, _), entry in self._entries.items()
+                 if owner == user_id and entry.get("failed")),
+                key=lambda entry: entry["queued_at"],
+            )
+
+    def retry_failed(self):
+        """Send the rejected writes again (e.g. after the user fixed the cause)."""
+        user_id = self.server.user_id
+        with self._lock:
+            for (owner, _), entry in self._entries.items():
+                if owner == user_id and entry.pop("failed", None):
+                    self._persist(user_id, entry)
+        self._publish_pending()
+        self.flush_now()
+
+    def discard_failed(self):
+        """Delete the rejected writes for good."""
+        user_id = self.server.user_id
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if key[0] == user_id and entry.get("failed"):
+                    del self._entries[key]
+                    self._path(user_id, entry["message_type"]).unlink(missing_ok=True)
+        self._publish_pending()
+
+    def flush_now(self):
+        """Try to send everything now (resets the backoff)."""
+        self._failures = 0
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._loop, name="write-queue", daemon=True)
+            self._thread.start()
+        self._wake.set()
+
+    def forget_memory(self):
+        """Drop decrypted entries on logout; the encrypted files stay queued."""
+        with self._lock:
+            self._entries.clear()
+            self._loaded_users.clear()
+        self._publish_pending()
+
+    def _on_connection_state(self, monitor, state):
+        if state == "online" and self.pending:
+            self.flush_now()
+
+    def _queued(self, user_id):
+        with self._lock:
+            self._load(user_id)
+            entries = [dict(entry) for (owner, _), entry in self._entries.items()
+                       if owner == user_id and not entry.get("failed")]
+        return sorted(entries, key=lambda entry: entry["queued_at"])
+
+    def _remove(self, user_id, entry):
+        key = (user_id, entry["message_type"])
+        with self._lock:
+            current = self._entries.get(key)
+            if current is None or current["version"] != entry["version"]:
+                # Saved again while this copy was on its way; send the new one too
+                return
+            del self._entries[key]
+            self._path(user_id, entry["message_type"]).unlink(missing_ok=True)
+
+    def _mark_failed(self, user_id, entry, error):
+        key = (user_id, entry["message_type"])
+        with self._lock:
+            current = self._entries.get(key)
+            if current is None or current["version"] != entry["version"]:
+                # Saved again meanwhile; the new copy is sent on its own
+                return
+            current["failed"] = error
+            self._persist(user_id, current)
+
+    def _next_delay(self):
+        if not self._failures:
+            return None
+        backoff = min(self.BASE_BACKOFF * 2 ** (self._failures - 1), self.MAX_BACKOFF)
+        return backoff * random.uniform(0.5, 1.0)
+
+    def _loop(self):
+        while True:
+            self._wake.wait(self._next_delay())
+            self._wake.clear()
+            try:
+                self._flush()
+            except Exception as e:
+                Logger.error(f"WriteQueue: flush failed: {e}")
+                self._failures += 1
+            self._publish_pending()
+
+    def _flush(self):
+        user_id = self.server.user_id
+        if not user_id or not self.server.token:
+            return
+        for entry in self._queued(user_id):
+            response = self.server.sent_specific_data(entry["message_type"], entry["content"])
+            if user_id != self.server.user_id:
+                # Logged out (or switched user) meanwhile
+                return
+            if response is None:
+                # Network or server error: keep it queued and back off
+                self._failures += 1
+                Logger.warning(f"WriteQueue: {entry['message_type']} not sent, retrying later")
+                return
+            self._failures = 0
+            if response.get("success"):
+                self._remove(user_id, entry)
+            else:
+                Logger.error(f"WriteQueue: server rejected {entry['message_type']}: {response}")
+                error = response.get("error") or response.get("message") or "rejected by the server"
+                self._mark_failed(user_id, entry, str(error))
+
+    def _publish_pending(self):
+        user_id = self.server.user_id
+        with self._lock:
+            entries = [entry for (owner, _), entry in self._entries.items() if owner == user_id]
+        failed = sum(1 for entry in entries if entry.get("failed"))
+        pending = len(entries) - failed
+
+        def publish(dt):
+            self.pending = pending
+            self.failed = failed
+        Clock.schedule_once(publish, 0)
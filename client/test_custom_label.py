@@ -0,0 +1,48 @@
+"""
+Font fitting of ScalableLabel (frontend/screens/widgets/custom_label.py).
+Needs Kivy with a text provider; no window is opened.
+
+    python -m pytest test_custom_label.py
+"""
+import os
+
+import pytest
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+pytest.importorskip("kivy")
+
+from frontend.screens.widgets.custom_label import ScalableLabel, _measure, fit_font_size  # noqa: E402
+
+WIDTH = 200
+
+
+def make_label(text, markup=False, enforce_single_line=False):
+    return ScalableLabel(
+        text=text,
+        markup=markup,
+        max_font_size_sp=40,
+        min_font_size_sp=4,
+        enforce_single_line=enforce_single_line,
+    )
+
+
+def test_short_title_keeps_max_size():
+    assert fit_font_size(make_label("Carte de identitate"), WIDTH) == 40
+
+
+@pytest.mark.parametrize("markup", [False, True])
+def test_long_word_shrinks_until_it_fits(markup):
+    word = "Supercalifragilisticexpialidocious"
+    label = make_label(f"[b]{word}[/b]" if markup else word, markup=markup)
+    size = fit_font_size(label, WIDTH)
+    assert 4 < size < 40
+    assert _measure(label, size, label.text)[0] <= WIDTH
+    assert _measure(label, size + 1, label.text)[0] > WIDTH
+
+
+def test_single_line_shrinks_wrapping_text():
+    text = "Certificat de inmatriculare vehicul"
+    wrapped = fit_font_size(make_label(text), WIDTH)
+    single = fit_font_size(make_label(text, enforce_single_line=True), WIDTH)
+    assert single < wrapped
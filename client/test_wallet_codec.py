@@ -0,0 +1,115 @@
+"""
+Round-trip, tamper and expiry checks for the wallet QR payload (wallet_codec).
+
+    python -m pytest test_wallet_codec.py
+"""
+import pytest
+
+from wallet_codec import cbor
+from wallet_codec.base45 import b45decode, b45encode
+from wallet_codec.codec import (
+    PREFIX, Ed25519Signer, HmacSigner, QrVerifier, WalletCodecError, decode_document,
+    ed25519_available, encode_document, parse_public_key_text,
+)
+
+KEY = bytes(range(32))
+FIELDS = {
+    "nume": "POPESCU",
+    "prenume": "ANA-MARIA",
+    "data_nasterii": "1990-04-12",
+    "cnp": "2900412123456",
+    "extra": {"nested": [1, 2.5, None, True]},
+}
+ISSUED_AT = 1_700_000_000
+
+needs_ed25519 = pytest.mark.skipif(not ed25519_available(), reason="cryptography not installed")
+
+
+def hmac_payload(**kwargs):
+    return encode_document("identity_card", FIELDS, HmacSigner(KEY), issued_at=ISSUED_AT, **kwargs)
+
+
+def flip_byte(text, index):
+    data = bytearray(b45decode(text[len(PREFIX):]))
+    data[index] ^= 0x01
+    return PREFIX + b45encode(bytes(data))
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_round_trip(compress):
+    document = decode_document(hmac_payload(compress=compress), hmac_keys={0: KEY})
+    assert document.doc_type == "identity_card"
+    assert document.fields == FIELDS
+    assert document.issued_at == ISSUED_AT
+
+
+def test_empty_values_are_left_out():
+    text = encode_document("other", {"nume": "A", "adresa": "", "cnp": None}, HmacSigner(KEY))
+    assert decode_document(text, hmac_keys={0: KEY}).fields == {"nume": "A"}
+
+
+@pytest.mark.parametrize("index", [0, 3, 8, -1])
+def test_tampered_payload_is_rejected(index):
+    with pytest.raises(WalletCodecError):
+        decode_document(flip_byte(hmac_payload(), index), hmac_keys={0: KEY})
+
+
+def test_wrong_key_is_rejected():
+    with pytest.raises(WalletCodecError):
+        decode_document(hmac_payload(), hmac_keys={0: bytes(32)})
+    with pytest.raises(WalletCodecError, match="unknown key"):
+        decode_document(hmac_payload(), hmac_keys={1: KEY})
+
+
+def test_foreign_text_is_rejected():
+    for text in ("", "hello", "SW1:", "SW1:!!", PREFIX + b45encode(b"\x10\x01")):
+        with pytest.raises(WalletCodecError):
+            decode_document(text, hmac_keys={0: KEY})
+
+
+def test_expiry():
+    verifier = QrVerifier(hmac_keys={0: KEY}, max_age=600)
+    text = hmac_payload()
+    assert verifier.verify(text, now=ISSUED_AT + 599).fields == FIELDS
+    with pytest.raises(WalletCodecError, match="expired"):
+        verifier.verify(text, now=ISSUED_AT + 601)
+    # Issued in the future beyond the allowed clock skew
+    with pytest.raises(WalletCodecError, match="expired"):
+        verifier.verify(text, now=ISSUED_AT - 3600)
+
+
+def test_unsigned_payload_needs_opt_in():
+    text = encode_document("identity_card", FIELDS, None)
+    with pytest.raises(WalletCodecError, match="unsigned"):
+        decode_document(text)
+    assert decode_document(text, allow_unsigned=True).fields == FIELDS
+
+
+@pytest.mark.parametrize("body", [
+    b"\x81" * 5000 + b"\x00",  # nested deeper than the recursion limit
+    b"\xa1\x80\x00",  # map with an array as key
+    b"\x9b" + b"\xff" * 8,  # array claiming 2**64 items
+    b"\x63ab",  # truncated text
+])
+def test_malformed_body_raises_codec_error(body):
+    with pytest.raises(ValueError):
+        cbor.loads(body)
+    header = bytes((0x10, 1, 0)) + ISSUED_AT.to_bytes(4, "big")
+    with pytest.raises(WalletCodecError):
+        decode_document(PREFIX + b45encode(header + body), allow_unsigned=True)
+
+
+@needs_ed25519
+def test_ed25519_round_trip_with_enrolled_key():
+    signer = Ed25519Signer(Ed25519Signer.generate_private_key())
+    text = encode_document("driving_license", FIELDS, signer)
+
+    verifier = QrVerifier()
+    verifier.add_ed25519_key(*parse_public_key_text(signer.public_key_text()))
+    assert verifier.verify(text).fields == FIELDS
+
+    with pytest.raises(WalletCodecError):
+        verifier.verify(flip_byte(text, 8))
+    other = Ed25519Signer(Ed25519Signer.generate_private_key(), key_id=signer.key_id)
+    with pytest.raises(WalletCodecError, match="bad signature"):
+        verifier.verify(encode_document("driving_license", FIELDS, other))
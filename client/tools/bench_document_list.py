@@ -0,0 +1,111 @@
+"""
+Update cost of DocumentListMixin with hundreds of documents.
+
+Builds a document screen headless (SDL2 offscreen video driver) and
+times typical updates twice: with the keyed reconciliation, and with
+every card rebuilt (what the list did before). Reported per scenario:
+milliseconds and the number of cards created.
+
+    python tools/bench_document_list.py --documents 300 --repeat 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "offscreen")
+os.environ.setdefault("KIVY_WINDOW", "sdl2")
+os.environ["KIVY_NO_ARGS"] = "1"
+os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+
+from kivy.uix.screenmanager import Screen  # noqa: E402
+
+from frontend.screens.widgets.document_list import DocumentListMixin  # noqa: E402
+
+
+class BenchDocumentList(DocumentListMixin, Screen):
+    def __init__(self, full_rebuild=False, **kwargs):
+        # Alignment.__init__ does not chain up, so call Screen's directly
+        Screen.__init__(self, **kwargs)
+        self.full_rebuild = full_rebuild
+        self.cards_created = 0
+        self.setup_document_screen()
+
+    def _create_document_card(self, doc):
+        self.cards_created += 1
+        return super()._create_document_card(doc)
+
+    def _refresh_documents(self):
+        if getattr(self, "full_rebuild", False):
+            # Forget every card, as the clear-and-rebuild refresh did
+            self._doc_entries = {}
+            self._card_pool = []
+            self.cards_container.clear_widgets()
+        super()._refresh_documents()
+
+
+def make_documents(count, version=0):
+    return [
+        {"id": i, "title": f"Document {i}", "expiration_date": f"20{30 + (i + version) % 10}-01-25"}
+        for i in range(count)
+    ]
+
+
+def scenarios(count):
+    base = make_documents(count)
+    changed = list(base)
+    changed[count // 2] = dict(changed[count // 2], expiration_date="2099-12-31")
+    appended = base + [{"id": count, "title": f"Document {count}"}]
+    removed = base[: count // 2] + base[count // 2 + 1:]
+    return [
+        ("same documents again", base),
+        ("one document changed", changed),
+        ("one document appended", appended),
+        ("one document removed", removed),
+        ("order reversed", list(reversed(base))),
+        ("half removed", base[: count // 2]),
+        ("half added back", base),
+    ]
+
+
+def run(full_rebuild, count, repeat):
+    results = {}
+    for _ in range(repeat):
+        screen = BenchDocumentList(full_rebuild=full_rebuild)
+        start = time.perf_counter()
+        screen.set_documents(make_documents(count))
+        results.setdefault("initial", []).append(((time.perf_counter() - start) * 1000, screen.cards_created))
+        for name, documents in scenarios(count):
+            # The initial list before every step, so each step is measured on its own
+            screen.set_documents(make_documents(count))
+            screen.cards_created = 0
+            start = time.perf_counter()
+            screen.set_documents(documents)
+            results.setdefault(name, []).append(((time.perf_counter() - start) * 1000, screen.cards_created))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Update cost of DocumentListMixin")
+    parser.add_argument("--documents", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    keyed = run(False, args.documents, args.repeat)
+    rebuild = run(True, args.documents, args.repeat)
+    print(f"{args.documents} documents, median of {args.repeat}")
+    print(f"{'':24} {'keyed ms':>10} {'cards':>6} {'rebuild ms':>11} {'cards':>6}")
+    for name in keyed:
+        keyed_ms = statistics.median(ms for ms, _ in keyed[name])
+        rebuild_ms = statistics.median(ms for ms, _ in rebuild[name])
+        print(f"{name:24} {keyed_ms:10.1f} {keyed[name][-1][1]:6d} "
+              f"{rebuild_ms:11.1f} {rebuild[name][-1][1]:6d}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
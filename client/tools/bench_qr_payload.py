@@ -0,0 +1,119 @@
+"""
+QR payload size and speed: the dict repr QrPopup used to show against the
+compact signed wallet_codec payload.
+
+For the demo documents of the stand-in server, reported per format:
+payload length, the QR version needed at error correction level M,
+encode time (payload only, and payload plus QR matrix when qrcode is
+installed) and decode time (ast.literal_eval of the repr, against
+QrVerifier.verify with the signature check).
+
+    python tools/bench_qr_payload.py --repeat 2000
+"""
+import argparse
+import ast
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from stand_in_server import DEMO_WALLET  # noqa: E402
+from wallet_codec.codec import (  # noqa: E402
+    Ed25519Signer, HmacSigner, QrVerifier, ed25519_available, encode_document,
+)
+
+try:
+    import qrcode
+except ImportError:  # not packaged on every build target
+    qrcode = None
+
+
+# Data codewords per QR version (1-40) at error correction level M
+DATA_CODEWORDS_M = (
+    16, 28, 44, 64, 86, 108, 124, 154, 182, 216, 254, 290, 334, 365, 415, 453, 507, 563, 627, 669,
+    714, 782, 860, 914, 1000, 1062, 1128, 1193, 1267, 1373, 1455, 1541, 1631, 1725, 1812, 1914,
+    1992, 2102, 2216, 2334,
+)
+ALPHANUMERIC = set("0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ $%*+-./:")
+
+
+def qr_version(text):
+    """Smallest QR version (level M) holding text in a single segment."""
+    alphanumeric = set(text) <= ALPHANUMERIC
+    data = text.encode("utf-8")
+    for version, codewords in enumerate(DATA_CODEWORDS_M, start=1):
+        if alphanumeric:
+            count_bits = 9 if version < 10 else 11 if version < 27 else 13
+            bits = 4 + count_bits + 11 * (len(text) // 2) + 6 * (len(text) % 2)
+        else:
+            bits = 4 + (8 if version < 10 else 16) + 8 * len(data)
+        if bits <= codewords * 8:
+            return version
+    return None
+
+
+def timed(func, repeat):
+    """Median milliseconds of func()."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def qr_matrix_ms(text, repeat):
+    if qrcode is None:
+        return None
+
+    def make():
+        qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_M)
+        qr.add_data(text)
+        qr.make(fit=True)
+    return timed(make, max(1, repeat // 100))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="QR payload size and speed, repr against wallet_codec")
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    # Ed25519 as QrPopup signs; HMAC (shorter tag) when cryptography is missing
+    if ed25519_available():
+        signer = Ed25519Signer(Ed25519Signer.generate_private_key())
+        verifier = QrVerifier(ed25519_keys={signer.key_id: signer.public_key_bytes()}, max_age=3600)
+    else:
+        key = os.urandom(32)
+        signer = HmacSigner(key)
+        verifier = QrVerifier(hmac_keys={0: key}, max_age=3600)
+
+    print(f"median of {args.repeat}; {'Ed25519' if ed25519_available() else 'HMAC'} signed; QR version at level M"
+          + ("" if qrcode else "; qrcode not installed, no matrix timings"))
+    print(f"{'document':22} {'format':16} {'chars':>6} {'ver':>4} {'encode ms':>10} "
+          f"{'+matrix ms':>11} {'decode ms':>10}")
+    for doc_type, fields in DEMO_WALLET.items():
+        formats = [
+            ("repr", lambda: str(fields), ast.literal_eval),
+            ("codec", lambda: encode_document(doc_type, fields, signer, compress=False), verifier.verify),
+            ("codec+deflate", lambda: encode_document(doc_type, fields, signer, compress=True), verifier.verify),
+        ]
+        for name, encode, decode in formats:
+            text = encode()
+            decoded = decode(text)
+            decoded_fields = decoded if isinstance(decoded, dict) else decoded.fields
+            assert decoded_fields == fields, (name, decoded_fields)
+            encode_ms = timed(encode, args.repeat)
+            decode_ms = timed(lambda: decode(text), args.repeat)
+            matrix_ms = qr_matrix_ms(text, args.repeat)
+            matrix = f"{encode_ms + matrix_ms:11.2f}" if matrix_ms is not None else f"{'-':>11}"
+            print(f"{doc_type:22} {name:16} {len(text):6d} {qr_version(text):4d} {encode_ms:10.4f} "
+                  f"{matrix} {decode_ms:10.4f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
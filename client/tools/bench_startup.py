@@ -0,0 +1,244 @@
+"""
+Startup and screen transition benchmark for the Kivy client.
+
+Runs the real SmartIdApp headless (SDL2 offscreen video driver) against
+the stand-in server (tools/stand_in_server.py), logs in and walks a
+fixed route of screens. Recorded, as JSON for comparing runs:
+
+- app: import of frontend.app, SmartIdApp.build, time to the first frame
+- screens: construction time of every screen built, whether it was built
+  on navigation or by the idle prebuild, and its widget count
+- transitions: for each step of the route, the time spent in the
+  `current = name` assignment (includes building the screen), to the first
+  frame drawn after it, to the end of the slide, the longest frame while
+  sliding and the widget count once the screen has settled
+
+    python tools/bench_startup.py --rounds 3 --output startup.json
+    python tools/bench_startup.py --route home,chat,home --latency-ms 80
+
+Without the SDL2 offscreen driver (older SDL builds), run it with
+SDL_VIDEODRIVER=x11 under xvfb-run instead.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "offscreen")
+os.environ.setdefault("KIVY_WINDOW", "sdl2")
+os.environ["KIVY_NO_ARGS"] = "1"
+os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+
+from stand_in_server import make_server  # noqa: E402
+
+DEFAULT_ROUTE = ["login", "home", "personal_docs", "home", "vehicul_docs", "home", "chat", "home", "settings", "home"]
+# A step that has not finished by then is recorded as timed out
+STEP_TIMEOUT = 10.0
+
+
+def count_widgets(widget):
+    return sum(1 for _ in widget.walk(restrict=True))
+
+
+class Recorder:
+    """Collects the measurements; every method runs on the Kivy main thread."""
+
+    def __init__(self):
+        self.app = {}
+        self.screens = {}
+        self.transitions = []
+        self.navigating = False
+        self.flips = []
+
+    def on_flip(self, *args):
+        self.flips.append(time.perf_counter())
+
+    def flips_since(self, start):
+        return [t for t in self.flips if t >= start]
+
+
+def make_bench_app(recorder, base_url, route, rounds, settle, data_dir):
+    """SmartIdApp subclass that records its startup and then drives the route."""
+    from kivy.clock import Clock
+    from kivy.core.window import Window
+
+    from frontend import app as app_module
+
+    manager_class = app_module.SwipeScreenManager
+    build_screen = manager_class._build_screen
+
+    def timed_build_screen(manager, name):
+        if name not in manager._factories:
+            return build_screen(manager, name)
+        start = time.perf_counter()
+        build_screen(manager, name)
+        screen = manager.get_screen(name)
+        recorder.screens[name] = {
+            "build_ms": (time.perf_counter() - start) * 1000,
+            "trigger": "navigation" if recorder.navigating else "prebuild",
+            "widgets": count_widgets(screen),
+        }
+
+    manager_class._build_screen = timed_build_screen
+
+    class BenchApp(app_module.SmartIdApp):
+        @property
+        def user_data_dir(self):
+            # Wallet cache and outbox of the bench user stay out of the real app data
+            return data_dir
+
+        def build(self):
+            start = time.perf_counter()
+            root = super().build()
+            recorder.app["build_ms"] = (time.perf_counter() - start) * 1000
+            self.server.set_server_url(base_url)
+            return root
+
+        def on_start(self):
+            super().on_start()
+            Window.bind(on_flip=recorder.on_flip)
+            Clock.schedule_once(self._record_first_frame, 0)
+
+        def _record_first_frame(self, dt):
+            recorder.app["first_frame_ms"] = (time.perf_counter() - app_module._LOAD_STARTED) * 1000
+            # Let the idle prebuild finish, like a user reading the first screen
+            Clock.schedule_once(self._login, 1.5)
+
+        def _login(self, dt):
+            start = time.perf_counter()
+            response = self.server.send_login("bench", "bench")
+            recorder.app["login_ms"] = (time.perf_counter() - start) * 1000
+            if not response:
+                recorder.app["error"] = "login failed"
+                self.stop()
+                return
+            self._steps = [(round_index, name) for round_index in range(rounds) for name in route]
+            Clock.schedule_once(self._next_step, settle)
+
+        def _next_step(self, dt):
+            if not self._steps:
+                self.stop()
+                return
+            round_index, name = self._steps.pop(0)
+            manager = self.root
+            entry = {"round": round_index, "from": manager.current, "to": name}
+            recorder.transitions.append(entry)
+            if manager.current == name:
+                entry["skipped"] = True
+                Clock.schedule_once(self._next_step, 0)
+                return
+
+            done = {"complete": False}
+
+            def finish(*args):
+                if done["complete"]:
+                    return
+                done["complete"] = True
+                manager.transition.unbind(on_complete=finish)
+                timeout.cancel()
+                entry["complete_ms"] = (time.perf_counter() - start) * 1000
+                Clock.schedule_once(lambda dt: settled(), settle)
+
+            def timed_out(dt):
+                entry["timed_out"] = True
+                finish()
+
+            def settled():
+                flips = recorder.flips_since(start)
+                if flips:
+                    entry["first_frame_ms"] = (flips[0] - start) * 1000
+                sliding = [t for t in flips if t <= start + entry["complete_ms"] / 1000]
+                gaps = [b - a for a, b in zip([start] + sliding, sliding)]
+                entry["frames"] = len(sliding)
+                entry["max_frame_ms"] = max(gaps) * 1000 if gaps else None
+                entry["widgets"] = count_widgets(manager.get_screen(name))
+                self._next_step(0)
+
+            manager.transition.bind(on_complete=finish)
+            timeout = Clock.schedule_once(timed_out, STEP_TIMEOUT)
+            recorder.navigating = True
+            start = time.perf_counter()
+            try:
+                manager.current = name
+            finally:
+                recorder.navigating = False
+            entry["assign_ms"] = (time.perf_counter() - start) * 1000
+
+        def on_stop(self):
+            super().on_stop()
+            Window.unbind(on_flip=recorder.on_flip)
+
+    return BenchApp
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Startup and screen transition benchmark for the client")
+    parser.add_argument("--route", default=",".join(DEFAULT_ROUTE),
+                        help="comma separated screens to visit after login")
+    parser.add_argument("--rounds", type=int, default=1, help="times to walk the route (the first is cold)")
+    parser.add_argument("--settle", type=float, default=0.3,
+                        help="seconds to wait on each screen before moving on")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="stand-in server delay per request")
+    parser.add_argument("--size", default="400x800", help="window size WxH")
+    parser.add_argument("--output", help="write the JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    from kivy.config import Config
+    Config.set("graphics", "width", str(width))
+    Config.set("graphics", "height", str(height))
+
+    server = make_server(port=0, latency_ms=args.latency_ms)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    recorder = Recorder()
+    start = time.perf_counter()
+    import frontend.app  # noqa: F401
+    recorder.app["import_ms"] = (time.perf_counter() - start) * 1000
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        app_class = make_bench_app(recorder, base_url, [name for name in args.route.split(",") if name],
+                                   args.rounds, args.settle, data_dir)
+        bench_app = app_class()
+        try:
+            bench_app.run()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    import kivy
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "kivy": kivy.__version__,
+            "platform": platform.platform(),
+            "video_driver": os.environ.get("SDL_VIDEODRIVER"),
+            "window": args.size,
+            "latency_ms": args.latency_ms,
+            "rounds": args.rounds,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "app": recorder.app,
+        "screens": recorder.screens,
+        "transitions": recorder.transitions,
+        "server": dict(server.RequestHandlerClass.state.counters),
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 1 if "error" in recorder.app else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,128 @@
+"""
+Compare the default requests.Session with the tuned transport
+(server_requests/transport.py) against the stand-in server over TLS.
+
+Each round fires a burst of parallel read-only requests, the way a screen
+load plus prefetch does, then waits like a user would. Reported: wall time
+per burst, per-request latency and how many TCP connections, full TLS
+handshakes and resumed TLS sessions the server saw. The "idle close" rows
+drop the pooled connections after every burst, as a server's keep-alive
+timeout would, so each burst reconnects; resumed sessions show there.
+
+    python tools/bench_transport.py --bursts 20 --parallel 6 --latency-ms 40
+
+A throwaway self-signed certificate is made with the openssl command.
+HTTP/2 is not measured here: the stand-in only speaks HTTP/1.1.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+import urllib3
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from server_requests.transport import make_session, timeouts  # noqa: E402
+from stand_in_server import make_server  # noqa: E402
+
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+MESSAGES = ["GetWalletCards", "GetWalletAuto", "GetIdenityCard", "GetDrivingLicense", "UserInfo", "News"]
+
+
+def self_signed_cert(directory):
+    cert, key = Path(directory) / "cert.pem", Path(directory) / "key.pem"
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=127.0.0.1", "-keyout", str(key), "-out", str(cert)],
+        check=True, capture_output=True,
+    )
+    return str(cert), str(key)
+
+
+def run(session, base_url, bursts, parallel, pause, idle_close=False):
+    # Otherwise REQUESTS_CA_BUNDLE in the environment overrides verify=False
+    session.trust_env = False
+    token = session.post(f"{base_url}/login", json={"username": "bench"}, timeout=timeouts()).json()["token"]
+    session.headers["Authorization"] = f"Bearer {token}"
+    latencies, burst_times = [], []
+
+    def one(message_type):
+        start = time.perf_counter()
+        payload = {"message_type": message_type, "user_id": "bench", "content": None, "token": token}
+        response = session.post(f"{base_url}/api/message", json=payload, timeout=timeouts())
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+
+    with ThreadPoolExecutor(max_workers=parallel) as pool:
+        for _ in range(bursts):
+            start = time.perf_counter()
+            list(pool.map(one, [MESSAGES[i % len(MESSAGES)] for i in range(parallel)]))
+            burst_times.append(time.perf_counter() - start)
+            if idle_close:
+                for adapter in session.adapters.values():
+                    adapter.poolmanager.clear()
+            time.sleep(pause)
+    session.close()
+    return latencies, burst_times
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bursts", type=int, default=20)
+    # 4 I/O pool workers plus 2 prefetch workers share the session in the app
+    parser.add_argument("--parallel", type=int, default=6)
+    parser.add_argument("--pause", type=float, default=0.2, help="seconds between bursts")
+    parser.add_argument("--latency-ms", type=float, default=40.0)
+    args = parser.parse_args(argv)
+
+    transports = {
+        "requests.Session()": (_default_session, False),
+        "tuned (transport.make_session)": (lambda: make_session(verify=False, http2=False), False),
+        "requests.Session(), idle close": (_default_session, True),
+        "tuned, idle close": (lambda: make_session(verify=False, http2=False), True),
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        cert, key = self_signed_cert(tmp)
+        for name, (factory, idle_close) in transports.items():
+            server = make_server(port=0, latency_ms=args.latency_ms, tls_cert=cert, tls_key=key)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            base_url = f"https://127.0.0.1:{server.server_address[1]}"
+            try:
+                latencies, burst_times = run(
+                    factory(), base_url, args.bursts, args.parallel, args.pause, idle_close,
+                )
+                stats = dict(server.RequestHandlerClass.state.counters)
+            finally:
+                server.shutdown()
+                server.server_close()
+            print(f"{name}")
+            print(f"  burst     median {statistics.median(burst_times) * 1000:7.1f} ms   "
+                  f"p95 {percentile(burst_times, 0.95) * 1000:7.1f} ms")
+            print(f"  request   median {statistics.median(latencies) * 1000:7.1f} ms   "
+                  f"p95 {percentile(latencies, 0.95) * 1000:7.1f} ms")
+            print(f"  server    {stats.get('connections', 0)} connections, "
+                  f"{stats.get('tls handshakes', 0)} full handshakes, {stats.get('tls resumed', 0)} resumed")
+    return 0
+
+
+def _default_session():
+    session = requests.Session()
+    session.verify = False
+    return session
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,139 @@
+"""
+Import cost of the client's cold start, from python -X importtime.
+
+Imports what has to load before the first frame (the app module, the
+first screen and the server connection) in a fresh interpreter and
+reports the slowest modules and packages. It is also a check: it fails
+when one of the deferred feature dependencies (camera, QR, dialogs, ...)
+is imported at startup or by the home screen (checked in a second fresh
+interpreter, not timed), or when the total exceeds --budget-ms.
+
+    python tools/import_profile.py
+    python tools/import_profile.py --budget-ms 900 --json > imports.json
+
+Importing kivy.core.window opens a window; on a headless machine run it
+with KIVY_WINDOW=sdl2 under a virtual display, or on the desktop.
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+CLIENT_DIR = Path(__file__).resolve().parent.parent
+
+STARTUP_MODULES = [
+    "frontend.app",
+    "frontend.screens.server_setup_screen",
+    "server_requests.server_connect",
+]
+
+# Built right after login; not part of the timed startup, but they must
+# not pull in the deferred modules either
+CHECKED_MODULES = [
+    "frontend.screens.home_screen.home_screen",
+]
+
+# Loaded only when their feature is first used
+DEFERRED_MODULES = [
+    "kivy_garden.xcamera",
+    "qrcode",
+    "PIL",
+    "kivymd.uix.dialog",
+    "kivymd.uix.menu",
+    "kivymd.uix.spinner",
+    "frontend.screens.chat_screens",
+    "frontend.screens.home_screen.scan_camera_screen",
+    "frontend.screens.popup_screens",
+    "frontend.screens.save_screens",
+]
+
+LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)")
+
+
+def profile(modules):
+    """Run the imports in a fresh interpreter; list of (module, self_us, cumulative_us, depth)."""
+    env = dict(os.environ, KIVY_NO_ARGS="1", KIVY_NO_CONSOLELOG="1")
+    code = "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=CLIENT_DIR, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr[-2000:])
+        raise SystemExit("import failed")
+    rows = []
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def summarize(rows, top):
+    packages = {}
+    for module, self_us, _, _ in rows:
+        package = module.split(".")[0]
+        packages[package] = packages.get(package, 0) + self_us
+    return {
+        "total_ms": sum(row[1] for row in rows) / 1000,
+        "modules": len(rows),
+        "packages": {name: us / 1000 for name, us in sorted(packages.items(), key=lambda kv: -kv[1])[:top]},
+        "slowest": [
+            {"module": module, "cumulative_ms": cumulative_us / 1000, "self_ms": self_us / 1000}
+            for module, self_us, cumulative_us, _ in sorted(rows, key=lambda row: -row[2])[:top]
+        ],
+    }
+
+
+def deferred_violations(rows, deferred):
+    loaded = {row[0] for row in rows}
+    return sorted(
+        module for module in loaded
+        if any(module == name or module.startswith(name + ".") for name in deferred)
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import cost of the client's cold start")
+    parser.add_argument("--module", action="append", help="module to import (repeatable)")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, help="fail when the total import time is higher")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    rows = profile(args.module or STARTUP_MODULES)
+    summary = summarize(rows, args.top)
+    summary["deferred_loaded"] = deferred_violations(rows, DEFERRED_MODULES)
+    if not args.module:
+        for module in CHECKED_MODULES:
+            for name in deferred_violations(profile([module]), DEFERRED_MODULES):
+                summary["deferred_loaded"].append(f"{name} (via {module})")
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(f"{summary['modules']} modules, {summary['total_ms']:.1f} ms total")
+        print("\nBy package (self time):")
+        for name, ms in summary["packages"].items():
+            print(f"  {ms:8.1f} ms  {name}")
+        print("\nSlowest imports (cumulative):")
+        for entry in summary["slowest"]:
+            print(f"  {entry['cumulative_ms']:8.1f} ms  {entry['module']}")
+
+    failed = False
+    if summary["deferred_loaded"]:
+        print(f"\nFAIL: deferred modules imported at startup: {', '.join(summary['deferred_loaded'])}",
+              file=sys.stderr)
+        failed = True
+    if args.budget_ms is not None and summary["total_ms"] > args.budget_ms:
+        print(f"\nFAIL: {summary['total_ms']:.1f} ms is over the {args.budget_ms:.0f} ms budget", file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,359 @@
+"""
+Local stand-in for the Rust server.
+
+Speaks the same JSON protocol as the real server (/health, /login,
+/register, /api/message, /api/batch, /api/AI) from memory, so the client
+can be run and measured without PostgreSQL, TLS certificates or the AI
+service. It also implements the chunked upload protocol of
+server_requests/chunked_upload.py (/api/upload/...). A fixed delay per
+request simulates mobile network round trips, and --drop-rate cuts the
+connection in the middle of upload chunks:
+
+    python tools/stand_in_server.py --port 8080 --latency-ms 150 --drop-rate 0.2
+
+With --tls-cert/--tls-key it serves HTTPS like the real server and counts
+TLS handshakes (and resumed sessions) in /debug/stats.
+
+then point the app (server setup screen) at http://127.0.0.1:8080 and log in
+with any username/password. GET /debug/stats returns request counters.
+"""
+import argparse
+import base64
+import copy
+import hashlib
+import json
+import random
+import ssl
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+DEMO_WALLET = {
+    "identity_card": {
+        "first_name": "ION", "last_name": "POPESCU", "serie": "RX", "nr": 123456,
+        "cnp": "1850101401238", "expiration_date": "2030-01-25",
+        "address": "Str. Lunga nr. 3, Cluj-Napoca", "place_of_birth": "Mun. Cluj-Napoca",
+    },
+    "driving_license": {
+        "first_name": "ION", "last_name": "POPESCU", "license_number": "B1234567",
+        "category": "B", "issue_date": "2017-11-21", "expiration_date": "2027-11-21",
+    },
+    "vehicle_registration": {
+        "plate": "CJ 01 ABC", "vin": "WVWZZZ1JZXW000001", "make": "Dacia", "model": "Logan",
+    },
+}
+
+GET_FIELDS = {
+    "GetIdenityCard": "identity_card",
+    "GetDrivingLicense": "driving_license",
+    "GetPassport": "passport",
+    "GetVehicleRegistration": "vehicle_registration",
+    "GetInsuranceAuto": "insurance_auto",
+}
+INSERT_FIELDS = {
+    "InsertIdenityCard": "identity_card",
+    "InsertDrivingLicense": "driving_license",
+    "InsertPassport": "passport",
+    "InsertVehicleRegistration": "vehicle_registration",
+    "InsertInsuranceAuto": "insurance_auto",
+}
+PERSONAL_CARDS = ("identity_card", "driving_license", "passport")
+AUTO_CARDS = ("vehicle_registration", "insurance_auto")
+# Optional endpoints advertised in /health (the real server has none of them yet)
+FEATURES = ("chunked_upload",)
+MAX_BATCH_SIZE = 16
+UPLOAD_CHUNK_SIZE = 256 * 1024
+MAX_UPLOAD_SIZE = 20 * 1024 * 1024
+
+
+def now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+class StandInState:
+    def __init__(self, latency_ms=0.0, batch=True, drop_rate=0.0):
+        self.latency_ms = latency_ms
+        self.batch = batch
+        self.drop_rate = drop_rate
+        self.uploads = {}
+        self.tokens = {}
+        self.users = {}
+        self.wallets = {}
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def count(self, key):
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + 1
+
+    def wallet(self, user_id):
+        with self.lock:
+            if user_id not in self.wallets:
+                self.wallets[user_id] = copy.deepcopy(DEMO_WALLET)
+            return self.wallets[user_id]
+
+    def dispatch(self, message_type, user_id, content):
+        """Same message types and (success, data) results as DataRequestHandler."""
+        wallet = self.wallet(user_id)
+        if message_type in GET_FIELDS:
+            field = GET_FIELDS[message_type]
+            if field in wallet:
+                return True, wallet[field]
+            return False, {"Error": "no data"}
+        if message_type in INSERT_FIELDS:
+            with self.lock:
+                wallet[INSERT_FIELDS[message_type]] = content
+            return True, "inserted"
+        if message_type == "GetWalletCards":
+            return True, {"cards": [{"title": f} for f in PERSONAL_CARDS if f in wallet]}
+        if message_type == "GetWalletAuto":
+            return True, {"cards": [{"title": f} for f in AUTO_CARDS if f in wallet]}
+        if message_type == "UserInfo":
+            return True, {"user": [f"{user_id}@example.com", user_id, "0700000000"]}
+        if message_type == "News":
+            return True, {"news": [{"title": "Stand-in server", "description": "Date de test"}]}
+        if message_type == "logout":
+            return True, ""
+        return False, {"Error": "unknown request"}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state = None  # set by make_server
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send_json(self, status, body):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        return json.loads(raw or b"{}")
+
+    def _authorized(self):
+        header = self.headers.get("Authorization", "")
+        return header.startswith("Bearer ") and header[7:] in self.state.tokens
+
+    def _simulate_network(self):
+        if self.state.latency_ms:
+            time.sleep(self.state.latency_ms / 1000.0)
+
+    def do_GET(self):
+        self._simulate_network()
+        self.state.count(f"GET {self.path}")
+        if self.path == "/health":
+            return self._send_json(200, {"status": "ok", "message": "Server is running", "timestamp": now(),
+                                         "features": list(FEATURES)})
+        if self.path == "/debug/stats":
+            with self.state.lock:
+                return self._send_json(200, dict(self.state.counters))
+        if self.path.startswith("/api/upload/"):
+            return self._upload_status()
+        return self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        self._simulate_network()
+        self.state.count(f"POST {self.path}")
+        if self.path.startswith("/api/upload/") and self.path.endswith("/finish"):
+            if not self._authorized():
+                return self._send_json(401, {"error": "unauthorized"})
+            return self._finish_upload(self.path[len("/api/upload/"):-len("/finish")])
+        try:
+            body = self._read_json()
+        except ValueError:
+            return self._send_json(400, {"error": "invalid json"})
+
+        if self.path == "/login":
+            token = uuid.uuid4().hex
+            username = body.get("username", "")
+            with self.state.lock:
+                self.state.tokens[token] = username
+            return self._send_json(200, {
+                "success": True, "token": token,
+                "user_info": {"username": username},
+            })
+        if self.path == "/register":
+            return self._send_json(200, {"success": True, "message": "registered"})
+
+        if not self.path.startswith("/api/"):
+            return self._send_json(404, {"error": "not found"})
+        if not self._authorized():
+            return self._send_json(401, {"error": "unauthorized"})
+
+        if self.path == "/api/message":
+            success, data = self.state.dispatch(body.get("message_type", ""), body.get("user_id", ""), body.get("content"))
+            self.state.count(f"message {body.get('message_type')}")
+            return self._send_json(200, {
+                "success": success, "message_type": body.get("message_type", ""),
+                "data": data, "timestamp": now(),
+            })
+        if self.path == "/api/batch" and self.state.batch:
+            return self._handle_batch(body)
+        if self.path == "/api/AI":
+            return self._handle_ai(body)
+        if self.path == "/api/upload/start":
+            return self._start_upload(body)
+        return self._send_json(404, {"error": "not found"})
+
+    def _upload(self):
+        """Upload addressed by the path, or None (after sending 401/404)."""
+        if not self._authorized():
+            self._send_json(401, {"error": "unauthorized"})
+            return None
+        upload_id = urlsplit(self.path).path[len("/api/upload/"):]
+        upload = self.state.uploads.get(upload_id)
+        if upload is None:
+            self._send_json(404, {"error": "unknown upload"})
+        return upload
+
+    def _start_upload(self, body):
+        size = int(body.get("size") or 0)
+        if not 0 < size <= MAX_UPLOAD_SIZE:
+            return self._send_json(413, {"error": "size not allowed"})
+        # Same user and payload hash: resume the upload already in progress
+        upload_id = hashlib.sha256(f"{body.get('user_id')}:{body.get('sha256')}".encode()).hexdigest()[:32]
+        with self.state.lock:
+            upload = self.state.uploads.setdefault(upload_id, {
+                "message_type": body.get("message_type"), "size": size,
+                "sha256": body.get("sha256"), "data": bytearray(),
+            })
+            offset = len(upload["data"])
+        return self._send_json(200, {"upload_id": upload_id, "offset": offset, "chunk_size": UPLOAD_CHUNK_SIZE})
+
+    def do_PUT(self):
+        self._simulate_network()
+        self.state.count("PUT /api/upload")
+        upload = self._upload() if self.path.startswith("/api/upload/") else None
+        if upload is None:
+            if not self.path.startswith("/api/upload/"):
+                self._send_json(404, {"error": "not found"})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if random.random() < self.state.drop_rate:
+            # Flaky network: read half the chunk and hang up without an ack
+            self.rfile.read(length // 2)
+            self.state.count("upload dropped")
+            self.close_connection = True
+            return
+        chunk = self.rfile.read(length)
+        offset = int(parse_qs(urlsplit(self.path).query).get("offset", ["-1"])[0])
+        with self.state.lock:
+            data = upload["data"]
+            if offset != len(data) or len(data) + len(chunk) > upload["size"]:
+                return self._send_json(409, {"offset": len(data)})
+            data.extend(chunk)
+            offset = len(data)
+        return self._send_json(200, {"offset": offset})
+
+    def _upload_status(self):
+        upload = self._upload()
+        if upload is not None:
+            with self.state.lock:
+                status = {"offset": len(upload["data"]), "size": upload["size"]}
+            self._send_json(200, status)
+
+    def _finish_upload(self, upload_id):
+        with self.state.lock:
+            upload = self.state.uploads.get(upload_id)
+        if upload is None:
+            return self._send_json(404, {"error": "unknown upload"})
+        data = bytes(upload["data"])
+        if len(data) != upload["size"] or hashlib.sha256(data).hexdigest() != upload["sha256"]:
+            return self._send_json(409, {"offset": len(data)})
+        with self.state.lock:
+            self.state.uploads.pop(upload_id, None)
+        self.state.count(f"upload finished {len(data)} bytes")
+        return self._handle_ai({"message_type": upload["message_type"], "content": base64.b64encode(data).decode()})
+
+    def _handle_batch(self, body):
+        message_types = body.get("message_types") or []
+        if len(message_types) > MAX_BATCH_SIZE:
+            return self._send_json(200, {"success": False, "responses": [], "timestamp": now()})
+        responses = []
+        for message_type in message_types:
+            self.state.count(f"batch {message_type}")
+            if message_type.startswith("Get") or message_type in ("UserInfo", "News"):
+                success, data = self.state.dispatch(message_type, body.get("user_id", ""), None)
+            else:
+                success, data = False, {"Error": "not allowed in batch"}
+            responses.append({"success": success, "message_type": message_type, "data": data, "timestamp": now()})
+        return self._send_json(200, {"success": True, "responses": responses, "timestamp": now()})
+
+    def _handle_ai(self, body):
+        message_type = body.get("message_type")
+        if message_type == "OCR":
+            result = dict(DEMO_WALLET["identity_card"])
+            result["validation"] = {field: {"valid": True, "reason": None} for field in result}
+            data = {"result": str(result)}
+        else:
+            data = {"response": f"Stand-in reply to: {body.get('content')}"}
+        return self._send_json(200, {"success": True, "message_type": message_type, "data": data, "timestamp": now()})
+
+
+class StandInServer(ThreadingHTTPServer):
+    ssl_context = None
+
+    def finish_request(self, request, client_address):
+        # Runs on the connection's own thread, so handshakes do not queue up
+        state = self.RequestHandlerClass.state
+        state.count("connections")
+        if self.ssl_context is not None:
+            try:
+                request = self.ssl_context.wrap_socket(request, server_side=True)
+            except (ssl.SSLError, OSError):
+                return
+            state.count("tls resumed" if request.session_reused else "tls handshakes")
+        super().finish_request(request, client_address)
+
+
+def make_server(host="127.0.0.1", port=8080, latency_ms=0.0, batch=True, drop_rate=0.0,
+                tls_cert=None, tls_key=None):
+    """Build (but do not start) a stand-in server; port 0 picks a free port."""
+    state = StandInState(latency_ms, batch, drop_rate)
+    handler = type("BoundStandInHandler", (StandInHandler,), {"state": state})
+    server = StandInServer((host, port), handler)
+    if tls_cert:
+        server.ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        server.ssl_context.load_cert_chain(tls_cert, tls_key)
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in for the Rust server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="delay added to every request (simulated round trip)")
+    parser.add_argument("--no-batch", action="store_true",
+                        help="answer /api/batch with 404, like servers without it")
+    parser.add_argument("--drop-rate", type=float, default=0.0,
+                        help="probability of cutting the connection during an upload chunk")
+    parser.add_argument("--tls-cert", help="PEM certificate; serve HTTPS")
+    parser.add_argument("--tls-key", help="PEM private key for --tls-cert")
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port, args.latency_ms, not args.no_batch, args.drop_rate,
+                         args.tls_cert, args.tls_key)
+    scheme = "https" if args.tls_cert else "http"
+    print(f"Stand-in server on {scheme}://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
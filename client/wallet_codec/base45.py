@@ -0,0 +1,38 @@
+"""Base45 (RFC 9285): binary data as QR alphanumeric-mode characters."""
+
+ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ $%*+-./:"
+_VALUES = {char: value for value, char in enumerate(ALPHABET)}
+
+
+def b45encode(data: bytes) -> str:
+    out = []
+    for i in range(0, len(data) - 1, 2):
+        n = data[i] * 256 + data[i + 1]
+        n, c = divmod(n, 45)
+        e, d = divmod(n, 45)
+        out.append(ALPHABET[c] + ALPHABET[d] + ALPHABET[e])
+    if len(data) % 2:
+        e, c = divmod(data[-1], 45)
+        out.append(ALPHABET[c] + ALPHABET[e])
+    return "".join(out)
+
+
+def b45decode(text: str) -> bytes:
+    try:
+        values = [_VALUES[char] for char in text]
+    except KeyError as e:
+        raise ValueError(f"invalid base45 character {e}") from None
+    if len(values) % 3 == 1:
+        raise ValueError("invalid base45 length")
+    out = bytearray()
+    for i in range(0, len(values) - 2, 3):
+        n = values[i] + values[i + 1] * 45 + values[i + 2] * 2025
+        if n > 0xFFFF:
+            raise ValueError("invalid base45 group")
+        out += n.to_bytes(2, "big")
+    if len(values) % 3 == 2:
+        n = values[-2] + values[-1] * 45
+        if n > 0xFF:
+            raise ValueError("invalid base45 group")
+        out.append(n)
+    return bytes(out)
@@ -0,0 +1,142 @@
+"""
+Minimal CBOR (RFC 8949) for the wallet QR payload.
+
+Covers what documents need: integers, text, bytes, arrays, maps, tags,
+booleans, null and 64-bit floats. Encoding is deterministic (definite
+lengths, shortest heads) so signatures are stable.
+"""
+import struct
+from collections import namedtuple
+
+Tagged = namedtuple("Tagged", "tag value")
+
+_FLOAT64 = struct.Struct(">d")
+# Nesting limit when decoding; documents need a handful of levels, and
+# untrusted input must not reach the interpreter's recursion limit
+MAX_DEPTH = 32
+
+
+def _head(major: int, value: int, out: bytearray) -> None:
+    if value < 24:
+        out.append(major << 5 | value)
+    elif value < 0x100:
+        out += bytes((major << 5 | 24, value))
+    elif value < 0x10000:
+        out.append(major << 5 | 25)
+        out += value.to_bytes(2, "big")
+    elif value < 0x100000000:
+        out.append(major << 5 | 26)
+        out += value.to_bytes(4, "big")
+    else:
+        out.append(major << 5 | 27)
+        out += value.to_bytes(8, "big")
+
+
+def _encode(value, out: bytearray) -> None:
+    if value is None:
+        out.append(0xF6)
+    elif value is True:
+        out.append(0xF5)
+    elif value is False:
+        out.append(0xF4)
+    elif isinstance(value, int):
+        if value >= 0:
+            _head(0, value, out)
+        else:
+            _head(1, -1 - value, out)
+    elif isinstance(value, float):
+        out.append(0xFB)
+        out += _FLOAT64.pack(value)
+    elif isinstance(value, str):
+        data = value.encode("utf-8")
+        _head(3, len(data), out)
+        out += data
+    elif isinstance(value, (bytes, bytearray)):
+        _head(2, len(value), out)
+        out += value
+    elif isinstance(value, Tagged):
+        _head(6, value.tag, out)
+        _encode(value.value, out)
+    elif isinstance(value, (list, tuple)):
+        _head(4, len(value), out)
+        for item in value:
+            _encode(item, out)
+    elif isinstance(value, dict):
+        _head(5, len(value), out)
+        for key, item in value.items():
+            _encode(key, out)
+            _encode(item, out)
+    else:
+        raise TypeError(f"cannot encode {type(value).__name__}")
+
+
+def dumps(value) -> bytes:
+    out = bytearray()
+    _encode(value, out)
+    return bytes(out)
+
+
+def _decode(data: bytes, pos: int, tag_hook, depth=0):
+    if depth > MAX_DEPTH:
+        raise ValueError("nested too deeply")
+    initial = data[pos]
+    pos += 1
+    major, info = initial >> 5, initial & 0x1F
+    if major == 7:
+        if info == 20:
+            return False, pos
+        if info == 21:
+            return True, pos
+        if info == 22:
+            return None, pos
+        if info == 27:
+            return _FLOAT64.unpack_from(data, pos)[0], pos + 8
+        raise ValueError(f"unsupported simple value {info}")
+    if info < 24:
+        value = info
+    elif info <= 27:
+        size = 1 << (info - 24)
+        if pos + size > len(data):
+            raise ValueError("truncated")
+        value = int.from_bytes(data[pos:pos + size], "big")
+        pos += size
+    else:
+        raise ValueError("indefinite lengths are not supported")
+
+    if major == 0:
+        return value, pos
+    if major == 1:
+        return -1 - value, pos
+    if major in (2, 3):
+        end = pos + value
+        if end > len(data):
+            raise ValueError("truncated")
+        chunk = data[pos:end]
+        return (bytes(chunk) if major == 2 else chunk.decode("utf-8")), end
+    if major == 4:
+        items = []
+        for _ in range(value):
+            item, pos = _decode(data, pos, tag_hook, depth + 1)
+            items.append(item)
+        return items, pos
+    if major == 5:
+        result = {}
+        for _ in range(value):
+            key, pos = _decode(data, pos, tag_hook, depth + 1)
+            result[key], pos = _decode(data, pos, tag_hook, depth + 1)
+        return result, pos
+    # major 6: tag
+    item, pos = _decode(data, pos, tag_hook, depth + 1)
+    return tag_hook(value, item), pos
+
+
+def loads(data: bytes, tag_hook=Tagged):
+    """Decode one CBOR item; tag_hook(tag, value) builds tagged values."""
+    try:
+        value, pos = _decode(data, 0, tag_hook)
+    except (IndexError, struct.error, UnicodeDecodeError, TypeError) as e:
+        # TypeError: a map key that cannot be hashed (e.g. an array)
+        raise ValueError(f"malformed CBOR: {e}") from None
+    if pos != len(data):
+        raise ValueError("trailing bytes after CBOR item")
+    return value
@@ -0,0 +1,306 @@
+"""
+Compact, signed QR payload for sharing a wallet document.
+
+    SW1:<base45 of: header | body | tag>
+
+header  1 byte   format version (high nibble), flags (low nibble):
+                 bit 0 body compressed, bits 1-2 signature algorithm
+        1 byte   document type id (fields.DOCUMENT_TYPES)
+        1 byte   key id, tells the verifier which key to check with
+        4 bytes  issued at, Unix seconds, big endian
+body             CBOR map of field id (or name) -> value; ISO dates as
+                 tag 100 (days since 1970, RFC 8943); raw deflate when
+                 that is smaller
+tag              64 byte Ed25519 signature, or HMAC-SHA256 truncated to 16
+                 bytes, over header and body; none for unsigned payloads
+
+Base45 maps onto the QR alphanumeric mode (5.5 bits per character), so
+the code stays small and scanners do not have to guess a byte encoding.
+
+Ed25519 is what makes a shared code verifiable by others: verifiers only
+need the signer's public key, which public_key_text() turns into a short
+enrollment text (itself fit for a QR code). HMAC needs the verifier to
+hold the same secret, so it only suits a verifier that issued that key.
+Unsigned payloads (no cryptography package for Ed25519) carry no proof
+of origin and QrVerifier rejects them unless told otherwise.
+"""
+import hashlib
+import hmac
+import struct
+import time
+import zlib
+from collections import namedtuple
+from datetime import date, timedelta
+
+from wallet_codec import cbor
+from wallet_codec.base45 import b45decode, b45encode
+from wallet_codec.fields import DOCUMENT_NAMES, DOCUMENT_TYPES, FIELD_NAMES, FIELDS
+
+try:
+    from cryptography.exceptions import InvalidSignature
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
+except ImportError:  # not packaged on every build target
+    Ed25519PrivateKey = None
+
+
+PREFIX = "SW1:"
+KEY_PREFIX = "SWK1:"
+FORMAT_VERSION = 1
+FLAG_COMPRESSED = 0x01
+ALG_NONE = 0
+ALG_HMAC = 1
+ALG_ED25519 = 2
+TAG_SIZES = {ALG_NONE: 0, ALG_HMAC: 16, ALG_ED25519: 64}
+ED25519_KEY_SIZE = 32
+DATE_TAG = 100
+# Allowed difference between the signer's and the verifier's clocks
+CLOCK_SKEW = 300
+
+_HEADER = struct.Struct(">BBBI")
+_EPOCH = date(1970, 1, 1)
+
+WalletDocument = namedtuple("WalletDocument", "doc_type fields issued_at key_id")
+
+
+class WalletCodecError(ValueError):
+    """Raised for payloads that are malformed, expired or not signed by a known key."""
+
+
+class HmacSigner:
+    """Shared-secret signer; the verifier needs the same key."""
+
+    alg = ALG_HMAC
+
+    def __init__(self, key: bytes, key_id: int = 0):
+        self.key = key
+        self.key_id = key_id
+
+    def sign(self, data: bytes) -> bytes:
+        return hmac.new(self.key, data, hashlib.sha256).digest()[:TAG_SIZES[ALG_HMAC]]
+
+
+def ed25519_available() -> bool:
+    return Ed25519PrivateKey is not None
+
+
+def ed25519_key_id(public_key: bytes) -> int:
+    """Default key id of a public key (a hint; verifiers check every key with that id)."""
+    return hashlib.sha256(public_key).digest()[0]
+
+
+class Ed25519Signer:
+    """Public-key signer; the verifier only needs public_key_bytes(). Needs cryptography."""
+
+    alg = ALG_ED25519
+
+    def __init__(self, private_key: bytes, key_id=None):
+        if Ed25519PrivateKey is None:
+            raise RuntimeError("Ed25519 signatures need the cryptography package")
+        self._key = Ed25519PrivateKey.from_private_bytes(private_key)
+        self.key_id = ed25519_key_id(self.public_key_bytes()) if key_id is None else key_id
+
+    @staticmethod
+    def generate_private_key() -> bytes:
+        if Ed25519PrivateKey is None:
+            raise RuntimeError("Ed25519 signatures need the cryptography package")
+        from cryptography.hazmat.primitives import serialization
+        return Ed25519PrivateKey.generate().private_bytes(
+            serialization.Encoding.Raw, serialization.PrivateFormat.Raw, serialization.NoEncryption())
+
+    def public_key_bytes(self) -> bytes:
+        from cryptography.hazmat.primitives import serialization
+        return self._key.public_key().public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+
+    def public_key_text(self) -> str:
+        return public_key_text(self.public_key_bytes(), self.key_id)
+
+    def sign(self, data: bytes) -> bytes:
+        return self._key.sign(data)
+
+
+def public_key_text(public_key: bytes, key_id: int) -> str:
+    """Enrollment text handing an Ed25519 public key to verifiers (QR alphanumeric)."""
+    return KEY_PREFIX + b45encode(bytes([key_id]) + public_key)
+
+
+def parse_public_key_text(text: str):
+    """(key_id, public_key) from public_key_text() output."""
+    if not text.startswith(KEY_PREFIX):
+        raise WalletCodecError("not a wallet key")
+    try:
+        data = b45decode(text[len(KEY_PREFIX):])
+    except ValueError as e:
+        raise WalletCodecError(str(e)) from None
+    if len(data) != 1 + ED25519_KEY_SIZE:
+        raise WalletCodecError("bad key length")
+    return data[0], data[1:]
+
+
+def key_fingerprint(public_key: bytes) -> str:
+    """Short form for comparing keys by eye, e.g. "3F2A-91C0-77BE-0D14"."""
+    digest = hashlib.sha256(public_key).hexdigest()[:16].upper()
+    return "-".join(digest[i:i + 4] for i in range(0, 16, 4))
+
+
+def _pack_value(value):
+    if isinstance(value, str) and len(value) == 10 and value[4] == "-" and value[7] == "-":
+        try:
+            day = date.fromisoformat(value)
+        except ValueError:
+            return value
+        return cbor.Tagged(DATE_TAG, (day - _EPOCH).days)
+    if isinstance(value, dict):
+        return {key: _pack_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_pack_value(item) for item in value]
+    return value
+
+
+def _unpack_tag(tag, value):
+    if tag == DATE_TAG and isinstance(value, int):
+        return (_EPOCH + timedelta(days=value)).isoformat()
+    return cbor.Tagged(tag, value)
+
+
+def pack_fields(fields: dict) -> bytes:
+    """CBOR body: known field names as their ids, empty values left out."""
+    return cbor.dumps({
+        FIELDS.get(name, name): _pack_value(value)
+        for name, value in fields.items()
+        if value not in (None, "")
+    })
+
+
+def unpack_fields(body: bytes) -> dict:
+    packed = cbor.loads(body, tag_hook=_unpack_tag)
+    if not isinstance(packed, dict):
+        raise WalletCodecError("body is not a map")
+    return {FIELD_NAMES.get(key, key): value for key, value in packed.items()}
+
+
+def _deflate(data: bytes) -> bytes:
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush()
+
+
+def encode_document_bytes(doc_type: str, fields: dict, signer, issued_at=None, compress=None) -> bytes:
+    """
+    Binary payload, signed by signer (unsigned when signer is None).
+    compress None deflates the body only when that makes it smaller.
+    """
+    type_id = DOCUMENT_TYPES.get(doc_type, DOCUMENT_TYPES["other"])
+    body = pack_fields(fields)
+    alg = signer.alg if signer is not None else ALG_NONE
+    key_id = signer.key_id if signer is not None else 0
+    flags = alg << 1
+    if compress or compress is None:
+        deflated = _deflate(body)
+        if compress or len(deflated) < len(body):
+            body = deflated
+            flags |= FLAG_COMPRESSED
+    if issued_at is None:
+        issued_at = int(time.time())
+    signed = _HEADER.pack(FORMAT_VERSION << 4 | flags, type_id, key_id, issued_at) + body
+    return signed + (signer.sign(signed) if signer is not None else b"")
+
+
+def encode_document(doc_type: str, fields: dict, signer, issued_at=None, compress=None) -> str:
+    """Text for the QR code (QR alphanumeric mode)."""
+    return PREFIX + b45encode(encode_document_bytes(doc_type, fields, signer, issued_at, compress))
+
+
+class QrVerifier:
+    """
+    Verifier-side decoder.
+
+    Checks the prefix, header and signature before touching the body, so
+    forged or foreign codes are rejected after one signature check. Keys
+    are prepared once: public keys are parsed up front, HMAC states are
+    copied per code instead of being keyed again.
+
+        verifier = QrVerifier(max_age=600)
+        verifier.add_ed25519_key(*parse_public_key_text(enrolled_text))
+        document = verifier.verify(scanned_text)
+
+    ed25519_keys maps a key id to a public key or a list of them (ids are
+    one byte, so different signers can share one).
+    """
+
+    def __init__(self, hmac_keys=None, ed25519_keys=None, max_age=None, allow_unsigned=False):
+        self._hmac = {key_id: hmac.new(key, digestmod=hashlib.sha256) for key_id, key in (hmac_keys or {}).items()}
+        self._ed25519 = {}
+        for key_id, keys in (ed25519_keys or {}).items():
+            for key in ([keys] if isinstance(keys, (bytes, bytearray)) else keys):
+                self.add_ed25519_key(key_id, key)
+        self.max_age = max_age
+        self.allow_unsigned = allow_unsigned
+
+    def add_ed25519_key(self, key_id, public_key: bytes) -> None:
+        if Ed25519PrivateKey is None:
+            raise RuntimeError("Ed25519 signatures need the cryptography package")
+        self._ed25519.setdefault(key_id, []).append(Ed25519PublicKey.from_public_bytes(bytes(public_key)))
+
+    def verify(self, text: str, now=None) -> WalletDocument:
+        if not text.startswith(PREFIX):
+            raise WalletCodecError("not a wallet QR code")
+        try:
+            data = b45decode(text[len(PREFIX):])
+        except ValueError as e:
+            raise WalletCodecError(str(e)) from None
+        if len(data) < _HEADER.size:
+            raise WalletCodecError("truncated")
+        first, type_id, key_id, issued_at = _HEADER.unpack_from(data)
+        if first >> 4 != FORMAT_VERSION:
+            raise WalletCodecError(f"unsupported format version {first >> 4}")
+        alg = (first >> 1) & 0x03
+        tag_size = TAG_SIZES.get(alg)
+        if tag_size is None or len(data) < _HEADER.size + tag_size:
+            raise WalletCodecError("unknown signature algorithm or truncated")
+        if alg == ALG_NONE:
+            if not self.allow_unsigned:
+                raise WalletCodecError("unsigned")
+            signed = data
+        else:
+            signed, tag = data[:-tag_size], data[-tag_size:]
+            self._check_signature(alg, key_id, signed, tag)
+
+        if self.max_age is not None:
+            age = (time.time() if now is None else now) - issued_at
+            if age > self.max_age or age < -CLOCK_SKEW:
+                raise WalletCodecError("expired")
+
+        body = signed[_HEADER.size:]
+        try:
+            if first & FLAG_COMPRESSED:
+                body = zlib.decompress(body, -15)
+            fields = unpack_fields(body)
+        except (zlib.error, ValueError) as e:
+            raise WalletCodecError(f"bad body: {e}") from None
+        return WalletDocument(DOCUMENT_NAMES.get(type_id, "other"), fields, issued_at, key_id)
+
+    def _check_signature(self, alg, key_id, signed, tag):
+        if alg == ALG_HMAC:
+            state = self._hmac.get(key_id)
+            if state is None:
+                raise WalletCodecError(f"unknown key {key_id}")
+            mac = state.copy()
+            mac.update(signed)
+            if not hmac.compare_digest(mac.digest()[:len(tag)], tag):
+                raise WalletCodecError("bad signature")
+            return
+        public_keys = self._ed25519.get(key_id)
+        if not public_keys:
+            raise WalletCodecError(f"unknown key {key_id}")
+        for public_key in public_keys:
+            try:
+                public_key.verify(tag, signed)
+                return
+            except InvalidSignature:
+                continue
+        raise WalletCodecError("bad signature")
+
+
+def decode_document(text: str, hmac_keys=None, ed25519_keys=None, max_age=None,
+                    allow_unsigned=False) -> WalletDocument:
+    """One-off verify and decode; keep a QrVerifier around when scanning many codes."""
+    return QrVerifier(hmac_keys, ed25519_keys, max_age, allow_unsigned).verify(text)
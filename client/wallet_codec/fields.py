@@ -0,0 +1,43 @@
+"""
+Dictionaries of the wallet QR payload: document types and field names are
+sent as small integers. The numbers are part of the wire format: never
+renumber or reuse one, only append. Fields not listed here are sent by
+name.
+"""
+
+DOCUMENT_TYPES = {
+    "identity_card": 1,
+    "driving_license": 2,
+    "passport": 3,
+    "vehicle_registration": 4,
+    "insurance_auto": 5,
+    "other": 15,
+}
+
+FIELDS = {
+    "first_name": 1,
+    "last_name": 2,
+    "cnp": 3,
+    "serie": 4,
+    "nr": 5,
+    "address": 6,
+    "place_of_birth": 7,
+    "date_of_birth": 8,
+    "nationality": 9,
+    "sex": 10,
+    "issue_date": 11,
+    "expiration_date": 12,
+    "issued_by": 13,
+    "passport_number": 14,
+    "license_number": 15,
+    "category": 16,
+    "plate": 17,
+    "vin": 18,
+    "make": 19,
+    "model": 20,
+    "policy_number": 21,
+    "insurer": 22,
+}
+
+DOCUMENT_NAMES = {number: name for name, number in DOCUMENT_TYPES.items()}
+FIELD_NAMES = {number: name for name, number in FIELDS.items()}
@@ -1,4 +1,4 @@
-use crate::others::common::{MessageRequest, MessageResponse};
+use crate::others::common::{BatchRequest, BatchResponse, MessageRequest, MessageResponse};
 use axum::{
     extract::{Json as ExtractJson, State},
     response::Json,
@@ -12,6 +12,9 @@ use crate::handle_requests::personal_data_requests::personal_data_manager::Perso
 use crate::handle_requests::personal_data_requests::wallet_data::WalletCards;
 use crate::handle_requests::response_handler::ResponseHandler;
 use crate::network::server_https::AppState;
+
+const MAX_BATCH_SIZE: usize = 16;
+
 pub struct DataRequestHandler {}
 impl DataRequestHandler {
     pub async fn handle_message(
@@ -19,7 +22,89 @@ impl DataRequestHandler {
         ExtractJson(request): ExtractJson<MessageRequest>,
     ) -> Json<MessageResponse> {
         println!("📨 Request primit: {:?}", request);
-        let (success, data) = match request.message_type.as_str() {
+        let (success, data) = DataRequestHandler::dispatch(&request, app_state).await;
+
+        Json(MessageResponse {
+            success,
+            message_type: request.message_type.clone(),
+            data,
+            timestamp: Utc::now().to_rfc3339(),
+        })
+    }
+    /// Several read-only messages in one round trip; responses keep the request order.
+    pub async fn handle_batch(
+        State(app_state): State<Arc<AppState>>,
+        ExtractJson(batch): ExtractJson<BatchRequest>,
+    ) -> Json<BatchResponse> {
+        println!("📨 Batch primit: {:?}", batch);
+        if batch.message_types.len() > MAX_BATCH_SIZE {
+            let (_, data) = ResponseHandler::standard_error(format!(
+                "batch too large (max {})",
+                MAX_BATCH_SIZE
+            ));
+            return Json(BatchResponse {
+                success: false,
+                responses: vec![MessageResponse {
+                    success: false,
+                    message_type: String::from("batch"),
+                    data,
+                    timestamp: Utc::now().to_rfc3339(),
+                }],
+                timestamp: Utc::now().to_rfc3339(),
+            });
+        }
+
+        let mut tasks = Vec::with_capacity(batch.message_types.len());
+        for message_type in batch.message_types {
+            let request = MessageRequest {
+                message_type,
+                user_id: batch.user_id.clone(),
+                content: None,
+            };
+            let state = app_state.clone();
+            tasks.push(tokio::spawn(async move {
+                let (success, data) = if DataRequestHandler::is_batchable(&request.message_type) {
+                    DataRequestHandler::dispatch(&request, state).await
+                } else {
+                    ResponseHandler::standard_error(String::from("not allowed in batch"))
+                };
+                MessageResponse {
+                    success,
+                    message_type: request.message_type,
+                    data,
+                    timestamp: Utc::now().to_rfc3339(),
+                }
+            }));
+        }
+
+        let mut responses = Vec::with_capacity(tasks.len());
+        for task in tasks {
+            match task.await {
+                Ok(response) => responses.push(response),
+                Err(e) => {
+                    let (success, data) = ResponseHandler::standard_error(e.to_string());
+                    responses.push(MessageResponse {
+                        success,
+                        message_type: String::from("unknown"),
+                        data,
+                        timestamp: Utc::now().to_rfc3339(),
+                    });
+                }
+            }
+        }
+
+        Json(BatchResponse {
+            success: true,
+            responses,
+            timestamp: Utc::now().to_rfc3339(),
+        })
+    }
+    /// Only reads can be batched; writes and logout keep their own request.
+    fn is_batchable(message_type: &str) -> bool {
+        message_type.starts_with("Get") || message_type == "UserInfo" || message_type == "News"
+    }
+    async fn dispatch(request: &MessageRequest, app_state: Arc<AppState>) -> (bool, Value) {
+        match request.message_type.as_str() {
             "InsertIdenityCard" => WalletCards::insert("identity_card", &request, app_state).await,
             "GetIdenityCard" => WalletCards::get("identity_card", &request, app_state).await,
             "InsertDrivingLicense" => {
@@ -44,14 +129,7 @@ impl DataRequestHandler {
             "UserInfo" => PersonalDataManager::get_user_info(&request, app_state).await,
             "News" => NewsData::get_latest_news(app_state).await,
             _ => DataRequestHandler::unknown().await,
-        };
-
-        Json(MessageResponse {
-            success,
-            message_type: request.message_type.clone(),
-            data,
-            timestamp: Utc::now().to_rfc3339(),
-        })
+        }
     }
     async fn unknown() -> (bool, Value) {
         ResponseHandler::standard_error(String::from("unknown request"))
@@ -4,3 +4,4 @@ pub mod data_requests;
 pub mod info_data_requests;
 pub mod personal_data_requests;
 pub mod response_handler;
+pub mod upload_requests;
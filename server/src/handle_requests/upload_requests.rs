@@ -0,0 +1,201 @@
+use crate::ai_microservice::ai_requests::AiRequests;
+use crate::others::common::MessageRequest;
+use axum::{
+    body::Bytes,
+    extract::{Json as ExtractJson, Path, Query, State},
+    http::StatusCode,
+    response::{IntoResponse, Json, Response},
+};
+use base64::{engine::general_purpose, Engine as _};
+use chrono::{DateTime, Duration, Utc};
+use serde::Deserialize;
+use serde_json::json;
+use sha2::{Digest, Sha256};
+use std::collections::HashMap;
+use std::sync::{Arc, Mutex};
+use uuid::Uuid;
+
+use crate::network::server_https::AppState;
+
+/// Listed in the /health "features" so clients know /api/upload exists.
+pub const CHUNKED_UPLOAD_FEATURE: &str = "chunked_upload";
+const UPLOAD_CHUNK_SIZE: usize = 256 * 1024;
+const MAX_UPLOAD_SIZE: usize = 20 * 1024 * 1024;
+const MAX_PENDING_UPLOADS: usize = 64;
+const UPLOAD_TTL_MINUTES: i64 = 30;
+
+struct Upload {
+    user_id: String,
+    message_type: String,
+    size: usize,
+    sha256: String,
+    data: Vec<u8>,
+    updated_at: DateTime<Utc>,
+}
+
+/// Uploads in progress, kept in memory until finished or idle for UPLOAD_TTL_MINUTES.
+pub struct UploadManager {
+    uploads: Mutex<HashMap<String, Upload>>,
+}
+
+impl UploadManager {
+    pub fn new() -> Self {
+        Self {
+            uploads: Mutex::new(HashMap::new()),
+        }
+    }
+
+    fn cleanup_expired(uploads: &mut HashMap<String, Upload>) {
+        let oldest = Utc::now() - Duration::minutes(UPLOAD_TTL_MINUTES);
+        uploads.retain(|_, upload| upload.updated_at > oldest);
+    }
+}
+
+#[derive(Deserialize, Debug)]
+pub struct UploadStart {
+    pub user_id: String,
+    pub message_type: String,
+    pub size: usize,
+    pub sha256: String,
+}
+
+#[derive(Deserialize)]
+pub struct ChunkQuery {
+    pub offset: usize,
+}
+
+/// Resumable upload of one binary payload to an AI message (see the client's chunked_upload.py).
+pub struct UploadRequestHandler {}
+impl UploadRequestHandler {
+    /// Starts an upload, or returns the one in progress for the same user and payload hash.
+    pub async fn handle_start(
+        State(app_state): State<Arc<AppState>>,
+        ExtractJson(start): ExtractJson<UploadStart>,
+    ) -> Response {
+        println!("📨 Upload start: {:?}", start);
+        if start.size == 0 || start.size > MAX_UPLOAD_SIZE {
+            return error(StatusCode::PAYLOAD_TOO_LARGE, "size not allowed");
+        }
+        let sha256 = start.sha256.to_lowercase();
+
+        let mut uploads = app_state.uploads.uploads.lock().unwrap();
+        UploadManager::cleanup_expired(&mut uploads);
+        let existing = uploads
+            .iter()
+            .find(|(_, upload)| upload.user_id == start.user_id && upload.sha256 == sha256)
+            .map(|(upload_id, upload)| (upload_id.clone(), upload.data.len()));
+        let (upload_id, offset) = match existing {
+            Some(found) => found,
+            None => {
+                if uploads.len() >= MAX_PENDING_UPLOADS {
+                    return error(
+                        StatusCode::SERVICE_UNAVAILABLE,
+                        "too many uploads in progress",
+                    );
+                }
+                let upload_id = Uuid::new_v4().simple().to_string();
+                uploads.insert(
+                    upload_id.clone(),
+                    Upload {
+                        user_id: start.user_id,
+                        message_type: start.message_type,
+                        size: start.size,
+                        sha256,
+                        data: Vec::with_capacity(start.size),
+                        updated_at: Utc::now(),
+                    },
+                );
+                (upload_id, 0)
+            }
+        };
+        Json(json!({
+            "upload_id": upload_id,
+            "offset": offset,
+            "chunk_size": UPLOAD_CHUNK_SIZE
+        }))
+        .into_response()
+    }
+
+    /// Appends a chunk; only accepted at the offset the server expects (409 with that offset otherwise).
+    pub async fn handle_chunk(
+        State(app_state): State<Arc<AppState>>,
+        Path(upload_id): Path<String>,
+        Query(query): Query<ChunkQuery>,
+        chunk: Bytes,
+    ) -> Response {
+        let mut uploads = app_state.uploads.uploads.lock().unwrap();
+        let upload = match uploads.get_mut(&upload_id) {
+            Some(upload) => upload,
+            None => return error(StatusCode::NOT_FOUND, "unknown upload"),
+        };
+        if query.offset != upload.data.len() || upload.data.len() + chunk.len() > upload.size {
+            return (
+                StatusCode::CONFLICT,
+                Json(json!({ "offset": upload.data.len() })),
+            )
+                .into_response();
+        }
+        upload.data.extend_from_slice(&chunk);
+        upload.updated_at = Utc::now();
+        Json(json!({ "offset": upload.data.len() })).into_response()
+    }
+
+    pub async fn handle_status(
+        State(app_state): State<Arc<AppState>>,
+        Path(upload_id): Path<String>,
+    ) -> Response {
+        let uploads = app_state.uploads.uploads.lock().unwrap();
+        match uploads.get(&upload_id) {
+            Some(upload) => Json(json!({
+                "offset": upload.data.len(),
+                "size": upload.size
+            }))
+            .into_response(),
+            None => error(StatusCode::NOT_FOUND, "unknown upload"),
+        }
+    }
+
+    /// Checks size and hash, then sends the payload on like /api/AI and returns its response.
+    pub async fn handle_finish(
+        State(app_state): State<Arc<AppState>>,
+        Path(upload_id): Path<String>,
+    ) -> Response {
+        let upload = {
+            let mut uploads = app_state.uploads.uploads.lock().unwrap();
+            let complete = match uploads.get(&upload_id) {
+                Some(upload) => {
+                    upload.data.len() == upload.size && hex_digest(&upload.data) == upload.sha256
+                }
+                None => return error(StatusCode::NOT_FOUND, "unknown upload"),
+            };
+            if !complete {
+                let offset = uploads
+                    .get(&upload_id)
+                    .map_or(0, |upload| upload.data.len());
+                return (StatusCode::CONFLICT, Json(json!({ "offset": offset }))).into_response();
+            }
+            uploads.remove(&upload_id).unwrap()
+        };
+        println!("📨 Upload terminat: {} bytes", upload.data.len());
+
+        let request = MessageRequest {
+            message_type: upload.message_type,
+            user_id: upload.user_id,
+            content: Some(json!(general_purpose::STANDARD.encode(&upload.data))),
+        };
+        AiRequests::handle_ai_reqsuest(ExtractJson(request))
+            .await
+            .into_response()
+    }
+}
+
+fn hex_digest(data: &[u8]) -> String {
+    Sha256::digest(data)
+        .iter()
+        .map(|byte| format!("{:02x}", byte))
+        .collect()
+}
+
+fn error(status: StatusCode, message: &str) -> Response {
+    (status, Json(json!({ "error": message }))).into_response()
+}
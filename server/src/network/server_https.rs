@@ -1,7 +1,7 @@
 use axum::{
     middleware,
     response::Json,
-    routing::{get, post},
+    routing::{get, post, put},
     Router,
 };
 use axum_server::tls_rustls::RustlsConfig;
@@ -12,6 +12,9 @@ use std::sync::Arc;
 use crate::ai_microservice::ai_requests::AiRequests;
 use crate::data_manager::database_manager::DBManager;
 use crate::handle_requests::cripto_manager::CryptoManager;
+use crate::handle_requests::upload_requests::{
+    UploadManager, UploadRequestHandler, CHUNKED_UPLOAD_FEATURE,
+};
 use crate::network::middleware::auth_middleware;
 use crate::{
     handle_requests::auth_requests::AuthRequestHandler,
@@ -27,6 +30,7 @@ pub struct AppState {
     pub db: Arc<DBManager>,
     pub session_manager: Arc<SessionManager>,
     pub cripto_manager: Arc<CryptoManager>,
+    pub uploads: Arc<UploadManager>,
 }
 impl AppState {
     fn new(
@@ -38,6 +42,7 @@ impl AppState {
             db,
             session_manager,
             cripto_manager,
+            uploads: Arc::new(UploadManager::new()),
         }
     }
 }
@@ -67,7 +72,20 @@ impl HTTPServer {
         let protected_routes = Router::new()
             .route("/api/data", get(Self::get_data))
             .route("/api/message", post(DataRequestHandler::handle_message))
+            .route("/api/batch", post(DataRequestHandler::handle_batch))
             .route("/api/AI", post(AiRequests::handle_ai_reqsuest))
+            .route(
+                "/api/upload/start",
+                post(UploadRequestHandler::handle_start),
+            )
+            .route(
+                "/api/upload/:upload_id",
+                put(UploadRequestHandler::handle_chunk).get(UploadRequestHandler::handle_status),
+            )
+            .route(
+                "/api/upload/:upload_id/finish",
+                post(UploadRequestHandler::handle_finish),
+            )
             .route("/api/exit", post(DataRequestHandler::handle_message))
             .layer(middleware::from_fn_with_state(
                 app_state.clone(),
@@ -98,7 +116,8 @@ impl HTTPServer {
         Json(json!({
             "status": "ok",
             "message": "Server is running",
-            "timestamp": Utc::now().to_rfc3339()
+            "timestamp": Utc::now().to_rfc3339(),
+            "features": [CHUNKED_UPLOAD_FEATURE]
         }))
     }
 
@@ -8,6 +8,19 @@ pub struct MessageRequest {
     pub content: Option<Value>,
 }
 
+#[derive(Deserialize, Debug, Clone)]
+pub struct BatchRequest {
+    pub user_id: String,
+    pub message_types: Vec<String>,
+}
+
+#[derive(Serialize)]
+pub struct BatchResponse {
+    pub success: bool,
+    pub responses: Vec<MessageResponse>,
+    pub timestamp: String,
+}
+
 #[derive(Serialize)]
 pub struct MessageResponse {
     pub success: bool,